@@ -80,7 +80,7 @@ bl_info = {
 if "bpy" in locals():
     from importlib import reload
     
-    libs = [presetManager, focusWizard]
+    libs = [ruleEngine, instrumentation, runLog, dryRun, sceneState, visibilityHistory, parallelEvaluation, collectionVisibility, changeTracker, scopeResolver, presetManager, focusWizard]
     
     for lib in libs:        
         try:
@@ -92,6 +92,16 @@ if "bpy" in locals():
 
 # Library imports -----------------------------------------------------------------------------------------------------------------
 import bpy
+from . import ruleEngine
+from . import instrumentation
+from . import runLog
+from . import dryRun
+from . import sceneState
+from . import visibilityHistory
+from . import parallelEvaluation
+from . import collectionVisibility
+from . import changeTracker
+from . import scopeResolver
 from . import presetManager
 from . import focusWizard
 
@@ -112,10 +122,17 @@ classes = [
     presetManager.T1nkerFocusWizardPresetOperationParameters,
     presetManager.T1NKER_OT_FocusWizardPresetOperations,
     
+    presetManager.T1nkerFocusWizardCollectionReference,
     presetManager.T1nkerFocusWizardSettings, 
 
     focusWizard.T1nkerFocusWizardPanel,    
-    focusWizard.T1NKER_OT_FocusWizard
+    focusWizard.T1NKER_OT_FocusWizard,
+    focusWizard.T1NKER_OT_FocusWizardChunked,
+    focusWizard.T1NKER_OT_FocusWizardChunkedNoUndo,
+    focusWizard.T1NKER_OT_FocusWizardDryRunExport,
+    focusWizard.T1NKER_OT_FocusWizardSelectPreset,
+    focusWizard.T1NKER_OT_FocusWizardVisibilityHistory,
+    focusWizard.T1NKER_OT_FocusWizardScopeCollections
 ]
 """
 List of classes that need to be registered by Blender
@@ -138,6 +155,13 @@ def register():
     bpy.types.Scene.t1nkrFocusWizardOperationSettings = bpy.props.PointerProperty(type=presetManager.T1nkerFocusWizardPresetOperationParameters)
     bpy.types.Scene.t1nkrFocusWizardSettings = bpy.props.PointerProperty(type=presetManager.T1nkerFocusWizardSettings)            
     
+    # Register application handlers
+    for handler in focusWizard.handlers:
+        handler.append(focusWizard._forgetIndexes)
+    
+    # Start tracking changes to objects
+    changeTracker.register()
+    
     # Set CTRL+SHIFT+Y as shortcut
     wm = bpy.context.window_manager
     # Note that in background mode (no GUI available), keyconfigs are not available either,
@@ -165,6 +189,20 @@ def unregister():
         
     addon_keymaps.clear()
     
+    # Stop tracking changes to objects
+    changeTracker.unregister()
+    
+    # Stop worker processes matching patterns (if any)
+    parallelEvaluation.shutdown()
+    
+    # Unregister application handlers
+    for handler in focusWizard.handlers:
+        try:
+            handler.remove(focusWizard._forgetIndexes)
+        except:
+            # Don't panic, it was not added either
+            pass
+    
     # Delete settings one by one so that we can proceed even if some has already been deleted
     
     try:
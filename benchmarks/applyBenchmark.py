@@ -0,0 +1,525 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This script benchmarks applying presets on synthetic scenes, with or without Blender.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+# How to run ######################################################################################################################
+#
+# Against the rule engine only, in plain CPython, without Blender:
+#
+#   python benchmarks/applyBenchmark.py --engine-only
+#
+# Against the add-on in Blender, in a new empty file, without the UI:
+#
+#   blender -b --factory-startup --python benchmarks/applyBenchmark.py -- --sizes 1000 10000
+#
+# Results are printed, and saved as JSON (see --output), so that runs before and after a change can be compared with --compare.
+#
+# *********************************************************************************************************************************
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+
+# Settings ########################################################################################################################
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+"""
+Number of objects in scenes generated by default.
+"""
+
+PROPERTY_NAME = "Hide at Lod Level"
+"""
+The name of the visibility control property used by built-in presets.
+"""
+
+MODIFIER_NAMES = ["Bevel", "Weld", "Decimate#lod1", "Decimate#lod2", "Decimate#lod3", "Triangulate#lod4", "Triangulate#lod5"]
+"""
+Names of modifiers added to objects. Some are tagged with LOD levels like built-in presets expect.
+"""
+
+MODIFIER_TYPES = {"Bevel": "BEVEL", "Weld": "WELD", "Decimate": "DECIMATE", "Triangulate": "TRIANGULATE"}
+"""
+Modifier types by the untagged part of modifier names.
+"""
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""
+The folder of the add-on, which is the parent of the folder of this script.
+"""
+
+
+# Synthetic objects ###############################################################################################################
+
+# Generate object descriptions ----------------------------------------------------------------------------------------------------
+def generateObjects(size: int, seed: int) -> list:
+    """Generates the description of a scene resembling a model with LOD levels. Most objects have a LOD tag for one level (like 
+    `#lod2`) or a range of levels (like `#lod1-3`), some are untagged, some carry the visibility control property, and most have a 
+    few modifiers.
+
+    Args:
+        size (int): The number of objects.
+        seed (int): Seed of the random generator, so that runs generate the same scene.
+
+    Returns:
+        list: (name, propertyValues, modifierNames) triplets.
+    """
+    
+    rng = random.Random(seed)
+    objects = []
+    
+    for ix in range(size):
+        kind = rng.random()
+        
+        if kind < 0.6:
+            name = f"Part.{ix:06d}#lod{rng.randint(0, 5)}"
+        elif kind < 0.9:
+            lowest = rng.randint(0, 4)
+            name = f"Part.{ix:06d}#lod{lowest}-{rng.randint(lowest + 1, 5)}"
+        else:
+            name = f"Helper.{ix:06d}"
+        
+        propertyValues = {PROPERTY_NAME: str(rng.randint(0, 5))} if rng.random() < 0.15 else {}
+        modifierNames = tuple(sorted(rng.sample(MODIFIER_NAMES, rng.randint(0, 3))))
+        
+        objects.append((name, propertyValues, modifierNames))
+    
+    return objects
+
+
+# Measurement #####################################################################################################################
+
+# Measure the wall time of a function ---------------------------------------------------------------------------------------------
+def timed(function) -> tuple:
+    """Calls a function, and measures the wall time it takes.
+
+    Args:
+        function: The function to call without arguments.
+
+    Returns:
+        tuple: A (seconds, result) pair, where `result` is what the function returned.
+    """
+    
+    start = time.perf_counter()
+    result = function()
+    
+    return time.perf_counter() - start, result
+
+# Measure the peak memory of a function -------------------------------------------------------------------------------------------
+def peakMemory(function) -> int:
+    """Calls a function, and measures the peak of memory allocated by Python meanwhile. Tracing allocations slows Python down a 
+    lot, so don't measure wall time in the same call.
+
+    Args:
+        function: The function to call without arguments.
+
+    Returns:
+        int: The peak of memory allocated, in bytes.
+    """
+    
+    tracemalloc.start()
+    
+    try:
+        function()
+        
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+# Make a result record ------------------------------------------------------------------------------------------------------------
+def resultRecord(size: int, operation: str, preset: str, seconds: float, rnaWrites: int, peakMemory: int) -> dict:
+    """Makes a result record and prints it.
+
+    Args:
+        size (int): The number of objects in the scene.
+        operation (str): The operation measured.
+        preset (str): The name of the preset applied, or an empty string if not applicable.
+        seconds (float): Wall time.
+        rnaWrites (int): Number of visibility writes, that is, objects and modifiers changing visibility.
+        peakMemory (int): Peak memory allocated by Python, in bytes.
+
+    Returns:
+        dict: The record.
+    """
+    
+    print(f"{size:>8} objects | {operation:<18} | {preset:<18} | {seconds * 1000:>10.1f} ms | {rnaWrites:>8} writes | "
+          f"{peakMemory / 1024 / 1024:>8.2f} MiB peak")
+    
+    return {
+        "size": size,
+        "operation": operation,
+        "preset": preset,
+        "seconds": seconds,
+        "rnaWrites": rnaWrites,
+        "peakMemoryBytes": peakMemory
+    }
+
+
+# Rule engine benchmark ###########################################################################################################
+
+# Load the rule engine ------------------------------------------------------------------------------------------------------------
+def loadRuleEngine():
+    """Loads the rule engine module by its path, as the add-on package itself needs Blender to be imported.
+
+    Returns:
+        module: The `ruleEngine` module.
+    """
+    
+    spec = importlib.util.spec_from_file_location("ruleEngine", os.path.join(REPOSITORY_FOLDER, "ruleEngine.py"))
+    ruleEngine = importlib.util.module_from_spec(spec)
+    sys.modules["ruleEngine"] = ruleEngine
+    spec.loader.exec_module(ruleEngine)
+    
+    return ruleEngine
+
+# Benchmark the rule engine -------------------------------------------------------------------------------------------------------
+def benchmarkEngine(sizes: list, seed: int) -> list:
+    """Evaluates each built-in preset on synthetic snapshots. RNA writes are counted as the number of objects and modifiers whose
+    visibility would change when switching from the previous preset, which is what the add-on writes.
+
+    Args:
+        sizes (list): Scene sizes.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list: Result records.
+    """
+    
+    ruleEngine = loadRuleEngine()
+    results = []
+    
+    for size in sizes:
+        objects = generateObjects(size, seed)
+        
+        takeSnapshot = lambda: ruleEngine.Snapshot(
+            [name for name, values, modifiers in objects],
+            [values for name, values, modifiers in objects],
+            [modifiers for name, values, modifiers in objects])
+        
+        seconds, snapshot = timed(takeSnapshot)
+        peak = peakMemory(takeSnapshot)
+        results.append(resultRecord(size, "snapshot", "", seconds, 0, peak))
+        
+        # Start from everything visible, as in a new file
+        objectVisible = [True] * size
+        modifierVisible = [(True,) * len(modifiers) for name, values, modifiers in objects]
+        
+        for preset in ruleEngine.BUILT_IN_PRESETS:
+            # Start from cold caches each time, as when presets are edited or a file is opened
+            def evaluate():
+                ruleEngine.invalidateRulePlans()
+                ruleEngine.parseLodTag.cache_clear()
+                
+                return ruleEngine.evaluate(snapshot, preset)
+            
+            seconds, plan = timed(evaluate)
+            peak = peakMemory(evaluate)
+            
+            # Modifiers are only written for visible objects
+            writes = sum(1 for old, new in zip(objectVisible, plan.objectVisible) if old != new)
+            writes += sum(
+                sum(1 for old, new in zip(oldModifiers, newModifiers) if old != new)
+                for visible, oldModifiers, newModifiers in zip(plan.objectVisible, modifierVisible, plan.modifierVisible) 
+                if visible)
+            
+            objectVisible = plan.objectVisible
+            modifierVisible = [
+                new if visible else old 
+                for visible, old, new in zip(plan.objectVisible, modifierVisible, plan.modifierVisible)]
+            
+            results.append(resultRecord(size, "evaluate", preset.presetName, seconds, writes, peak))
+    
+    return results
+
+
+# Blender benchmark ###############################################################################################################
+
+# Load and register the add-on ----------------------------------------------------------------------------------------------------
+def loadAddon():
+    """Loads the add-on from the repository folder, and registers it.
+
+    Returns:
+        module: The add-on package.
+    """
+    
+    spec = importlib.util.spec_from_file_location(
+        "focusWizardBenchmarkedAddon", 
+        os.path.join(REPOSITORY_FOLDER, "__init__.py"), 
+        submodule_search_locations=[REPOSITORY_FOLDER])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = addon
+    spec.loader.exec_module(addon)
+    
+    addon.register()
+    
+    return addon
+
+# Build a scene -------------------------------------------------------------------------------------------------------------------
+def buildScene(objects: list):
+    """Creates objects described by `generateObjects` in a new collection of the current scene. Objects share the same mesh to 
+    keep the file small.
+
+    Args:
+        objects (list): (name, propertyValues, modifierNames) triplets.
+
+    Returns:
+        bpy.types.Collection: The collection containing the objects.
+    """
+    
+    collection = bpy.data.collections.new("Focus Wizard Benchmark")
+    bpy.context.scene.collection.children.link(collection)
+    
+    mesh = bpy.data.meshes.new("Focus Wizard Benchmark")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    
+    for name, propertyValues, modifierNames in objects:
+        obj = bpy.data.objects.new(name, mesh)
+        collection.objects.link(obj)
+        
+        for propName, value in propertyValues.items():
+            obj[propName] = value
+        
+        for modifierName in modifierNames:
+            obj.modifiers.new(modifierName, MODIFIER_TYPES[modifierName.split("#")[0]])
+    
+    return collection
+
+# Take the visibility state of objects and modifiers ------------------------------------------------------------------------------
+def visibilityState(collection) -> list:
+    """Takes the visibility of objects and modifiers in a collection, so that writes can be counted by comparing states.
+
+    Args:
+        collection (bpy.types.Collection): The collection.
+
+    Returns:
+        list: (hidden, (show_viewport, ...)) pairs for objects.
+    """
+    
+    return [
+        (obj.hide_get(), tuple(modifier.show_viewport for modifier in obj.modifiers)) 
+        for obj in collection.all_objects]
+
+# Count visibility changes --------------------------------------------------------------------------------------------------------
+def countChanges(before: list, after: list) -> int:
+    """Counts the objects and modifiers whose visibility differs in two states taken by `visibilityState`.
+
+    Args:
+        before (list): The state before.
+        after (list): The state after.
+
+    Returns:
+        int: The number of changes.
+    """
+    
+    changes = 0
+    
+    for (hiddenBefore, modifiersBefore), (hiddenAfter, modifiersAfter) in zip(before, after):
+        changes += hiddenBefore != hiddenAfter
+        changes += sum(1 for old, new in zip(modifiersBefore, modifiersAfter) if old != new)
+    
+    return changes
+
+# Benchmark the add-on ------------------------------------------------------------------------------------------------------------
+def benchmarkBlender(sizes: list, seed: int) -> list:
+    """Measures applying each built-in preset by selecting it in the preset drop-down (that is, `_lodLevelChanged` and 
+    `execute`), refreshing the view with the last preset (`execute` with nothing to change), and importing presets from a file 
+    (`_loadPresetsFromFile`). Each size is measured in a new empty file.
+
+    Args:
+        sizes (list): Scene sizes.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list: Result records.
+    """
+    
+    results = []
+    
+    for size in sizes:
+        bpy.ops.wm.read_homefile(use_empty=True)
+        addon = loadAddon()
+        
+        collection = buildScene(generateObjects(size, seed))
+        
+        settings = bpy.context.scene.t1nkrFocusWizardSettings
+        settings.rootCollection = collection
+        settings.isVerbose = False
+        settings.isTestOnly = False
+        
+        # Load built-in presets
+        settings.confirmReset = True
+        bpy.ops.t1nker.focuswizardpresetoperations(operationParameters={"action": "RESET"})
+        
+        # Export presets to have a file to import
+        settings.presetFile = os.path.join(bpy.app.tempdir, "focusWizardBenchmarkPresets.json")
+        bpy.ops.t1nker.focuswizardpresetoperations(operationParameters={"action": "EXPORT"})
+        
+        operations = [
+            ("select preset", presetDefinition.presetName, 
+             lambda presetName=presetDefinition.presetName: setattr(settings, "presetLodLevel", presetName))
+            for presetDefinition in addon.ruleEngine.BUILT_IN_PRESETS]
+        operations.append(("refresh", operations[-1][1], lambda: bpy.ops.t1nker.focuswizard()))
+        operations.append((
+            "import presets", "", lambda: bpy.ops.t1nker.focuswizardpresetoperations(operationParameters={"action": "REPLACE"})))
+        
+        # Measure wall time and writes in one pass
+        measurements = []
+        
+        for operation, presetName, function in operations:
+            before = visibilityState(collection)
+            seconds, result = timed(function)
+            measurements.append((seconds, countChanges(before, visibilityState(collection))))
+        
+        # Measure memory in a second pass of the same operations, as tracing allocations would distort wall time. The first 
+        # preset starts from the state left by the first pass, which is fine for memory.
+        for (operation, presetName, function), (seconds, writes) in zip(operations, measurements):
+            results.append(resultRecord(size, operation, presetName, seconds, writes, peakMemory(function)))
+        
+        addon.unregister()
+    
+    return results
+
+
+# Comparison ######################################################################################################################
+
+# Compare results to a previous run -----------------------------------------------------------------------------------------------
+def compareResults(results: list, baselineFile: str):
+    """Prints how wall times changed compared to a previous run.
+
+    Args:
+        results (list): Result records of this run.
+        baselineFile (str): Path of a JSON file saved by a previous run.
+    """
+    
+    with open(baselineFile, "r") as jsonFile:
+        baseline = json.load(jsonFile)
+    
+    previous = {(record["size"], record["operation"], record["preset"]): record for record in baseline["results"]}
+    
+    print()
+    print(f"Compared to {baselineFile}:")
+    
+    for record in results:
+        old = previous.get((record["size"], record["operation"], record["preset"]))
+        
+        if old is None or old["seconds"] == 0:
+            continue
+        
+        print(f"{record['size']:>8} objects | {record['operation']:<18} | {record['preset']:<18} | "
+              f"{record['seconds'] / old['seconds']:>6.2f}x time | {record['rnaWrites'] - old['rnaWrites']:>+8} writes")
+
+
+# Entry point #####################################################################################################################
+
+# Run the benchmark ---------------------------------------------------------------------------------------------------------------
+def main():
+    """Parses arguments (those after `--` when run by Blender), runs the benchmark, and saves results.
+    """
+    
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    
+    parser = argparse.ArgumentParser(description="Benchmark T1nk-R Focus Wizard on synthetic scenes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Number of objects in scenes")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the random generator generating scenes")
+    parser.add_argument("--engine-only", action="store_true", help="Benchmark the rule engine only, even within Blender")
+    parser.add_argument("--output", default=None, help="Path of the JSON file to save results to")
+    parser.add_argument("--compare", default=None, help="Path of a JSON file saved by a previous run to compare results to")
+    args = parser.parse_args(argv)
+    
+    mode = "engine" if args.engine_only or bpy is None else "blender"
+    
+    print(f"Benchmarking in {mode} mode")
+    
+    results = benchmarkEngine(args.sizes, args.seed) if mode == "engine" else benchmarkBlender(args.sizes, args.seed)
+    
+    output = args.output or f"focusWizardBenchmark-{mode}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    
+    with open(output, "w") as jsonFile:
+        json.dump({
+            "mode": mode,
+            "python": platform.python_version(),
+            "blender": bpy.app.version_string if bpy is not None else None,
+            "machine": platform.platform(),
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results
+        }, fp=jsonFile, indent=2)
+    
+    print(f"Results saved to {output}")
+    
+    if args.compare is not None:
+        compareResults(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
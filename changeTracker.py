@@ -0,0 +1,317 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains tracking of changes made to objects, so that only changed objects need to be processed again.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import bpy
+
+
+# Properties ######################################################################################################################
+
+dirtyObjects = set()
+"""
+Names of objects added, changed (including custom properties and the modifier stack) or renamed since changes were last consumed.
+"""
+
+structureChanged = False
+"""
+Tells if objects may have been added, removed or renamed, or the collection hierarchy may have changed, since changes were last
+consumed. Renames are notified without telling which object was renamed, so this is the only trace they leave.
+"""
+
+structureGeneration = 0
+"""
+Bumped each time `structureChanged` is set. Unlike `structureChanged`, it's not reset by consuming changes, so caches built from 
+the collection hierarchy (like the scope resolved by `scopeResolver`) can tell if they are stale without interfering with others.
+"""
+
+_signatures = {}
+"""
+Signatures of objects updated so far (see `_signatureOf`), keyed by object name, to tell tracked changes from moving, editing or 
+sculpting objects, which are reported by depsgraph updates just as well.
+"""
+
+_ownObjectChanges = set()
+"""
+Names of objects whose visibility or modifiers the add-on itself changed since the last depsgraph update. Such changes are 
+reported by the next depsgraph update, but they don't change anything tracked here, so they are ignored then.
+"""
+
+_isOwnCollectionChange = False
+"""
+Tells if the add-on itself changed the visibility of collections since the last depsgraph update, so that collection updates 
+reported by the next one are not taken for changes of the collection hierarchy.
+"""
+
+_msgbusOwner = object()
+"""
+Owner of message bus subscriptions, used to remove them.
+"""
+
+liveUpdateCallback = None
+"""
+A function to call (via a timer) when something changed. Set by the module interested in changes.
+"""
+
+
+# Event handlers ##################################################################################################################
+
+# Collect objects changed ---------------------------------------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def _onDepsgraphUpdate(scene, depsgraph):
+    """Handler for depsgraph updates. Collects the names of objects added, or whose modifier stack or custom properties changed, 
+    and notes if the collection hierarchy changed. Updates are also reported for moving or editing objects, and changing custom 
+    properties is reported as a transform and geometry update too, so updates are told apart by comparing the signature of 
+    objects (see `_signatureOf`) instead of by what Blender says was updated. Changes the add-on made itself (see 
+    `ignoreOwnChanges`) are reported by the first update after making them, and are left out.
+
+    Args:
+        scene (bpy.types.Scene): The scene updated.
+        depsgraph (bpy.types.Depsgraph): The depsgraph telling what has been updated.
+    """
+    
+    global structureChanged, structureGeneration, _isOwnCollectionChange
+    
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object):
+            continue
+        
+        # Moving objects only updates their transforms, while changes tracked also update geometry
+        if update.is_updated_transform and not update.is_updated_geometry:
+            continue
+        
+        # Updates refer to evaluated copies, but we need the original object
+        obj = update.id.original
+        name = obj.name
+        
+        if name in _ownObjectChanges:
+            continue
+        
+        # Objects not seen before may have been added or changed
+        signature = _signatureOf(obj)
+        
+        if _signatures.get(name) != signature:
+            _signatures[name] = signature
+            dirtyObjects.add(name)
+    
+    # Linking and unlinking objects updates collections
+    if depsgraph.id_type_updated('COLLECTION') and not _isOwnCollectionChange:
+        structureChanged = True
+        structureGeneration += 1
+    
+    # Own changes made so far have been reported by this update
+    _ownObjectChanges.clear()
+    _isOwnCollectionChange = False
+    
+    _scheduleLiveUpdate(scene)
+
+# Note objects renamed ------------------------------------------------------------------------------------------------------------
+def _onObjectRenamed(*args):
+    """
+    Message bus callback for renaming any object.
+    """
+    
+    global structureChanged, structureGeneration
+    
+    structureChanged = True
+    structureGeneration += 1
+    
+    _scheduleLiveUpdate(bpy.context.scene)
+
+# Start over upon loading a file --------------------------------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def _onLoad(*args):
+    """
+    Handler for loading a file. Everything collected refers to the previous file, and message bus subscriptions are cleared upon
+    loading a file, so we need to subscribe again.
+    """
+    
+    global structureChanged, structureGeneration, _isOwnCollectionChange
+    
+    dirtyObjects.clear()
+    _signatures.clear()
+    _ownObjectChanges.clear()
+    _isOwnCollectionChange = False
+    structureChanged = True
+    structureGeneration += 1
+    
+    _subscribe()
+
+
+# Private functions ###############################################################################################################
+
+# Get the signature of an object --------------------------------------------------------------------------------------------------
+def _signatureOf(obj) -> tuple:
+    """Returns the signature of an object, made of what is tracked about it: the names of its modifiers and its custom 
+    properties. Renaming objects is tracked by the message bus.
+
+    Args:
+        obj (bpy.types.Object): The object.
+
+    Returns:
+        tuple: The names of modifiers, and (name, value) pairs of custom properties with values converted to strings, as values 
+        may be ID property groups or arrays.
+    """
+    
+    return tuple(modifier.name for modifier in obj.modifiers), tuple((key, str(value)) for key, value in obj.items())
+
+# Subscribe to renaming objects ---------------------------------------------------------------------------------------------------
+def _subscribe():
+    """
+    Subscribes to renaming objects on the message bus.
+    """
+    
+    bpy.msgbus.clear_by_owner(_msgbusOwner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "name"),
+        owner=_msgbusOwner,
+        args=(),
+        notify=_onObjectRenamed
+    )
+
+# Ask for processing changes ------------------------------------------------------------------------------------------------------
+def _scheduleLiveUpdate(scene):
+    """Registers `liveUpdateCallback` as a timer to process changes after the current update is over, if the user asked for
+    keeping the view up to date. Processing changes right from a depsgraph handler could trigger updates while the depsgraph is 
+    being evaluated.
+
+    Args:
+        scene (bpy.types.Scene): The scene changed.
+    """
+    
+    if liveUpdateCallback is None or (len(dirtyObjects) == 0 and not structureChanged):
+        return
+    
+    settings = getattr(scene, "t1nkrFocusWizardSettings", None)
+    
+    if settings is None or not settings.isLiveUpdate:
+        return
+    
+    if not bpy.app.timers.is_registered(liveUpdateCallback):
+        bpy.app.timers.register(liveUpdateCallback, first_interval=0.0)
+
+
+# Public functions ################################################################################################################
+
+# Ignore changes made by the add-on -----------------------------------------------------------------------------------------------
+def ignoreOwnChanges(objectNames=(), collections: bool = False):
+    """Tells that the add-on itself is changing the visibility of objects, their modifiers, or collections. These don't change 
+    anything tracked, so the next depsgraph update, which reports them, doesn't take them for changes. Call it when changing 
+    them, not after, as depsgraph updates may come in between steps of a run applying a preset in chunks.
+
+    Args:
+        objectNames (iterable, optional): Names of objects changed. Defaults to none.
+        collections (bool, optional): Whether the visibility of collections or layer collections is changed. Defaults to False.
+    """
+    
+    global _isOwnCollectionChange
+    
+    _ownObjectChanges.update(objectNames)
+    _isOwnCollectionChange = _isOwnCollectionChange or collections
+
+# Get and forget changes collected ------------------------------------------------------------------------------------------------
+def consumeChanges() -> tuple:
+    """Returns changes collected so far, and starts collecting again.
+
+    Returns:
+        tuple: A (dirtyObjects, structureChanged) pair, see the module-level variables of the same name.
+    """
+    
+    global dirtyObjects, structureChanged
+    
+    changes = (dirtyObjects, structureChanged)
+    
+    dirtyObjects = set()
+    structureChanged = False
+    
+    return changes
+
+# Start tracking changes ----------------------------------------------------------------------------------------------------------
+def register():
+    """
+    Registers handlers and message bus subscriptions to track changes.
+    """
+    
+    bpy.app.handlers.depsgraph_update_post.append(_onDepsgraphUpdate)
+    bpy.app.handlers.load_post.append(_onLoad)
+    
+    _subscribe()
+
+# Stop tracking changes -----------------------------------------------------------------------------------------------------------
+def unregister():
+    """
+    Unregisters everything `register()` registered.
+    """
+    
+    for handlers, handler in [
+        (bpy.app.handlers.depsgraph_update_post, _onDepsgraphUpdate),
+        (bpy.app.handlers.load_post, _onLoad)]:
+        
+        try:
+            handlers.remove(handler)
+        except:
+            # Don't panic, it was not added either
+            pass
+    
+    bpy.msgbus.clear_by_owner(_msgbusOwner)
+    
+    if liveUpdateCallback is not None and bpy.app.timers.is_registered(liveUpdateCallback):
+        bpy.app.timers.unregister(liveUpdateCallback)
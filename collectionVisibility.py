@@ -0,0 +1,411 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains the logic of hiding whole collections of objects instead of objects one by one, and of deciding the 
+# visibility of collections by collection rules.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+
+# Constants #######################################################################################################################
+
+SHOWN = 1
+"""
+State flag of a collection containing objects to show.
+"""
+
+HIDDEN = 2
+"""
+State flag of a collection containing objects to hide.
+"""
+
+MIXED = SHOWN | HIDDEN
+"""
+State of a collection containing both objects to show and objects to hide, like a collection mixing LOD levels.
+"""
+
+UNDECIDED = 4
+"""
+State flag of an object in a collection not decided by collection rules.
+"""
+
+
+# Collection tree #################################################################################################################
+class _Node:
+    """
+    A layer collection with the positions of its own objects in scope, and the state telling what to do with the objects in its
+    sub-tree.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, layerCollection, positions: list, children: list, state: int, decision: bool = None):
+        """Creates a node.
+
+        Args:
+            layerCollection (bpy.types.LayerCollection): The layer collection.
+            positions (list): Positions of objects directly in the collection, among objects in scope.
+            children (list): Nodes of child layer collections.
+            state (int): The combination of `SHOWN` and `HIDDEN` flags of objects in the sub-tree, or 0 if there's no object in 
+            scope in the sub-tree.
+            decision (bool, optional): True to show the collection, False to hide it as decided by collection rules, or `None`
+            if undecided. Defaults to None.
+        """
+        
+        self.layerCollection = layerCollection
+        """
+        The layer collection.
+        """
+        
+        self.positions = positions
+        """
+        Positions of objects directly in the collection, among objects in scope.
+        """
+        
+        self.children = children
+        """
+        Nodes of child layer collections.
+        """
+        
+        self.state = state
+        """
+        The combination of `SHOWN` and `HIDDEN` flags of objects in the sub-tree.
+        """
+        
+        self.decision = decision
+        """
+        True to show the collection, False to hide it as decided by collection rules, or `None` if undecided.
+        """
+
+
+# Plan of collections to hide and show ############################################################################################
+class CollectionPlan:
+    """
+    Tells which collections to hide and show to apply a preset, and which objects need not be hidden one by one as they are 
+    hidden along with their collections. Collections are hidden as a whole if all objects in their sub-tree shall be hidden. 
+    Collections mixing objects to show and hide are shown, and their objects are shown or hidden one by one.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self):
+        """
+        Creates an empty plan.
+        """
+        
+        self.hidden = []
+        """
+        Layer collections to hide.
+        """
+        
+        self.shown = []
+        """
+        Layer collections to show.
+        """
+        
+        self.covered = set()
+        """
+        Positions of objects hidden by hiding collections, which need not be hidden one by one. Objects also linked to collections
+        shown are not covered.
+        """
+        
+        self.uncovered = set()
+        """
+        Positions of objects in collections shown, which shall be shown or hidden one by one. Kept to merge plans of more root 
+        collections, as an object covered under one root is not covered if it's also linked to a collection shown under another.
+        """
+
+
+# Public functions ################################################################################################################
+
+# Find the layer collections of a collection --------------------------------------------------------------------------------------
+def layerCollectionsOf(layerCollection, collection) -> list:
+    """Finds the layer collections of a collection in a layer collection tree. A collection has more layer collections if it's 
+    linked to more parents.
+
+    Args:
+        layerCollection (bpy.types.LayerCollection): The root of the tree, such as `ViewLayer.layer_collection`.
+        collection (bpy.types.Collection): The collection to find.
+
+    Returns:
+        list: The layer collections found, in depth-first order.
+    """
+    
+    found = []
+    pending = [layerCollection]
+    
+    while len(pending) > 0:
+        current = pending.pop()
+        
+        if current.collection == collection:
+            found.append(current)
+        
+        pending.extend(reversed(current.children))
+    
+    return found
+
+# Work out which collections to hide and show -------------------------------------------------------------------------------------
+def planCollections(
+    rootLayerCollection, positions: dict, visible, excluded: frozenset = frozenset(), decisions: dict = None, 
+    isAutomatic: bool = True) -> CollectionPlan:
+    """Works out which collections to hide and show under a root collection to make objects visible as decided. The root 
+    collection itself is never hidden, as it's the scope chosen by the user. Collections containing objects out of scope are
+    never hidden either, so that hiding them won't hide objects the add-on shall not touch, unless collection rules say so.
+
+    Args:
+        rootLayerCollection (bpy.types.LayerCollection): The layer collection of the root collection.
+        positions (dict): Positions of objects in scope, keyed by object name. Objects not in scope are treated as shown.
+        visible (sequence): Tells if objects shall be visible, aligned with positions.
+        excluded (frozenset, optional): Names of collections excluded from the scope, which are left as they are and treated as 
+        shown. Defaults to an empty set.
+        decisions (dict, optional): Collections to show (True) or hide (False) as decided by collection rules, keyed by name 
+        (see `decideCollections`). Defaults to None, meaning no decision.
+        isAutomatic (bool, optional): True to hide collections whose objects are all to be hidden, and show other collections 
+        with objects in scope. False to only hide and show collections decided. Defaults to True.
+
+    Returns:
+        CollectionPlan: The plan.
+    """
+    
+    plan = CollectionPlan()
+    
+    _plan(_collect(rootLayerCollection, positions, visible, excluded, decisions or {}), plan, isAutomatic, isRoot=True)
+    
+    plan.covered -= plan.uncovered
+    
+    return plan
+
+# Merge plans of more root collections --------------------------------------------------------------------------------------------
+def mergePlans(plans: list) -> CollectionPlan:
+    """Merges plans of more root collections into one.
+
+    Args:
+        plans (list): The `CollectionPlan` objects to merge.
+
+    Returns:
+        CollectionPlan: The merged plan.
+    """
+    
+    merged = CollectionPlan()
+    
+    for plan in plans:
+        merged.hidden.extend(plan.hidden)
+        merged.shown.extend(plan.shown)
+        merged.covered |= plan.covered
+        merged.uncovered |= plan.uncovered
+    
+    merged.covered -= merged.uncovered
+    
+    return merged
+
+# Decide collections by collection rules ------------------------------------------------------------------------------------------
+def decideCollections(roots: list, excluded: frozenset, positions: dict, decide) -> tuple:
+    """Decides which collections under the root collections to show or hide as a whole by collection rules, and the visibility 
+    of objects in scope that follows. A collection decided inherits its decision to its sub-collections, unless they are 
+    decided otherwise, but nothing is shown under a collection hidden. Root collections are never decided. An object is shown 
+    if in any collection shown, hidden if all of its collections are hidden, and left to object rules otherwise.
+
+    Args:
+        roots (list): The root collections (`bpy.types.Collection`).
+        excluded (frozenset): Names of collections excluded from the scope, which are left undecided along with their 
+        sub-collections.
+        positions (dict): Positions of objects in scope, keyed by object name.
+        decide (function): Takes the name of a collection, and returns True to show it, False to hide it, or `None` if 
+        undecided, such as `ruleEngine.RulePlan.decideCollectionVisibility`.
+
+    Returns:
+        tuple: A (decisions, verdicts) pair, where `decisions` maps the names of collections decided to True to show or False 
+        to hide, and `verdicts` tells the visibility of objects aligned with positions, with `None` for objects left to object 
+        rules.
+    """
+    
+    decisions = {}
+    states = bytearray(len(positions))
+    visited = set()
+    
+    # Collections linked to more parents may inherit different decisions, so they are walked once for each
+    pending = [(root, None, True) for root in roots]
+    
+    while len(pending) > 0:
+        collection, inherited, isRoot = pending.pop()
+        
+        if (collection.name, inherited) in visited:
+            continue
+        
+        visited.add((collection.name, inherited))
+        effective = inherited
+        
+        if not isRoot:
+            decision = decide(collection.name)
+            
+            if decision is not None:
+                decisions[collection.name] = decision
+                
+                if inherited is not False:
+                    effective = decision
+        
+        state = UNDECIDED if effective is None else (SHOWN if effective else HIDDEN)
+        
+        for obj in collection.objects:
+            position = positions.get(obj.name)
+            
+            if position is not None:
+                states[position] |= state
+        
+        for child in collection.children:
+            if child.name not in excluded:
+                pending.append((child, effective, False))
+                continue
+            
+            # Objects also linked to excluded collections may be shown through them
+            for obj in child.all_objects:
+                position = positions.get(obj.name)
+                
+                if position is not None:
+                    states[position] |= UNDECIDED
+    
+    verdicts = [True if state & SHOWN else (False if state == HIDDEN else None) for state in states]
+    
+    return decisions, verdicts
+
+
+# Private functions ###############################################################################################################
+
+# Collect the tree of collections -------------------------------------------------------------------------------------------------
+def _collect(layerCollection, positions: dict, visible, excluded: frozenset, decisions: dict) -> _Node:
+    """Collects the tree of layer collections with their objects in scope, and works out the state of each sub-tree.
+
+    Args:
+        layerCollection (bpy.types.LayerCollection): The root of the sub-tree.
+        positions (dict): Positions of objects in scope, keyed by object name.
+        visible (sequence): Tells if objects shall be visible, aligned with positions.
+        excluded (frozenset): Names of collections excluded from the scope.
+        decisions (dict): Collections to show or hide as decided by collection rules, keyed by name.
+
+    Returns:
+        _Node: The node of the root of the sub-tree.
+    """
+    
+    ownPositions = []
+    children = []
+    state = 0
+    
+    for obj in layerCollection.collection.objects:
+        position = positions.get(obj.name)
+        
+        if position is None:
+            # Not in scope, keep the collection shown
+            state |= SHOWN
+        else:
+            ownPositions.append(position)
+            state |= SHOWN if visible[position] else HIDDEN
+    
+    for child in layerCollection.children:
+        if child.collection.name in excluded:
+            # Left as it is, keep the parent shown
+            state |= SHOWN
+            continue
+        
+        children.append(_collect(child, positions, visible, excluded, decisions))
+    
+    for child in children:
+        state |= child.state
+    
+    return _Node(layerCollection, ownPositions, children, state, decisions.get(layerCollection.collection.name))
+
+# Walk the tree of collections ----------------------------------------------------------------------------------------------------
+def _plan(node: _Node, plan: CollectionPlan, isAutomatic: bool, isRoot: bool = False):
+    """Adds collections of a sub-tree to hide or show to the plan, as well as objects covered by collections hidden.
+
+    Args:
+        node (_Node): The root of the sub-tree.
+        plan (CollectionPlan): The plan to add to.
+        isAutomatic (bool): True to decide collections not decided by collection rules by the objects in them, False to leave 
+        them as they are.
+        isRoot (bool, optional): True if the node is of the root collection, which is never hidden. Defaults to False.
+    """
+    
+    decision = None if isRoot else node.decision
+    
+    if decision is None and not isRoot:
+        # Leave collections without objects in scope as they are
+        if node.state == 0 and isAutomatic:
+            return
+        
+        if node.state == HIDDEN and isAutomatic:
+            decision = False
+    
+    if decision is False:
+        plan.hidden.append(node.layerCollection)
+        
+        # Objects in the sub-tree are hidden along with the collection
+        pending = [node]
+        
+        while len(pending) > 0:
+            current = pending.pop()
+            plan.covered.update(current.positions)
+            pending.extend(current.children)
+        
+        return
+    
+    if decision is True or (isAutomatic and not isRoot):
+        plan.shown.append(node.layerCollection)
+    
+    plan.uncovered.update(node.positions)
+    
+    for child in node.children:
+        _plan(child, plan, isAutomatic)
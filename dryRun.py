@@ -0,0 +1,211 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains the results of test runs (dry runs), which tell what applying a preset would do.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from collections import OrderedDict
+import csv
+import json
+import time
+
+
+# Dry run #########################################################################################################################
+class DryRun:
+    """
+    What applying a preset would do, worked out without touching the scene: the target visibility of each object and of the 
+    modifiers of objects which would be visible, with the rule deciding each. Can be exported to JSON or CSV.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, presetName: str, snapshot, plan):
+        """Creates the results of a dry run.
+
+        Args:
+            presetName (str): The name of the preset tested.
+            snapshot (ruleEngine.Snapshot): The snapshot the preset was evaluated on, with the current visibility of objects and 
+            modifiers if what would change shall be told.
+            plan (ruleEngine.VisibilityPlan): The plan worked out for the snapshot.
+        """
+        
+        self.presetName = presetName
+        """
+        The name of the preset tested.
+        """
+        
+        self.createdAt = time.time()
+        """
+        When the dry run was made, in seconds since the epoch.
+        """
+        
+        self.objects = []
+        """
+        Records of objects as dictionaries of object name, target visibility, the rule deciding it, current visibility (`None` if
+        unknown), and whether it would change.
+        """
+        
+        self.modifiers = []
+        """
+        Records of modifiers of objects which would be visible, as dictionaries of object name, modifier name, target visibility,
+        the rule deciding it, current visibility (`None` if unknown), and whether it would change. Modifiers of objects which
+        would be hidden are not processed, so they are not listed.
+        """
+        
+        self.counts = OrderedDict(
+            objectsVisible=0, 
+            objectsHidden=0, 
+            objectsChanging=0, 
+            modifiersVisible=0, 
+            modifiersHidden=0, 
+            modifiersChanging=0)
+        """
+        Counts of objects and modifiers by target visibility, and of those which would change.
+        """
+        
+        for position, name in enumerate(snapshot.names):
+            visible = plan.objectVisible[position]
+            currentlyVisible = not snapshot.hidden[position] if snapshot.hidden is not None else None
+            changes = currentlyVisible is not None and currentlyVisible != visible
+            
+            self.objects.append(OrderedDict(
+                object=name, visible=visible, rule=plan.objectRules[position], currentlyVisible=currentlyVisible, changes=changes))
+            
+            self.counts["objectsVisible" if visible else "objectsHidden"] += 1
+            self.counts["objectsChanging"] += changes
+            
+            if not visible:
+                continue
+            
+            modifierShown = snapshot.modifierShown[position] if snapshot.modifierShown is not None else None
+            
+            for ix, modifierName in enumerate(snapshot.modifierNames[position]):
+                modifierVisible = plan.modifierVisible[position][ix]
+                currentlyShown = modifierShown[ix] if modifierShown is not None else None
+                modifierChanges = currentlyShown is not None and currentlyShown != modifierVisible
+                
+                self.modifiers.append(OrderedDict(
+                    object=name, 
+                    modifier=modifierName, 
+                    visible=modifierVisible, 
+                    rule=plan.modifierRules[position][ix], 
+                    currentlyVisible=currentlyShown, 
+                    changes=modifierChanges))
+                
+                self.counts["modifiersVisible" if modifierVisible else "modifiersHidden"] += 1
+                self.counts["modifiersChanging"] += modifierChanges
+    
+    # Public functions ============================================================================================================
+    
+    # Convert to a dictionary -----------------------------------------------------------------------------------------------------
+    def asDict(self) -> dict:
+        """Returns the results as a dictionary of built-in types, ready to be serialized.
+
+        Returns:
+            dict: The results.
+        """
+        
+        return {
+            "presetName": self.presetName,
+            "createdAt": self.createdAt,
+            "counts": dict(self.counts),
+            "objects": [dict(record) for record in self.objects],
+            "modifiers": [dict(record) for record in self.modifiers]
+        }
+    
+    # Save as JSON ----------------------------------------------------------------------------------------------------------------
+    def saveJson(self, path: str):
+        """Saves the results to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        
+        with open(path, "w") as jsonFile:
+            json.dump(self.asDict(), fp=jsonFile, indent=2)
+    
+    # Save as CSV -----------------------------------------------------------------------------------------------------------------
+    def saveCsv(self, path: str):
+        """Saves the results to a CSV file with a row for each object and modifier. Rows of objects have an empty modifier column.
+
+        Args:
+            path (str): The path of the file.
+        """
+        
+        with open(path, "w", newline="") as csvFile:
+            writer = csv.writer(csvFile)
+            writer.writerow(["kind", "object", "modifier", "visible", "rule", "currentlyVisible", "changes"])
+            
+            for record in self.objects:
+                writer.writerow([
+                    "object", record["object"], "", record["visible"], record["rule"], record["currentlyVisible"], 
+                    record["changes"]])
+            
+            for record in self.modifiers:
+                writer.writerow([
+                    "modifier", record["object"], record["modifier"], record["visible"], record["rule"], 
+                    record["currentlyVisible"], record["changes"]])
+
+
+# Last dry run ####################################################################################################################
+
+lastDryRun: DryRun = None
+"""
+The results of the last test run, or `None` if no test run has been made since the add-on was enabled.
+"""
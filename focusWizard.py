@@ -63,11 +63,488 @@
 
 from typing import List, Set
 import bpy
+import os.path
 import re
-from bpy.props import StringProperty, BoolProperty, EnumProperty, PointerProperty
+import time
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty, PointerProperty
 from bpy.types import Context, Panel, Operator, AddonPreferences, PropertyGroup
 from . import presetManager
+from . import ruleEngine
+from . import changeTracker
+from . import instrumentation
+from . import runLog
+from . import dryRun
+from . import sceneState
+from . import visibilityHistory
+from . import parallelEvaluation
+from . import collectionVisibility
+from . import scopeResolver
 
+# NumPy ships with Blender, but flags can be read and written in bulk without it too
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Caches ##########################################################################################################################
+
+_membershipIndex = ruleEngine.MembershipIndex()
+"""
+Visibility of objects in scope under each preset, so that switching presets only touches objects affected by the switch.
+"""
+
+_propertyIndex = ruleEngine.PropertyIndex()
+"""
+Values of visibility control properties of objects in scope, so that objects don't need to be asked for their properties one by 
+one upon each run.
+"""
+
+# Forget what we know when anything may have changed behind the scenes ------------------------------------------------------------
+@bpy.app.handlers.persistent
+def _forgetIndexes(*args):
+    """Handler for undo, redo and loading files. Visibility and custom properties may be anything after these, so indexes are 
+    rebuilt, and the next run checks all objects instead of only those affected by switching presets (or view layers built for
+    presets are checked again). The scope is resolved again, as objects and collections it holds may be gone. The add-on's own 
+    visibility history is dropped as well, as the objects it refers to may be in any state or gone. Presets may have changed 
+    too, so the preset selector is told to rebuild its items.
+    """
+    
+    _membershipIndex.invalidate()
+    _propertyIndex.invalidate()
+    _presetViewLayers.clear()
+    scopeResolver.invalidate()
+    visibilityHistory.history.clear()
+    presetManager.presetsChanged()
+
+handlers = [
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post
+]
+"""
+Application handlers `_forgetIndexes` shall be registered for.
+"""
+
+_scopeKey = None
+"""
+The key of the scope `_scopeNames` has been collected for (see `scopeResolver.Scope.key`).
+"""
+
+_scopeNames = None
+"""
+Names of objects in scope, as seen when changes were last processed. Used to tell which objects entered the scope or got renamed.
+"""
+
+
+# Applying presets in chunks ######################################################################################################
+
+CHUNK_SIZE = 100
+"""
+The number of objects processed between two checks of the time spent when applying a preset in chunks.
+"""
+
+PASS_CHUNK_SIZE = 1000
+"""
+The number of objects processed between two checks of the time spent by passes preparing to apply a preset, like taking a 
+snapshot and evaluating rules, which spend much less time on an object than changing its visibility. Multiplied by the number of 
+worker processes when matching patterns in parallel.
+"""
+
+CHUNK_SECONDS = 0.05
+"""
+The time to spend on applying a preset before letting the UI respond when applying in chunks.
+"""
+
+class RunCancelled(Exception):
+    """
+    Thrown into `PresetApplier.run` to cancel the run and restore visibility.
+    """
+    pass
+
+_chunkedRun = None
+"""
+The `PresetApplier.run` generator of the preset being applied in chunks, or `None` if no preset is being applied in chunks.
+"""
+
+# Tell if a preset shall be applied in chunks -------------------------------------------------------------------------------------
+def _isApplyingInChunks(context: Context) -> bool:
+    """Tells if the selected preset shall be applied in chunks, that is, if there are more objects in scope than the threshold
+    set, and there's a window to show progress in.
+
+    Args:
+        context (Context): A bpy.context object.
+
+    Returns:
+        bool: True to apply the selected preset in chunks.
+    """
+    
+    settings = context.scene.t1nkrFocusWizardSettings
+    
+    if settings.chunkedApplyThreshold <= 0 or context.window is None:
+        return False
+    
+    scope = scopeResolver.resolve(settings)
+    
+    return scope is not None and len(scope) > settings.chunkedApplyThreshold
+
+
+# Setting flags in bulk ###########################################################################################################
+
+# Read a flag of objects in bulk --------------------------------------------------------------------------------------------------
+def _readFlags(objects, flag: str):
+    """Reads a boolean flag of all objects in a collection by one `foreach_get` call, instead of one RNA access per object.
+
+    Args:
+        objects (bpy.types.bpy_prop_collection): The objects, such as `bpy.data.objects`.
+        flag (str): The name of the flag, such as `hide_viewport`.
+
+    Returns:
+        numpy.ndarray: The values of the flag aligned with `objects`, or a list if NumPy is not available. Either can be 
+        passed to `foreach_set` to write the values back.
+    """
+    
+    values = numpy.zeros(len(objects), dtype=bool) if numpy is not None else [False] * len(objects)
+    objects.foreach_get(flag, values)
+    
+    return values
+
+
+# Preset view layers ##############################################################################################################
+
+_presetViewLayers = {}
+"""
+The state of the membership index each view layer built for a preset reflects, keyed by view layer name. See 
+`PresetApplier.run`.
+"""
+
+# Get the view layer of the selected preset ---------------------------------------------------------------------------------------
+def _presetViewLayer(context: Context):
+    """Returns the view layer built for the selected preset, creating it if missing, if presets shall be applied to view layers 
+    of their own. This is not done when testing, when there's no window to show the view layer in, or when hiding objects in 
+    viewports, as the flags doing so are the same in all view layers.
+
+    Args:
+        context (Context): A bpy.context object.
+
+    Returns:
+        bpy.types.ViewLayer: The view layer of the selected preset, or `None` to apply the preset to the view layer shown.
+    """
+    
+    settings = context.scene.t1nkrFocusWizardSettings
+    
+    if (not settings.isUsingPresetViewLayers 
+        or settings.isTestOnly 
+        or settings.hideMode == "VIEWPORT" 
+        or context.window is None
+        or presetManager.findPresetPosition(settings.presets, settings.presetLodLevel) < 0):
+        return None
+    
+    # Blender cuts names to 63 characters
+    name = (presetManager.PRESET_VIEW_LAYER_PREFIX + settings.presetLodLevel)[:63]
+    viewLayer = context.scene.view_layers.get(name)
+    
+    if viewLayer is None:
+        viewLayer = context.scene.view_layers.new(name)
+        _presetViewLayers.pop(name, None)
+    
+    return viewLayer
+
+# Collect the names of properties presets are interested in -----------------------------------------------------------------------
+def _presetPropertyNames(settings) -> frozenset:
+    """Collects the names of visibility control properties used by presets.
+
+    Args:
+        settings (presetManager.T1nkerFocusWizardSettings): The settings of the add-on.
+
+    Returns:
+        frozenset: The names of properties.
+    """
+    
+    return frozenset(preset.propertyName for preset in settings.presets if len(str.strip(preset.propertyName)) > 0)
+
+# Collect values of visibility control properties of an object --------------------------------------------------------------------
+def _collectPropertyValues(obj, propertyNames: set) -> dict:
+    """Collects the values of the visibility control properties an object carries.
+
+    Args:
+        obj (bpy.types.Object): The object.
+        propertyNames (set): The names of properties to collect.
+
+    Returns:
+        dict: Values of the properties found, keyed by property name.
+    """
+    
+    keys = obj.keys()
+    
+    return {propName: obj[propName] for propName in propertyNames if propName in keys}
+
+# Decide collections by collection rules ------------------------------------------------------------------------------------------
+def _decideCollections(scope: scopeResolver.Scope, objects: list, plan: ruleEngine.RulePlan) -> tuple:
+    """Decides which collections in scope to show or hide as a whole by the collection rules of a preset, and the visibility of 
+    objects that follows (see `collectionVisibility.decideCollections`).
+
+    Args:
+        scope (scopeResolver.Scope): The scope.
+        objects (list): Objects to process in scope.
+        plan (ruleEngine.RulePlan): The compiled rules of the preset.
+
+    Returns:
+        tuple: A (decisions, verdicts) pair, where `decisions` maps the names of collections decided to True to show or False to
+        hide, and `verdicts` tells the visibility of objects aligned with `objects`, with `None` for objects left to object 
+        rules. Empty decisions and `None` verdicts if the preset has no collection rules.
+    """
+    
+    if not plan.hasCollectionRules:
+        return {}, None
+    
+    decisions, verdicts = collectionVisibility.decideCollections(
+        scope.roots, scope.excluded, scope.positions, plan.decideCollectionVisibility)
+    
+    if objects is not scope.objects:
+        verdicts = [verdicts[scope.positions[obj.name]] for obj in objects]
+    
+    return decisions, verdicts
+
+# Run steps to the end ------------------------------------------------------------------------------------------------------------
+def _drain(steps):
+    """Runs a generator doing something step by step (like `PresetApplier.run`) to the end in one go.
+
+    Args:
+        steps (generator): The generator.
+
+    Returns:
+        The value returned by the generator.
+    """
+    
+    try:
+        while True:
+            next(steps)
+    except StopIteration as finished:
+        return finished.value
+
+# Take a snapshot of objects ------------------------------------------------------------------------------------------------------
+def _takeSnapshot(objects: list, withState: bool = False):
+    """Extracts what the rule engine needs to know about objects, `PASS_CHUNK_SIZE` objects at a time. Custom property values are
+    taken from the property index, so that objects don't need to be asked for them.
+
+    Args:
+        objects (list): The objects.
+        withState (bool, optional): True to also take the current visibility of objects and modifiers, to tell what a plan would
+        change. Defaults to False.
+
+    Yields:
+        (phase, done, total) tuples telling the progress in objects.
+
+    Returns:
+        ruleEngine.Snapshot: The snapshot of objects.
+    """
+    
+    names = []
+    propertyValues = []
+    modifierNames = []
+    hidden = [] if withState else None
+    modifierShown = [] if withState else None
+    
+    for start in range(0, len(objects), PASS_CHUNK_SIZE):
+        yield "snapshot", start, len(objects)
+        
+        chunk = objects[start:start + PASS_CHUNK_SIZE]
+        chunkNames = [obj.name for obj in chunk]
+        
+        names.extend(chunkNames)
+        propertyValues.extend(_propertyIndex.valuesOf(name) for name in chunkNames)
+        modifierNames.extend(tuple(modifier.name for modifier in obj.modifiers) for obj in chunk)
+        
+        if withState:
+            hidden.extend(obj.hide_get() for obj in chunk)
+            modifierShown.extend(tuple(modifier.show_viewport for modifier in obj.modifiers) for obj in chunk)
+    
+    return ruleEngine.Snapshot(names, propertyValues, modifierNames, hidden, modifierShown)
+
+# Build the property index --------------------------------------------------------------------------------------------------------
+def _buildPropertyIndex(scope: scopeResolver.Scope, propertyNames: frozenset):
+    """Builds the property index in one pass over the objects in scope, `PASS_CHUNK_SIZE` objects at a time, unless it's already
+    built for the scope and property names.
+
+    Args:
+        scope (scopeResolver.Scope): The scope.
+        propertyNames (frozenset): The names of properties presets use (see `_presetPropertyNames`).
+
+    Yields:
+        (phase, done, total) tuples telling the progress in objects.
+    """
+    
+    signature = (scope.key, propertyNames)
+    
+    if _propertyIndex.isValid(signature):
+        return
+    
+    objects = scope.objects
+    entries = []
+    
+    for start in range(0, len(objects), PASS_CHUNK_SIZE):
+        yield "property index", start, len(objects)
+        
+        entries.extend(
+            (obj.name, _collectPropertyValues(obj, propertyNames)) for obj in objects[start:start + PASS_CHUNK_SIZE])
+    
+    _propertyIndex.rebuild(signature, propertyNames, entries)
+
+# Process changed objects ---------------------------------------------------------------------------------------------------------
+def _syncWithChanges(context: Context, applyChanges: bool):
+    """Consumes changes collected by `changeTracker` and updates the membership index for objects changed in the scope. If 
+    `applyChanges` is set, the selected preset is also applied to these objects, so that the view stays correct without processing
+    the entire scope.
+
+    Args:
+        context (Context): A bpy.context object.
+        applyChanges (bool): True to apply the selected preset to changed objects.
+    """
+    
+    global _scopeKey, _scopeNames
+    
+    dirtyNames, structureChanged = changeTracker.consumeChanges()
+    settings = context.scene.t1nkrFocusWizardSettings
+    scope = scopeResolver.resolve(settings)
+    
+    if scope is None:
+        return
+    
+    # Objects which entered the scope or got renamed need to be processed as well
+    if structureChanged or _scopeNames is None or _scopeKey != scope.key:
+        names = frozenset(scope.positions)
+        
+        if _scopeNames is not None and _scopeKey == scope.key:
+            dirtyNames |= names - _scopeNames
+        
+        _scopeKey = scope.key
+        _scopeNames = names
+    
+    objects = [bpy.data.objects[name] for name in dirtyNames & _scopeNames if name in bpy.data.objects]
+    
+    # Build the property index in one pass if it's not built yet, or keep it up to date by processing changed objects only
+    propertyNames = _presetPropertyNames(settings)
+    
+    if not _propertyIndex.isValid((scope.key, propertyNames)):
+        _drain(_buildPropertyIndex(scope, propertyNames))
+    else:
+        for obj in objects:
+            _propertyIndex.updateObject(obj.name, _collectPropertyValues(obj, propertyNames))
+    
+    if len(objects) == 0:
+        return
+    
+    # Changed custom properties may change visibility under any preset
+    if _membershipIndex.signature is not None:
+        try:
+            plans = [ruleEngine.getRulePlan(preset) for preset in settings.presets]
+            
+            for obj in objects:
+                _membershipIndex.updateObject(obj.name, _propertyIndex.valuesOf(obj.name), plans)
+        except re.error:
+            _membershipIndex.invalidate()
+    
+    if not applyChanges or settings.isTestOnly:
+        return
+    
+    try:
+        plan = ruleEngine.getRulePlan(settings.selectedPreset)
+    except re.error:
+        # The user is probably typing the pattern right now
+        return
+    
+    # Objects changed may need their collection hidden or shown as a whole, or may have been moved to a collection decided by
+    # collection rules, so apply the preset to the whole scope then, which only writes what differs. Do it quietly and in one go,
+    # as this runs on each change while editing.
+    if (settings.isHidingCollections and not settings.affectSelectedObjectsOnly) or plan.hasCollectionRules:
+        _applySelectedPreset(context, isLiveUpdate=True)
+        return
+    
+    viewLayer = context.view_layer
+    hideFlags = settings.hideFlags()
+    
+    for obj in objects:
+        if settings.affectSelectedObjectsOnly and not obj.select_get():
+            continue
+        
+        visible, _ = plan.decideObjectVisibility(obj.name, _propertyIndex.valueOf(plan.propertyName, obj.name))
+        
+        if hideFlags:
+            if obj.hide_viewport == visible:
+                changeTracker.ignoreOwnChanges((obj.name,))
+                
+                for flag in hideFlags:
+                    setattr(obj, flag, not visible)
+            
+            # visible_get() only catches up with flags when the depsgraph is evaluated next time
+            isVisible = visible and not obj.hide_get(view_layer=viewLayer)
+        else:
+            if obj.hide_get(view_layer=viewLayer) == visible:
+                changeTracker.ignoreOwnChanges((obj.name,))
+                obj.hide_set(not visible, view_layer=viewLayer)
+            
+            isVisible = obj.visible_get()
+        
+        if not isVisible:
+            continue
+        
+        for modifier in obj.modifiers:
+            visible, _ = plan.decideModifierVisibility(modifier.name)
+            
+            if modifier.show_viewport != visible:
+                changeTracker.ignoreOwnChanges((obj.name,))
+                modifier.show_viewport = visible
+
+# Keep the view up to date --------------------------------------------------------------------------------------------------------
+def _applyChangesLive():
+    """
+    Timer callback scheduled by `changeTracker` when something changed. Applies the selected preset to changed objects if the user
+    asked for keeping the view up to date. Our own changes are not taken for changes (see `changeTracker.ignoreOwnChanges`), so 
+    they don't trigger this again.
+    """
+    
+    context = bpy.context
+    
+    # Don't interfere with a preset being applied in chunks, but try again later
+    if _chunkedRun is not None:
+        return 0.5
+    
+    _syncWithChanges(context, applyChanges=context.scene.t1nkrFocusWizardSettings.isLiveUpdate)
+    
+    # Don't repeat
+    return None
+
+changeTracker.liveUpdateCallback = _applyChangesLive
+
+# Apply the preset selected -------------------------------------------------------------------------------------------------------
+def _applySelectedPreset(context: Context, report=None, isLiveUpdate: bool = False) -> set:
+    """Applies the selected preset without calling the operator, or starts applying it in chunks if there are many objects in 
+    scope. Called by `presetManager` when a preset is selected, and by operators applying presets.
+
+    Args:
+        context (Context): A bpy.context object.
+        report (optional): The `report` function of the operator applying the preset. If not specified, results are only 
+        logged.
+        isLiveUpdate (bool, optional): True when keeping the view up to date, to apply the preset in one go with a quiet log, 
+        as changes keep coming while editing. Defaults to False.
+        
+    Returns:
+        Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+    """
+    
+    if not isLiveUpdate and _isApplyingInChunks(context):
+        # Steps are recorded in the add-on's own history then, so don't push them to Blender's global undo too
+        if context.scene.t1nkrFocusWizardSettings.isUsingVisibilityHistory:
+            bpy.ops.t1nker.focuswizardchunkednoundo('INVOKE_DEFAULT')
+        else:
+            bpy.ops.t1nker.focuswizardchunked('INVOKE_DEFAULT')
+        
+        return {'FINISHED'}
+    
+    return PresetApplier(report, _presetViewLayer(context), isQuiet=isLiveUpdate).apply(context)
+
+presetManager.applyPresetCallback = _applySelectedPreset
 
     
 # Control panel to show in Blender's viewport, in the 'N' toolbar #################################################################
@@ -127,6 +604,26 @@ class T1nkerFocusWizardPanel(bpy.types.Panel):
         
         row = box.row(align=True)
         row.prop_search(data=self.settings, property="rootCollection", search_data=bpy.data, search_property="collections")
+        row.operator("t1nker.focuswizardscopecollections", text="", icon="ADD").action = "ADD_ROOT"
+        
+        # More root collections and excluded collections
+        for listName, removeAction, label in (
+            ("additionalRootCollections", "REMOVE_ROOT", "Also"), 
+            ("excludedCollections", "REMOVE_EXCLUDED", "Except")):
+            for index, reference in enumerate(getattr(self.settings, listName)):
+                row = box.row(align=True)
+                row.prop_search(
+                    data=reference, property="collection", search_data=bpy.data, search_property="collections", text=label)
+                
+                operator = row.operator("t1nker.focuswizardscopecollections", text="", icon="X")
+                operator.action = removeAction
+                operator.index = index
+        
+        row = box.row(align=True)
+        row.operator("t1nker.focuswizardscopecollections", text="Exclude Collection", icon="REMOVE").action = "ADD_EXCLUDED"
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "objectTypes")
         
 
         # Preset selector and info
@@ -138,7 +635,12 @@ class T1nkerFocusWizardPanel(bpy.types.Panel):
         row.label(text="Choose, apply, view and edit presets")        
         
         row = box.row(align=True)
-        row.prop(self.settings, "presetLodLevel")
+        if self.settings.isUsingVisibilityHistory:
+            # Select by an operator, as changing the property on the UI would push a step to Blender's global undo
+            row.label(text="Select preset:")
+            row.operator_menu_enum("t1nker.focuswizardselectpreset", "presetName", text=self.settings.presetLodLevel)
+        else:
+            row.prop(self.settings, "presetLodLevel")
         
         # See if the preset list is empty or not
         if len(self.settings.presets) == 0:
@@ -152,7 +654,32 @@ class T1nkerFocusWizardPanel(bpy.types.Panel):
         
         # Apply current preset which happens automatically upon changing. You can use this button to force manual execution.
         #
-        row.operator("t1nker.focuswizard", text="Refresh", icon="FILE_REFRESH")
+        if self.settings.isUsingVisibilityHistory and len(self.settings.presets) > 0:
+            row.operator(
+                "t1nker.focuswizardselectpreset", text="Refresh", icon="FILE_REFRESH").presetName = self.settings.presetLodLevel
+        else:
+            row.operator("t1nker.focuswizard", text="Refresh", icon="FILE_REFRESH")
+        
+        # Undo and redo visibility changes kept in the add-on's own history
+        if self.settings.isUsingVisibilityHistory:
+            undoStep = visibilityHistory.history.nextUndo()
+            redoStep = visibilityHistory.history.nextRedo()
+            
+            row = box.row(align=True)
+            
+            column = row.row(align=True)
+            column.enabled = undoStep is not None
+            column.operator(
+                "t1nker.focuswizardvisibilityhistory", 
+                text="Undo" if undoStep is None else f"Undo {undoStep.presetName}", 
+                icon="LOOP_BACK").action = "UNDO"
+            
+            column = row.row(align=True)
+            column.enabled = redoStep is not None
+            column.operator(
+                "t1nker.focuswizardvisibilityhistory", 
+                text="Redo" if redoStep is None else f"Redo {redoStep.presetName}", 
+                icon="LOOP_FORWARDS").action = "REDO"
         
         
         # Info on selected preset
@@ -185,6 +712,12 @@ class T1nkerFocusWizardPanel(bpy.types.Panel):
         propColumn.label(text="Modifiers to hide:")
         valueColumn.label(text=self.settings.selectedPreset.modifiersToHide)
         
+        propColumn.label(text="Collections to show:")
+        valueColumn.label(text=self.settings.selectedPreset.collectionsToShow)
+        
+        propColumn.label(text="Collections to hide:")
+        valueColumn.label(text=self.settings.selectedPreset.collectionsToHide)
+        
         
         # Section for operational settings
         #
@@ -200,352 +733,1589 @@ class T1nkerFocusWizardPanel(bpy.types.Panel):
         row = box.row(align=True)
         row.prop(self.settings, "isTestOnly")  
         
+        # Results of the last test run
+        if self.settings.isTestOnly and dryRun.lastDryRun is not None:
+            counts = dryRun.lastDryRun.counts
+            
+            row = box.row(align=True)
+            row.label(text=f"Last test of {dryRun.lastDryRun.presetName}:")
+            
+            row = box.row(align=True)
+            row.label(text=f"Objects: {counts['objectsVisible']} visible, {counts['objectsHidden']} hidden, "
+                           f"{counts['objectsChanging']} changing")
+            
+            row = box.row(align=True)
+            row.label(text=f"Modifiers: {counts['modifiersVisible']} visible, {counts['modifiersHidden']} hidden, "
+                           f"{counts['modifiersChanging']} changing")
+            
+            row = box.row(align=True)
+            row.prop(self.settings, "dryRunFile")
+            
+            row = box.row(align=True)
+            row.operator("t1nker.focuswizarddryrunexport", text="Export JSON", icon="EXPORT").fileFormat = "JSON"
+            row.operator("t1nker.focuswizarddryrunexport", text="Export CSV", icon="EXPORT").fileFormat = "CSV"
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "logDetailLimit")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "logFile")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "isLiveUpdate")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "isUsingVisibilityHistory")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "hideMode")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "isHidingCollections")
+        
+        if self.settings.hideMode != "VIEWPORT":
+            row = box.row(align=True)
+            row.prop(self.settings, "isUsingPresetViewLayers")
+        
+        if self.settings.hideMode == "VIEWPORT":
+            row = box.row(align=True)
+            row.prop(self.settings, "isHidingRender")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "chunkedApplyThreshold")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "parallelThreshold")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "isShowingStatistics")
+        
+        row = box.row(align=True)
+        row.prop(self.settings, "isProfilingNextRun")
+        
+        if self.settings.isProfilingNextRun:
+            row = box.row(align=True)
+            row.prop(self.settings, "profileFolder")
+        
+        
+        # Statistics of the last run
+        #
+        
+        if self.settings.isShowingStatistics:
+            box = layout.box()
+            
+            row = box.row(align=True)
+            
+            stats = instrumentation.lastRun
+            
+            if stats is None:
+                row.label(text="No preset applied yet")
+                return
+            
+            row.label(text=f"Last run: {stats.presetName} in {stats.totalSeconds() * 1000:.1f} ms")
+            
+            row = box.row(align=True)
+            nameColumn = row.column()
+            valueColumn = row.column()
+            
+            for phase, seconds in stats.phases.items():
+                nameColumn.label(text=f"{phase}:")
+                valueColumn.label(text=f"{seconds * 1000:.1f} ms")
+            
+            for counter, value in stats.counters.items():
+                nameColumn.label(text=f"{counter}:")
+                valueColumn.label(text=f"{value}")
 
 
 # Business logic for showing/hiding objects and modifiers #########################################################################
-class T1NKER_OT_FocusWizard(Operator):    
+class PresetApplier:
     """
-    This class contains the implementation of applying the selected preset.
+    This class contains the implementation of applying the selected preset. It's kept apart from the operator, so that selecting 
+    a preset can apply it directly, without the overhead of calling an operator.
     """
     
-    # Properties ==================================================================================================================
-    
-    # Blender-specific stuff ------------------------------------------------------------------------------------------------------    
-    bl_idname = "t1nker.focuswizard"
-    bl_label = "T1nk-R Focus Wizard"
-    bl_options = {'REGISTER', 'UNDO'}    
-    
-    # Other properties ------------------------------------------------------------------------------------------------------------
-        
     # Lifecycle management ========================================================================================================    
-    def __init__(self):
+    def __init__(self, report=None, viewLayer=None, isQuiet: bool = False):
         """
-        Creates `self.settings: presetManager.T1nkerFocusWizardSettings`, a shortcut for the add-on's settings.
+        Creates `self.settings: presetManager.T1nkerFocusWizardSettings`, a shortcut for the add-on's settings, `self.log`, 
+        the log of the run in progress, `self.report`, the function to report results to the user with, `self.viewLayer`,
+        the view layer built for the preset to apply it to, and `self.isQuiet`, telling if only warnings and errors are logged.
+        
+        Args:
+            report (optional): The `report` function of the operator applying the preset. If not specified, results are only 
+            logged.
+            viewLayer (bpy.types.ViewLayer, optional): The view layer built for the selected preset (see `_presetViewLayer`), 
+            to apply the preset to and show. If not specified, the preset is applied to the view layer shown.
+            isQuiet (bool, optional): True to only log warnings and errors, and not to profile the run, as when keeping the view
+            up to date. Defaults to False.
         """
         self.settings = None                
+        self.log = runLog.RunLog()
+        self.report = report if report is not None else (lambda type, message: None)
+        self.viewLayer = viewLayer
+        self.isQuiet = isQuiet
     
-    # Poll callback for accessibility ---------------------------------------------------------------------------------------------
-    @classmethod
-    def poll(cls, context):
-        """Standard method requested by Blender to tell if the UI can be drawn.
+    # Private functions ===========================================================================================================
+    
+    # Tell if patterns shall be matched in parallel -------------------------------------------------------------------------------
+    def _isMatchingInParallel(self, objectCount: int) -> bool:
+        """Tells if patterns shall be matched in worker processes, that is, if there are more objects than the threshold set.
 
         Args:
-            context (bpy.types.Context): The bpy.context object passed by Blender.
+            objectCount (int): The number of objects to match patterns against.
 
         Returns:
-            Boolean: True if the UI can be drawn.
+            bool: True to match patterns in parallel.
         """
         
-        # We can work regardless of objects are selected or not, so let's just return true always
-        return True
+        threshold = self.settings.parallelThreshold
+        
+        return threshold > 0 and objectCount > threshold
     
+    # Give up matching patterns in parallel ---------------------------------------------------------------------------------------
+    def _stopMatchingInParallel(self, error: Exception):
+        """Logs why worker processes cannot be used, and stops them, so that patterns are matched here instead. The pool is 
+        started again for the next run.
 
-    # Draw UI ---------------------------------------------------------------------------------------------------------------------
-    def invoke(self, context, event):           
+        Args:
+            error (Exception): The error raised by `parallelEvaluation`.
+        """
+        
+        self.log.warning("Cannot match patterns in parallel for an error of %s, matching them here instead", error)
+        parallelEvaluation.shutdown()
+    
+    # Tell if collections shall be hidden as a whole ------------------------------------------------------------------------------
+    def _isHidingCollections(self) -> bool:
+        """Tells if collections shall be hidden and shown as a whole, either automatically or by collection rules. Collections 
+        also contain objects not selected, and test runs don't change anything, so collections are only hidden when processing 
+        all objects for real.
+
+        Returns:
+            bool: True to hide collections as a whole.
         """
-        Show the panel.
         
+        return (
+            self.settings.isControllingCollections() 
+            and not self.settings.affectSelectedObjectsOnly 
+            and not self.settings.isTestOnly)
+    
+    # Collect collections decided by any preset -----------------------------------------------------------------------------------
+    def _managedCollections(self, scope: scopeResolver.Scope) -> set:
+        """Collects the collections in scope decided by the collection rules of any preset. When only collection rules hide 
+        collections, these are to be shown if the preset applied doesn't decide them, so that switching presets doesn't leave 
+        them hidden. Presets with an invalid pattern are ignored here.
+
         Args:
-            context (bpy.types.Context): The bpy.context object passed by Blender.
-            event: An event passed by Blender. Not used by us.
-            
+            scope (scopeResolver.Scope): The scope.
+
         Returns:
-            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+            set: The names of collections.
         """
         
-        # For first run in the session, load addon defaults (otherwise use values set previously in the session)
-        if self.settings is None:
+        plans = []
+        
+        for preset in self.settings.presets:
             try:
-                self.settings = context.scene.t1nkrFocusWizardSettings
-            except:
-                pass                
+                plan = ruleEngine.getRulePlan(preset)
+            except re.error:
+                continue
+            
+            if plan.hasCollectionRules:
+                plans.append(plan)
+        
+        return {
+            collection.name 
+            for collection in scope.collections() 
+            if any(plan.decideCollectionVisibility(collection.name) is not None for plan in plans)}
+    
+    # Work out which collections to hide and show ---------------------------------------------------------------------------------
+    def _planCollections(
+        self, viewLayer, scope: scopeResolver.Scope, objectVisible, decisions: dict, 
+        isAutomatic: bool) -> collectionVisibility.CollectionPlan:
+        """Works out which collections under the root collections to hide and show, by the help of `collectionVisibility`. If a
+        root collection is linked to more parents, or an object is linked under more roots, objects are only left to collections
+        if not in any collection shown.
 
-        # Show dialog
-        result = context.window_manager.invoke_props_dialog(self, width=400)
-                
-        if (self.settings.affectSelectedObjectsOnly and len(bpy.context.selected_objects) == 0):
-            self.report({'ERROR'}, "You chose to process only selected objects, but no object is selected.") 
-            return {'CANCELLED'}
+        Args:
+            viewLayer (bpy.types.ViewLayer): The view layer to work in.
+            scope (scopeResolver.Scope): The scope.
+            objectVisible (sequence): Tells if objects shall be visible, aligned with `scope.objects`.
+            decisions (dict): Collections to show (True) or hide (False) as a whole, keyed by name.
+            isAutomatic (bool): True to also hide collections whose objects are all to be hidden, False to only hide and show 
+            collections decided.
 
+        Returns:
+            collectionVisibility.CollectionPlan: The plan, or `None` if no root collection is in the view layer.
+        """
+        
+        plans = [
+            collectionVisibility.planCollections(
+                layerCollection, scope.positions, objectVisible, scope.excluded, decisions, isAutomatic)
+            for root in scope.roots
+            for layerCollection in collectionVisibility.layerCollectionsOf(viewLayer.layer_collection, root)]
+        
+        if len(plans) == 0:
+            return None
+        
+        return collectionVisibility.mergePlans(plans)
+    
+    # Hide and show collections ---------------------------------------------------------------------------------------------------
+    def _applyCollectionPlan(self, collectionPlan: collectionVisibility.CollectionPlan, hideFlags: tuple, 
+                             originalState: sceneState.SceneState, step) -> tuple:
+        """Hides and shows collections as planned, touching only those whose state differs.
+
+        Args:
+            collectionPlan (collectionVisibility.CollectionPlan): The plan.
+            hideFlags (tuple): Flags of collections to set, or empty to set `hide_viewport` of layer collections.
+            originalState (sceneState.SceneState): The state to record the original flags of collections changed in.
+            step (visibilityHistory.VisibilityStep): The history step to record changes in, or `None`.
+
+        Returns:
+            tuple: The number of collections changed and the number of collections already in the target state.
+        """
+        
+        writes = 0
+        skipped = 0
+        
+        targets = [(layerCollection, True) for layerCollection in collectionPlan.hidden]
+        targets.extend((layerCollection, False) for layerCollection in collectionPlan.shown)
+        
+        for layerCollection, hidden in targets:
+            if hideFlags:
+                flags = [(layerCollection.collection, flag) for flag in hideFlags]
+            else:
+                flags = [(layerCollection, "hide_viewport")]
+            
+            isChanged = False
+            
+            for owner, flag in flags:
+                if getattr(owner, flag) != hidden:
+                    originalState.noteCollection(owner, flag)
+                    changeTracker.ignoreOwnChanges(collections=True)
+                    setattr(owner, flag, hidden)
+                    isChanged = True
+            
+            if not isChanged:
+                skipped += 1
+                continue
+            
+            writes += 1
+            
+            if step is not None:
+                step.noteCollection(layerCollection.collection.name, hidden)
+            
+            self.log.detail(
+                runLog.LEVEL_DEBUG, "\t\tCollection '%s' made %s", layerCollection.name, "hidden" if hidden else "visible")
+        
+        return writes, skipped
+    
+    # Write the log ---------------------------------------------------------------------------------------------------------------
+    def _flushLog(self, logFile: str):
+        """Writes the log of the run, unless the run is quiet and nothing worth telling has been logged.
+
+        Args:
+            logFile (str): The path of the file to append the log to, or empty to write it to the console.
+        """
+        
+        if self.isQuiet and self.log.lineCount == 0:
+            return
+        
+        self.log.flush(logFile)
+    
+    # Get the objects to process --------------------------------------------------------------------------------------------------
+    def _objectsToProcess(self, scope: scopeResolver.Scope, viewLayer) -> list:
+        """Returns the objects to process in scope: all of them, or only those selected if asked to.
+
+        Args:
+            scope (scopeResolver.Scope): The scope.
+            viewLayer (bpy.types.ViewLayer): The view layer to check selection in.
+
+        Returns:
+            list: The objects.
+        """
+        
+        if self.settings.affectSelectedObjectsOnly:
+            return scope.selectedObjects(viewLayer)
+        
+        return scope.objects
+    
+    # Tell how many objects a pass processes in one go ----------------------------------------------------------------------------
+    def _passChunkSize(self, isParallel: bool) -> int:
+        """Tells how many objects a pass preparing to apply a preset processes between two checks of the time spent.
+
+        Args:
+            isParallel (bool): True if patterns are matched in worker processes.
+
+        Returns:
+            int: The number of objects.
+        """
+        
+        return PASS_CHUNK_SIZE * parallelEvaluation.workerCount() if isParallel else PASS_CHUNK_SIZE
+    
+    # Work out the visibility of objects and modifiers ----------------------------------------------------------------------------
+    def _evaluate(
+        self, snapshot: ruleEngine.Snapshot, plan: ruleEngine.RulePlan, collectionVerdicts: list = None, objects: bool = True):
+        """Works out the target visibility of objects and modifiers in a snapshot part by part, matching patterns in worker 
+        processes if there are many objects.
+
+        Args:
+            snapshot (ruleEngine.Snapshot): The objects to evaluate the preset for.
+            plan (ruleEngine.RulePlan): The compiled rules of the preset.
+            collectionVerdicts (list, optional): The visibility of objects decided by collection rules, overriding object rules.
+            Defaults to None.
+            objects (bool, optional): False to only work out the visibility of modifiers (see `ruleEngine.evaluate`). Defaults 
+            to True.
+
+        Yields:
+            (phase, done, total) tuples telling the progress in objects.
+
+        Returns:
+            ruleEngine.VisibilityPlan: The target visibility of objects and modifiers.
+        """
+        
+        result = ruleEngine.VisibilityPlan()
+        modifierDecisions = {}
+        isParallel = objects and self._isMatchingInParallel(len(snapshot))
+        
+        if isParallel:
+            self.log.debug("\tMatching patterns in %d worker processes", parallelEvaluation.workerCount())
+        
+        start = 0
+        
+        while start < len(snapshot):
+            yield "evaluate rules", start, len(snapshot)
+            
+            end = min(start + self._passChunkSize(isParallel), len(snapshot))
+            part = snapshot.slice(start, end)
+            verdicts = collectionVerdicts[start:end] if collectionVerdicts is not None else None
+            
+            if isParallel:
+                try:
+                    result.extend(parallelEvaluation.evaluate(part, plan, verdicts, modifierDecisions))
+                    start = end
+                    continue
+                except parallelEvaluation.POOL_ERRORS as ex:
+                    self._stopMatchingInParallel(ex)
+                    isParallel = False
+                    continue
+            
+            result.extend(
+                ruleEngine.evaluate(
+                    part, plan, objects=objects, collectionVerdicts=verdicts, modifierDecisions=modifierDecisions))
+            start = end
+        
         return result
     
+    # Get the objects to check for applying a preset ------------------------------------------------------------------------------
+    def _prepareMembershipIndex(self, scope: scopeResolver.Scope, objects: list, presetPosition: int, viewLayerName: str):
+        """Makes sure the membership index is up to date, and tells which objects need to be checked to apply a preset. The index
+        is rebuilt if the objects in scope, their names or any preset changed since the last build.
+
+        Args:
+            scope (scopeResolver.Scope): The scope.
+            objects (list): Objects to process in scope.
+            presetPosition (int): The index of the preset to apply in `self.settings.presets`.
+            viewLayerName (str): The name of the view layer to apply the preset in.
+
+        Yields:
+            (phase, done, total) tuples telling the progress in objects.
+
+        Returns:
+            Positions of objects in `objects` to check, or `None` if the index cannot be used as a preset has an invalid pattern.
+        """
+        
+        try:
+            plans = [ruleEngine.getRulePlan(preset) for preset in self.settings.presets]
+        except re.error:
+            _membershipIndex.invalidate()
+            return None
+        
+        names = [obj.name for obj in objects]
+        
+        # Collection rules depend on which collections objects are in
+        isDecidingCollections = any(plan.hasCollectionRules for plan in plans)
+        
+        signature = (
+            scope.key, 
+            self.settings.affectSelectedObjectsOnly, 
+            tuple(names), 
+            tuple(plan.fields for plan in plans),
+            changeTracker.structureGeneration if isDecidingCollections else None)
+        
+        if not _membershipIndex.isValid(signature):
+            self.log.debug("\tEvaluating %d presets for %d objects to build the membership index", len(plans), len(objects))
+            
+            propertyValues = [_propertyIndex.valuesOf(name) for name in names]
+            masks = []
+            isParallel = self._isMatchingInParallel(len(names))
+            start = 0
+            
+            while start < len(names):
+                yield "membership index", start, len(names)
+                
+                end = min(start + self._passChunkSize(isParallel), len(names))
+                
+                if isParallel:
+                    try:
+                        masks.extend(parallelEvaluation.membershipMasks(names[start:end], propertyValues[start:end], plans))
+                        start = end
+                        continue
+                    except parallelEvaluation.POOL_ERRORS as ex:
+                        self._stopMatchingInParallel(ex)
+                        isParallel = False
+                        continue
+                
+                masks.extend(ruleEngine.membershipMasks(names[start:end], propertyValues[start:end], plans))
+                start = end
+            
+            collectionMasks = None
+            
+            if isDecidingCollections:
+                decided = [0] * len(objects)
+                shown = [0] * len(objects)
+                
+                for presetBit, plan in enumerate(plans):
+                    yield "membership index", len(names), len(names)
+                    
+                    _, verdicts = _decideCollections(scope, objects, plan)
+                    
+                    if verdicts is None:
+                        continue
+                    
+                    for position, verdict in enumerate(verdicts):
+                        if verdict is not None:
+                            decided[position] |= 1 << presetBit
+                            
+                            if verdict:
+                                shown[position] |= 1 << presetBit
+                
+                collectionMasks = list(zip(decided, shown))
+            
+            _membershipIndex.rebuild(signature, names, propertyValues, plans, masks, collectionMasks)
+        
+        appliedPreset = _membershipIndex.appliedPreset
+        
+        # Check all objects if there's nothing to compare to, if the same preset is applied again, as it's the way to revert
+        # manual changes, or if the preset applied last has been applied in another view layer, as objects may be in any state in
+        # this one
+        if appliedPreset < 0 or appliedPreset == presetPosition or _membershipIndex.appliedViewLayer != viewLayerName:
+            return list(range(len(objects)))
+        
+        return _membershipIndex.changedPositions(appliedPreset, presetPosition)
     
-    # Execute the operator --------------------------------------------------------------------------------------------------------
-    def execute(self, context):      
+    # Public functions ============================================================================================================
+
+    # Apply the selected preset ---------------------------------------------------------------------------------------------------
+    def apply(self, context):      
         """
         Perform the requested operation using the currently selected preset 
         stored in context.scene.t1nkrFocusWizardSettings.selectedPreset.
         
         Args:
-            context (bpy.types.Context): The bpy.context object passed by Blender.
+            context (bpy.types.Context): A bpy.context object.
             
         Returns:
             Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
         """                     
         
-        print("")
-        print("=" * 80)
-        print(f"T1nk-R Focus Wizard Visibility Adjustment operation started")
-        print()
+        return _drain(self.run(context))
+    
+    # Apply the selected preset step by step --------------------------------------------------------------------------------------
+    def run(self, context):      
+        """
+        Perform the requested operation using the currently selected preset 
+        stored in context.scene.t1nkrFocusWizardSettings.selectedPreset, step by step. This is a generator pausing after each 
+        `CHUNK_SIZE` objects changed, and after each `PASS_CHUNK_SIZE` objects captured, snapshotted or evaluated, so that the 
+        caller can keep the UI responsive and report progress. Throw `RunCancelled` into it to cancel the run and restore 
+        visibility.
+        
+        Args:
+            context (bpy.types.Context): A bpy.context object.
             
+        Yields:
+            (phase, done, total) tuples telling the phase in progress and the progress of the phase in objects.
+            
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """                     
+        
         # Get relevant stuff to shortcut variables
         self.settings = context.scene.t1nkrFocusWizardSettings   
-        viewLayer = context.view_layer            
-        activeObject = viewLayer.objects.active
-        root = self.settings.rootCollection
+        viewLayer = self.viewLayer if self.viewLayer is not None else context.view_layer
         preset = self.settings.selectedPreset
         
-        if root == None:
+        # Collect messages and write them in one go at the end, as the console is slow to write to line by line
+        if self.isQuiet:
+            level = runLog.LEVEL_WARNING
+        else:
+            level = runLog.LEVEL_DEBUG if self.settings.isVerbose else runLog.LEVEL_INFO
+        
+        log = runLog.RunLog(level=level, detailLimit=self.settings.logDetailLimit)
+        self.log = log
+        logFile = bpy.path.abspath(self.settings.logFile)
+        
+        log.info("")
+        log.info("=" * 80)
+        log.info("T1nk-R Focus Wizard Visibility Adjustment operation started")
+        log.info("")
+        
+        if self.settings.rootCollection == None:
             self.report({'ERROR'}, "No root collection selected. Select where to operate.")
+            log.error("No root collection selected")
+            self._flushLog(logFile)
+            return {'CANCELLED'}
+        
+        # Profile this run if asked to, unless profiling has already been started by selecting the preset
+        isProfiling = not self.isQuiet and self.settings.isProfilingNextRun and instrumentation.startProfiling()
+        
+        # Record where time goes and what's done, so that slow runs can be explained
+        stats = instrumentation.RunStats(preset.presetName)
+        instrumentation.lastRun = stats
+        stats.beginPhase("scope")
+        
+        # Get the objects in scope (resolved again only if the settings or the collection hierarchy changed), and prepare to 
+        # capture the state of those to process so that it can be restored if anything goes wrong
+        scope = scopeResolver.resolve(self.settings)
+        objects = self._objectsToProcess(scope, viewLayer)
+        
+        if len(objects) == 0:
+            if self.settings.affectSelectedObjectsOnly:
+                whatHappened = "You chose to process only selected objects, but no object is selected in the root collections."
+            else:
+                whatHappened = "There are no objects to process in the root collections."
+            
+            self.report({'WARNING'}, whatHappened)
+            log.warning(whatHappened)
+            
+            if isProfiling:
+                self.settings.saveProfile("apply preset", log)
+            
+            self._flushLog(logFile)
             return {'CANCELLED'}
         
-        selectedObjects = [obj for obj in root.all_objects if obj.select_get()]
-        visibleObjects =  [obj for obj in root.all_objects if obj.visible_get()]
+        originalState = sceneState.SceneState(objects, viewLayer, isCapturingNow=False)
+
+        log.info("Will process objects under collections %s", ", ".join(f"'{root.name}'" for root in scope.roots))
+        
+        if len(scope.excluded) > 0:
+            log.info("Except for collections %s", ", ".join(f"'{name}'" for name in sorted(scope.excluded)))
+        
+        # Count visibility writes made and skipped for the summary
+        hideWrites = 0
+        hideWritesSkipped = 0
+        modifierWrites = 0
+        modifierWritesSkipped = 0
+        
+        # Flags to set in bulk to hide objects, or none if hiding objects in the view layer one by one
+        hideFlags = () if self.settings.isTestOnly else self.settings.hideFlags()
+        hideCounter = "hide_viewport writes" if hideFlags else "hide_set calls"
+        
+        # Record changes in the add-on's own history if asked to, so that they can be undone without Blender's global undo
+        step = None
+        if self.settings.isUsingVisibilityHistory and not self.settings.isTestOnly and self.viewLayer is None:
+            step = visibilityHistory.VisibilityStep(preset.presetName, hideFlags)
 
-        print(f"Will process objects under collection '{root.name}'")
+        result = {'FINISHED'}
 
         # Big try block to make sure we terminate gracefully
         try:            
             
-            # Determine scope and collect objects
+            # Capture the state of objects part by part, pausing before anything else, so that the run can be canceled early, and 
+            # build the property index if not built yet. These touch objects in scope first, so if any of them has been removed 
+            # since resolving the scope, it turns out here, before changing anything, and the scope is resolved again once.
+            for attempt in range(2):
+                try:
+                    stats.beginPhase("capture state")
+                    
+                    for start in range(0, len(objects), PASS_CHUNK_SIZE):
+                        yield "capture state", start, len(objects)
+                        originalState.capture(PASS_CHUNK_SIZE)
+                    
+                    stats.beginPhase("property index")
+                    yield from _buildPropertyIndex(scope, _presetPropertyNames(self.settings))
+                    break
+                except ReferenceError:
+                    if attempt > 0:
+                        raise
+                    
+                    log.info("Objects in scope have been removed since the scope was resolved, resolving it again")
+                    
+                    scopeResolver.invalidate()
+                    scope = scopeResolver.resolve(self.settings)
+                    objects = self._objectsToProcess(scope, viewLayer)
+                    originalState = sceneState.SceneState(objects, viewLayer, isCapturingNow=False)
+            
+            # Get the compiled patterns of the preset (raises an error for an invalid pattern, so keep this in the try block)
+            stats.beginPhase("compile rules")
+            plan = ruleEngine.getRulePlan(preset)
+            
+            # Catch up with changes made since the last run, so that indexes are up to date
+            stats.beginPhase("sync changes")
+            _syncWithChanges(context, applyChanges=False)
+            
+            # Tell the scope
             if self.settings.affectSelectedObjectsOnly:
-                print(f"Will process only selected objects within the collection")
-                objects = selectedObjects
+                log.info("Will process only selected objects within the collections")
             else:
-                print(f"Will process all objects under the collection")
-                objects = root.all_objects
+                log.info("Will process all objects under the collections")
 
-            if self.settings.isVerbose:
-                print("Objects to process" + ", ".join([o.name for o in objects]))
+            if log.isEnabled(runLog.LEVEL_DEBUG):
+                log.debug("Objects to process: %s", ", ".join([o.name for o in objects]))
 
-            print(f"Processing {len(objects)} objects:")
+            log.info("Processing %d objects:", len(objects))
+            stats.count("objects scanned", len(objects))
             
+            # Tell which rules are in effect
             if self.settings.isVerbose or self.settings.isTestOnly:
-                print(f"Hiding all objects")
-                
-            for obj in objects:
-                obj.hide_set(True, view_layer=viewLayer)
-                # obj.hide_viewport = obj.hide_render = False
-            
-            # Show objects by name
-            if len(preset.objectsToShowByName) == 0:
-                                
-                if self.settings.isTestOnly:
-                    print(f"\tNo pattern defined to show objects by name, WOULD show all")
+                if plan.objectsToShowByName is None:
+                    log.info("\tNo pattern defined to show objects by name, all objects are shown unless hidden by other rules")
                 else:
-                    if self.settings.isVerbose:
-                        print(f"\tNo pattern defined to show objects by name, let's show all")
-                        
-                    for obj in objects:                    
-                        obj.hide_set(False, view_layer=viewLayer)
-                        # obj.hide_viewport = obj.hide_render = False
-            else:
-                if self.settings.isVerbose:
-                    print(f"\tTrying to show objects matching name pattern: {preset.objectsToShowByName}")
-                
-                for obj in objects:
-                    match = re.search(preset.objectsToShowByName, obj.name) is not None
+                    log.info("\tObjects matching name pattern '%s' are shown", plan.objectsToShowByName.pattern)
+                    
+                if plan.objectsToHideByName is None:
+                    log.info("\tNo pattern defined to hide objects by name, let's not hide any")
+                else:
+                    log.info("\tObjects matching name pattern '%s' are hidden", plan.objectsToHideByName.pattern)
+                    
+                if not plan.hasPropertyRules:
+                    log.info("\tNo custom object property defined, ignoring visibility control by property value")
+                else:
+                    log.info("\tObject visibility will also be determined by the value of the '%s' custom object property", plan.propertyName)
                     
-                    if match:
-                        if self.settings.isTestOnly:
-                            print(f"\t\t'{obj.name}' WOULD be made visible by name-based showing pattern")
-                        else:
-                            obj.hide_set(False, view_layer=viewLayer)
-                            # obj.hide_viewport = obj.hide_render = False
-                            if self.settings.isVerbose:
-                                print(f"\t\t'{obj.name}' made visible by name-based showing pattern")
+                    if plan.propertyValueForShowing is None:
+                        log.info("\tNo pattern defined to show objects based on property value, ignoring rule")
                     else:
-                        if self.settings.isVerbose or self.settings.isTestOnly:
-                            print(f"\t\t'{obj.name}' is left intact by name-based showing pattern")  
-
-                
-            # Hide objects by name
-            if len(preset.objectsToHideByName) == 0:
-                if self.settings.isVerbose or self.settings.isTestOnly:
-                    print(f"\tNo pattern defined to hide objects by name, let's not hide any")                                    
-            else:                
+                        log.info("\tObjects with a property value matching '%s' are shown", plan.propertyValueForShowing.pattern)
+                        
+                    if plan.propertyValueForHiding is None:
+                        log.info("\tNo pattern defined to hide objects based on property value, ignoring rule")
+                    else:
+                        log.info("\tObjects with a property value matching '%s' are hidden", plan.propertyValueForHiding.pattern)
                 
-                if self.settings.isVerbose:
-                    print(f"\tTrying to hide objects matching name pattern: {preset.objectsToHideByName}")
+                if plan.collectionsToShow is not None:
+                    log.info(
+                        "\tCollections matching name pattern '%s' are shown, along with their objects", 
+                        plan.collectionsToShow.pattern)
                 
-                for obj in objects:
-                    match = re.search(preset.objectsToHideByName, obj.name) is not None
-                    
-                    if match:
-                        if self.settings.isTestOnly:
-                            print(f"\t\t'{obj.name}' WOULD be made hidden by name-based hiding pattern")
-                        else:
-                            obj.hide_set(True, view_layer=viewLayer)      
-                            # obj.hide_viewport = obj.hide_render = True                      
-                            if self.settings.isVerbose:
-                                print(f"\t\t'{obj.name}' made hidden by name-based hiding pattern")
-                    else:
-                        if self.settings.isVerbose or self.settings.isTestOnly:
-                            print(f"\t\t'{obj.name}' is left intact by name-based hiding pattern")  
+                if plan.collectionsToHide is not None:
+                    log.info(
+                        "\tCollections matching name pattern '%s' are hidden, along with their objects", 
+                        plan.collectionsToHide.pattern)
 
+            # Tell how patterns are matched, so that one can see which patterns could not avoid running the regex engine
+            for fieldName, path in plan.paths.items():
+                if path is not None:
+                    log.debug("\tPattern '%s' is matched by %s", fieldName, path)
 
-            # Show/hide objects by property value
-            if len(str.strip(preset.propertyName)) == 0:
-                if self.settings.isVerbose or self.settings.isTestOnly:
-                    print(f"\tNo custom object property defined, ignoring visibility control by property value")
+            # Let collection rules decide objects in collections matching them, overriding object rules
+            stats.beginPhase("collection rules")
+            yield "collection rules", 0, len(objects)
+            collectionDecisions, collectionVerdicts = _decideCollections(scope, objects, plan)
+            
+            if self.settings.isTestOnly:
+                for name, decision in sorted(collectionDecisions.items()):
+                    log.detail(
+                        runLog.LEVEL_INFO, "\t\tCollection '%s' WOULD be %s as a whole", name, "visible" if decision else "hidden")
+            
+            # Take a snapshot of objects, and let the rule engine work out the final visibility of objects and modifiers on it
+            stats.beginPhase("snapshot")
+            snapshot = yield from _takeSnapshot(objects, withState=self.settings.isTestOnly)
+            
+            # Names of objects which would be visible, used in test mode when processing modifiers
+            wouldBeVisible = set()
+            
+            # When actually applying a preset from the list, look up visibility from the membership index, which also tells
+            # which objects are affected by switching from the preset applied previously. Test mode needs the rule deciding 
+            # visibility for each object, so let's evaluate rules then.
+            positions = None
+            presetPosition = presetManager.findPresetPosition(self.settings.presets, preset.presetName)
+            
+            # A view layer built for the preset needs no change if the index didn't change since it was built, unless the preset 
+            # is applied again while shown, which is the way to revert manual changes
+            bakedState = None
+            isInPlace = False
+            
+            if not self.settings.isTestOnly and presetPosition > -1:
+                stats.beginPhase("membership index")
+                positions = yield from self._prepareMembershipIndex(scope, objects, presetPosition, viewLayer.name)
+                
+                if self.viewLayer is not None and positions is not None:
+                    bakedState = (_membershipIndex.signature, _membershipIndex.version, self.settings.isHidingCollections)
+                    isInPlace = (
+                        _presetViewLayers.get(viewLayer.name) == bakedState and context.window.view_layer != viewLayer)
+                    positions = [] if isInPlace else list(range(len(objects)))
+                    
+                    log.debug("\tView layer '%s' is %s", viewLayer.name, "in place" if isInPlace else "to be checked")
+            
+            stats.beginPhase("evaluate rules")
+            
+            if positions is None:
+                positions = range(len(objects))
+                useIndex = False
+                visibilityPlan = yield from self._evaluate(snapshot, plan, collectionVerdicts)
+                
+                # Keep what would happen for the panel and for exporting
+                if self.settings.isTestOnly:
+                    dryRun.lastDryRun = dryRun.DryRun(preset.presetName, snapshot, visibilityPlan)
+                
+                # Visibility is going to be changed without the index knowing about it
+                if not self.settings.isTestOnly and self.viewLayer is None:
+                    _membershipIndex.markApplied(-1)
             else:
+                useIndex = True
+                hideWritesSkipped += len(objects) - len(positions)
                 
-                propName = preset.propertyName
-                if self.settings.isVerbose or self.settings.isTestOnly:
-                    print(f"\tObject visibility will be determined by the value of the '{propName}' custom object property")
+                # Object visibility is known from the index, so only modifiers need to be evaluated
+                visibilityPlan = yield from self._evaluate(snapshot, plan, objects=False)
                 
-                # Show objects by property value
-                if len(preset.propertyValueForShowing) == 0:
-                    if self.settings.isVerbose or self.settings.isTestOnly:
-                        print(f"\tNo pattern defined to show objects based on property value, ignoring rule")
-                        
-                else:                    
+                log.debug("\t%d objects are affected by switching presets", len(positions))
+            
+            stats.count("pattern matches", visibilityPlan.patternMatches)
+            
+            # Hide collections as a whole where all of their objects are to be hidden or where collection rules say so, and leave
+            # objects hidden along with their collection alone. All other objects are checked, as objects in collections just 
+            # shown may need hiding one by one even if switching presets doesn't change their visibility.
+            collectionPlan = None
+            
+            if self._isHidingCollections() and not isInPlace:
+                stats.beginPhase("collections")
+                yield "collections", 0, len(objects)
+                
+                if useIndex:
+                    objectVisible = [_membershipIndex.isVisible(position, presetPosition) for position in range(len(objects))]
+                else:
+                    objectVisible = visibilityPlan.objectVisible
+                
+                # Without hiding collections automatically, only collections decided by collection rules are touched, but those
+                # decided by other presets need to be shown again
+                if not self.settings.isHidingCollections:
+                    for name in self._managedCollections(scope):
+                        collectionDecisions.setdefault(name, True)
+                
+                collectionPlan = self._planCollections(
+                    viewLayer, scope, objectVisible, collectionDecisions, self.settings.isHidingCollections)
+                
+                if collectionPlan is None:
+                    log.info("Root collections are not in the view layer, hiding objects one by one")
+                else:
+                    collectionWrites, collectionWritesSkipped = self._applyCollectionPlan(
+                        collectionPlan, hideFlags, originalState, step)
                     
-                    if self.settings.isVerbose or self.settings.isTestOnly:
-                        print(f"\tTrying to show objects with property '{propName}' matching pattern: {preset.propertyValueForShowing}")
+                    stats.count("collection writes", collectionWrites)
+                    stats.count("collection writes skipped", collectionWritesSkipped)
                     
-                    for obj in objects:
-                        if propName in obj.keys():
-                            match = re.search(preset.propertyValueForShowing, obj[propName]) is not None
-                            
-                            if match:
-                                if self.settings.isTestOnly:
-                                    print(f"\t\t'{obj.name}' WOULD be made visible by property-based showing pattern")
-                                else:
-                                    obj.hide_set(False, view_layer=viewLayer)
-                                    # obj.hide_viewport = obj.hide_render = False
-                                    if self.settings.isVerbose:
-                                        print(f"\t\t'{obj.name}' made visible by property-based showing pattern")
-                            else:
-                                if self.settings.isVerbose or self.settings.isTestOnly:
-                                    print(f"\t\t'{obj.name}' is left intact by property-based showing pattern")  
-                                    
-                # Hide objects by property value
-                if len(preset.propertyValueForHiding) == 0:
-                    if self.settings.isVerbose or self.settings.isTestOnly:
-                        print(f"\tNo pattern defined to hide objects based on property value, ignoring rule")
-                        
+                    positions = [position for position in range(len(objects)) if position not in collectionPlan.covered]
+                    hideWritesSkipped = len(collectionPlan.covered)
+                    
+                    log.debug(
+                        "\t%d collections hidden and %d shown, %d objects left to them", 
+                        len(collectionPlan.hidden), len(collectionPlan.shown), len(collectionPlan.covered))
+            
+            # Only touch objects whose visibility actually changes, as each write tags the depsgraph for an update
+            stats.beginPhase("object visibility")
+            
+            # When hiding by flags, read the flag of all objects, change it in the array as decided for objects in scope, and 
+            # write it back in one go after the loop. Objects in more root collections are not in one collection of objects to 
+            # call foreach_set on, so do this on all objects of the file.
+            if hideFlags:
+                scopeObjects = bpy.data.objects
+                hidden = _readFlags(scopeObjects, "hide_viewport")
+                originalState.noteFlags(scopeObjects, "hide_viewport", hidden.copy())
+                
+                # Positions of objects processed among all objects
+                dataPositions = scope.dataPositions(scopeObjects)
+                
+                if self.settings.affectSelectedObjectsOnly:
+                    scopePositions = [dataPositions[scope.positions[obj.name]] for obj in objects]
+                else:
+                    scopePositions = dataPositions
+            
+            for done, position in enumerate(positions):
+                if done % CHUNK_SIZE == 0:
+                    yield "object visibility", done, len(positions)
+                
+                obj = objects[position]
+                
+                if useIndex:
+                    visible, rule = _membershipIndex.isVisible(position, presetPosition), ruleEngine.RULE_MEMBERSHIP_INDEX
+                else:
+                    visible, rule = visibilityPlan.objectVisible[position], visibilityPlan.objectRules[position]
+                    
+                state = "visible" if visible else "hidden"
+                
+                if self.settings.isTestOnly:
+                    log.detail(runLog.LEVEL_INFO, "\t\t'%s' WOULD be %s by %s", obj.name, state, rule)
+                    if visible:
+                        wouldBeVisible.add(obj.name)
+                    continue
+                
+                if hideFlags:
+                    scopePosition = scopePositions[position]
+                    isHidden = hidden[scopePosition]
+                else:
+                    isHidden = obj.hide_get(view_layer=viewLayer)
+                
+                if isHidden != visible:
+                    # Already in the target state
+                    hideWritesSkipped += 1
+                    log.detail(runLog.LEVEL_DEBUG, "\t\t'%s' is already %s, as decided by %s", obj.name, state, rule)
+                    continue
+                
+                changeTracker.ignoreOwnChanges((obj.name,))
+                
+                if hideFlags:
+                    hidden[scopePosition] = not visible
                 else:
+                    obj.hide_set(not visible, view_layer=viewLayer)
+                
+                hideWrites += 1
+                
+                if step is not None:
+                    step.noteObject(obj.name, not visible)
+                
+                log.detail(runLog.LEVEL_DEBUG, "\t\t'%s' made %s by %s", obj.name, state, rule)
+            
+            # Write flags in bulk, and keep hide_render in line with hide_viewport if hiding objects in renders too
+            if hideFlags:
+                bulkWrites = 0
+                
+                if hideWrites > 0:
+                    scopeObjects.foreach_set("hide_viewport", hidden)
+                    bulkWrites += 1
+                
+                # Objects out of scope keep their flags
+                if "hide_render" in hideFlags:
+                    hiddenInRenders = _readFlags(scopeObjects, "hide_render")
+                    mirrored = hiddenInRenders.copy()
                     
-                    if self.settings.isVerbose or self.settings.isTestOnly:
-                        print(f"\tTrying to hide objects with property '{propName}' matching pattern: {preset.propertyValueForHiding}")
+                    for scopePosition in scopePositions:
+                        if mirrored[scopePosition] != hidden[scopePosition]:
+                            mirrored[scopePosition] = hidden[scopePosition]
+                            changeTracker.ignoreOwnChanges((scopeObjects[scopePosition].name,))
                     
-                    for obj in objects:
-                        if propName in obj.keys():            
-                            match = re.search(preset.propertyValueForHiding, obj[propName]) is not None
-                            
-                            if match:
-                                if self.settings.isTestOnly:
-                                    print(f"\t\t'{obj.name}' WOULD be made hidden by property-based hiding pattern")
-                                else:
-                                    obj.hide_set(True, view_layer=viewLayer)
-                                    # obj.hide_viewport = obj.hide_render = True
-                                    if self.settings.isVerbose:
-                                        print(f"\t\t'{obj.name}' made hidden by property-based hiding pattern")  
-                            else:
-                                if self.settings.isVerbose or self.settings.isTestOnly:
-                                    print(f"\t\t'{obj.name}' is left intact by property-based hiding pattern")  
+                    if list(hiddenInRenders) != list(mirrored):
+                        originalState.noteFlags(scopeObjects, "hide_render", hiddenInRenders)
+                        scopeObjects.foreach_set("hide_render", mirrored)
+                        bulkWrites += 1
+                
+                stats.count("foreach_set calls", bulkWrites)
             
+            if useIndex and self.viewLayer is None:
+                _membershipIndex.markApplied(presetPosition, viewLayer.name)
+            
+
             # Show/hide modifiers
-            if self.settings.isVerbose:
-                print(f"\tAbout to process modifiers rules for objects")                    
+            stats.beginPhase("modifiers")
             
-                if len(preset.modifiersToShow) == 0:                
-                    print(f"\t\tNo pattern defined for showing modifiers, showing all")
+            if self.settings.isVerbose or self.settings.isTestOnly:
+                log.info("\tAbout to process modifiers rules for objects")
+            
+                if plan.modifiersToShow is None:                
+                    log.info("\t\tNo pattern defined for showing modifiers, showing all")
                     
-                if len(preset.modifiersToHide) == 0:                
-                    print(f"\t\tNo pattern defined for hiding modifiers, skipping rule")
+                if plan.modifiersToHide is None:                
+                    log.info("\t\tNo pattern defined for hiding modifiers, skipping rule")
             
-            # Process all objects in scope
-            for obj in objects:
+            # Only write modifiers that change, as each write makes Blender evaluate the modifier stack again
+            for position, obj in enumerate(objects):
+                if position % CHUNK_SIZE == 0:
+                    yield "modifiers", position, len(objects)
+                
+                # Nothing has been changed in test mode, so go by the visibility the object would have. When hiding by flags or 
+                # collections, visible_get() only catches up when the depsgraph is evaluated next time, so go by what's been set.
+                if self.settings.isTestOnly:
+                    isVisible = obj.name in wouldBeVisible
+                elif collectionPlan is not None and position in collectionPlan.covered:
+                    isVisible = False
+                elif self.viewLayer is not None:
+                    # View layers not shown may not be evaluated at all, so go by the visibility decided
+                    isVisible = (
+                        _membershipIndex.isVisible(position, presetPosition) if useIndex else visibilityPlan.objectVisible[position])
+                elif hideFlags:
+                    isVisible = not hidden[scopePositions[position]] and not obj.hide_get(view_layer=viewLayer)
+                elif collectionPlan is not None:
+                    isVisible = not obj.hide_get(view_layer=viewLayer)
+                else:
+                    isVisible = obj.visible_get()
                 
-                if not obj.visible_get():
-                    if self.settings.isVerbose:
-                        print(f"\t\tObject '{obj.name}' became hidden, skipping processing its modifiers")
+                if not isVisible:
+                    log.detail(runLog.LEVEL_DEBUG, "\t\tObject '%s' is hidden, skipping processing its modifiers", obj.name)
                     continue
                 
-                if self.settings.isVerbose:
-                    print(f"\t\tProcessing '{obj.name}' with {len(obj.modifiers)} modifiers")
+                log.detail(runLog.LEVEL_DEBUG, "\t\tProcessing '%s' with %d modifiers", obj.name, len(obj.modifiers))
                 
                 # Use this to make sure we print an object's name only once
                 objectAlreadyMentioned = False
                 
-                # Process the show pattern
-                if len(preset.modifiersToShow) == 0:
-                    for modifier in obj.modifiers:                    
-                        if not objectAlreadyMentioned:
-                            print(f"\t\tProcessing {obj.name}")
-                            objectAlreadyMentioned = True
-                        print(f"\t\t\tSetting modifier {modifier.name} to visible")
-                        if self.settings.isTestOnly:
-                            print(f"\t\t\t\t-- but this is just a test, nothing is actually changed")
-                        else:
-                            modifier.show_viewport = True
-                else:    
-                    # Process all modifiers
-                    for modifier in obj.modifiers:                    
-                        
-                        # Show if its name matches the pattern
-                        if re.search(preset.modifiersToShow, modifier.name):                        
-                            if not objectAlreadyMentioned:
-                                print(f"\t\tProcessing {obj.name}")
-                                objectAlreadyMentioned = True
-                            print(f"\t\t\tSetting modifier {modifier.name} to visible")
-                            if self.settings.isTestOnly:
-                                print(f"\t\t\t\t-- but this is just a test, nothing is actually changed")
-                            else:
-                                modifier.show_viewport = True
-                        else:
-                            if self.settings.isVerbose:
-                                print(f"\t\t\tHiding modifier {modifier.name}")
-                            modifier.show_viewport = False
-                
-                # Process the hide pattern only if it's not an empty string
-                if len(preset.modifiersToHide) > 0:
+                modifierDecisions = zip(
+                    obj.modifiers, visibilityPlan.modifierVisible[position], visibilityPlan.modifierRules[position])
+                
+                for modifier, visible, rule in modifierDecisions:
+                    state = "visible" if visible else "hidden"
                     
-                    # Process all modifiers
-                    for modifier in obj.modifiers:         
+                    if modifier.show_viewport == visible:
+                        # Already in the target state
+                        modifierWritesSkipped += 1
+                        log.detail(
+                            runLog.LEVEL_DEBUG, "\t\t\tModifier %s is already %s, as decided by %s", modifier.name, state, rule)
+                        continue
+                    
+                    if not objectAlreadyMentioned:
+                        log.detail(runLog.LEVEL_INFO, "\t\tProcessing %s", obj.name)
+                        objectAlreadyMentioned = True
+                    
+                    if self.settings.isTestOnly:
+                        log.detail(runLog.LEVEL_INFO, "\t\t\tModifier %s WOULD be set to %s by %s", modifier.name, state, rule)
+                    else:
+                        originalState.noteModifier(modifier)
+                        changeTracker.ignoreOwnChanges((obj.name,))
+                        modifier.show_viewport = visible
+                        modifierWrites += 1
+                        
+                        if step is not None:
+                            step.noteModifier(obj.name, modifier.name, visible)
                         
-                        # Hide if its name matches the pattern           
-                        if re.search(preset.modifiersToHide, modifier.name):       
-                            if not objectAlreadyMentioned:
-                                print(f"\t\tProcessing {obj.name}")
-                                objectAlreadyMentioned = True                 
-                            print(f"\t\t\tSetting modifier {modifier.name} to hidden")
-                            if self.settings.isTestOnly:
-                                print(f"\t\t\t\t-- but this is just a test, nothing is actually changed")
-                            else:
-                                modifier.show_viewport = False
-                        else:
-                            if self.settings.isVerbose:
-                                print(f"\t\t\tNo need to hide modifier {modifier.name}")
+                        log.detail(runLog.LEVEL_INFO, "\t\t\tSetting modifier %s to %s by %s", modifier.name, state, rule)
+            
+            # Keep the changes in the add-on's own history (there's nothing to keep if anything goes wrong, as it's reverted then)
+            if step is not None:
+                visibilityHistory.history.push(step)
+            
+            # Show the view layer built for the preset, and remember what it reflects
+            if self.viewLayer is not None:
+                if bakedState is not None:
+                    _presetViewLayers[viewLayer.name] = bakedState
+                
+                context.window.view_layer = viewLayer
 
         except Exception as ex:
-            whatHappened1 = f"Whoaaa, nothing can be perfect, and an error occurred while applying the preset: {ex}."
-            whatHappened2 = f"Trying to revert original visibility of object and modifiers before canceling the operation"
-            print(whatHappened1)
-            print(whatHappened2)
-            self.report({'ERROR'}, f"{whatHappened1}\r\n{whatHappened2}")
+            if isinstance(ex, RunCancelled):
+                log.info("Canceled, reverting original visibility of objects and modifiers")
+                self.report({'INFO'}, "Canceled, reverting original visibility of objects and modifiers")
+                result = {'CANCELLED'}
+            else:
+                whatHappened1 = f"Whoaaa, nothing can be perfect, and an error occurred while applying the preset: {ex}."
+                whatHappened2 = f"Trying to revert original visibility of object and modifiers before canceling the operation"
+                log.error(whatHappened1)
+                log.error(whatHappened2)
+                self.report({'ERROR'}, f"{whatHappened1}\r\n{whatHappened2}")
             
-            # Restore visibility state
-            for obj in root.all_objects:
-                obj.hide_set(obj not in visibleObjects, view_layer=viewLayer)
+            stats.beginPhase("restore")
+            
+            # Visibility no longer reflects any preset
+            _membershipIndex.markApplied(-1)
+            _presetViewLayers.pop(viewLayer.name, None)
+            
+            # Restore visibility state, touching only objects and modifiers changed
+            changeTracker.ignoreOwnChanges((obj.name for obj in originalState.objects), collections=True)
+            stats.count("hide_set calls", originalState.restoreVisibility())
+            stats.count("foreach_set calls", originalState.restoreFlags())
+            stats.count("collection writes", originalState.restoreCollections())
+            stats.count("show_viewport writes", originalState.restoreModifiers())
                 
-            print("Visibility of objects restored.")
+            log.info("Visibility of objects and modifiers restored.")
                 
         finally:
-            # Restore active and selected flags
-            viewLayer.objects.active = activeObject
+            stats.beginPhase("finally")
             
-            # Restore selection state
-            for obj in root.all_objects:
-                obj.select_set(obj in selectedObjects)
+            # Restore active and selected flags (nothing has been touched in test mode, so let's keep it that way)
+            if not self.settings.isTestOnly:
+                originalState.restoreSelection()
 
-            print()
-            print(f"T1nk-R Focus Wizard Visibility Adjustment operation exited")
-            print("=" * 80)
-            print()
+            stats.count(hideCounter, hideWrites)
+            stats.count(f"{hideCounter} skipped", hideWritesSkipped)
+            stats.count("show_viewport writes", modifierWrites)
+            stats.count("show_viewport writes skipped", modifierWritesSkipped)
+            
+            # Summarize what happened to object visibility
+            if not self.settings.isTestOnly:
+                summary = (
+                    f"Visibility changed for {hideWrites} objects and {modifierWrites} modifiers, "
+                    f"{hideWritesSkipped + modifierWritesSkipped} writes skipped as already in place")
+                log.info(summary)
+                self.report({'INFO'}, summary)
 
-        return {'FINISHED'}
+            stats.endPhase()
+            
+            for phase, seconds in stats.phases.items():
+                log.debug("Spent %.1f ms on %s", seconds * 1000, phase)
+
+            if isProfiling:
+                self.settings.saveProfile("apply preset", log)
+
+            log.info("")
+            log.info("T1nk-R Focus Wizard Visibility Adjustment operation exited")
+            log.info("=" * 80)
+            log.info("")
+            
+            self._flushLog(logFile)
+
+        return result
+    
+
+
+# Operator applying the selected preset ###########################################################################################
+class T1NKER_OT_FocusWizard(Operator):    
+    """
+    Operator applying the selected preset by the help of `PresetApplier`.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------    
+    bl_idname = "t1nker.focuswizard"
+    bl_label = "T1nk-R Focus Wizard"
+    bl_options = {'REGISTER', 'UNDO'}    
+    
+    # Other properties ------------------------------------------------------------------------------------------------------------
+        
+    # Lifecycle management ========================================================================================================    
+    def __init__(self):
+        """
+        Creates `self.settings: presetManager.T1nkerFocusWizardSettings`, a shortcut for the add-on's settings.
+        """
+        self.settings = None                
     
+    # Public functions ============================================================================================================
+    
+
+    # Poll callback for accessibility ---------------------------------------------------------------------------------------------
+    @classmethod
+    def poll(cls, context):
+        """Standard method requested by Blender to tell if the UI can be drawn.
 
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Boolean: True if the UI can be drawn.
+        """
+        
+        # We can work regardless of objects are selected or not, so let's just return true always
+        return True
+    
+
+    # Draw UI ---------------------------------------------------------------------------------------------------------------------
+    def invoke(self, context, event):           
+        """
+        Show the panel.
+        
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            event: An event passed by Blender. Not used by us.
+            
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        # For first run in the session, load addon defaults (otherwise use values set previously in the session)
+        if self.settings is None:
+            try:
+                self.settings = context.scene.t1nkrFocusWizardSettings
+            except:
+                pass                
+
+        # Show dialog
+        result = context.window_manager.invoke_props_dialog(self, width=400)
+                
+        if (self.settings.affectSelectedObjectsOnly and len(bpy.context.selected_objects) == 0):
+            self.report({'ERROR'}, "You chose to process only selected objects, but no object is selected.") 
+            return {'CANCELLED'}
+
+        return result
+    
+    
+    # Execute the operator --------------------------------------------------------------------------------------------------------
+    def execute(self, context):      
+        """
+        Perform the requested operation using the currently selected preset 
+        stored in context.scene.t1nkrFocusWizardSettings.selectedPreset.
+        
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """                     
+        
+        return _applySelectedPreset(context, self.report)
+    
+
+
+# Operator applying the selected preset in chunks #################################################################################
+class T1NKER_OT_FocusWizardChunked(Operator):
+    """
+    Modal operator applying the selected preset in chunks of about `CHUNK_SECONDS` each, driven by a timer, so that the UI stays
+    responsive and shows progress for huge scopes. Pressing Esc cancels the run and restores visibility.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizardchunked"
+    bl_label = "T1nk-R Focus Wizard - Apply in Chunks"
+    bl_description = "Apply the selected preset in chunks, showing progress. Press Esc to cancel and restore visibility"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self):
+        """
+        Creates `self.run`, the run of applying the preset, and `self.timer`, the timer driving it.
+        """
+        self.run = None
+        self.timer = None
+    
+    # Private functions ===========================================================================================================
+    
+    # Clean up after the run ------------------------------------------------------------------------------------------------------
+    def _finish(self, context, result: set) -> set:
+        """Stops the timer and the progress indicator, and tells that no preset is being applied in chunks.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            result (set): The result of the run.
+
+        Returns:
+            set: `result`, to be returned to Blender.
+        """
+        
+        global _chunkedRun
+        
+        windowManager = context.window_manager
+        windowManager.event_timer_remove(self.timer)
+        windowManager.progress_end()
+        self._showStatus(context, None)
+        
+        _chunkedRun = None
+        
+        return result
+    
+    # Show the progress in the status bar -----------------------------------------------------------------------------------------
+    def _showStatus(self, context, text: str):
+        """Shows a text in the status bar, if there's a workspace to show it in.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            text (str): The text to show, or `None` to restore the status bar.
+        """
+        
+        workspace = getattr(context, "workspace", None)
+        
+        if workspace is not None:
+            workspace.status_text_set(text)
+    
+    # Give up the run -------------------------------------------------------------------------------------------------------------
+    def _abort(self, context, error: Exception) -> set:
+        """Stops the run after it failed with an error it didn't handle itself, or didn't handle being canceled, and cleans up 
+        after it.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            error (Exception): The error.
+
+        Returns:
+            set: {'CANCELLED'}, to be returned to Blender.
+        """
+        
+        self.run.close()
+        
+        if isinstance(error, RunCancelled):
+            self.report({'INFO'}, "Canceled")
+        else:
+            self.report({'ERROR'}, f"Applying the preset stopped for an error: {error}")
+        
+        return self._finish(context, {'CANCELLED'})
+    
+    # Public functions ============================================================================================================
+    
+    # Start the run ---------------------------------------------------------------------------------------------------------------
+    def invoke(self, context, event):
+        """
+        Start applying the selected preset in chunks.
+        
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            event: An event passed by Blender. Not used by us.
+            
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        global _chunkedRun
+        
+        if _chunkedRun is not None:
+            self.report({'WARNING'}, "A preset is still being applied. Wait for it to finish, or press Esc to cancel it.")
+            return {'CANCELLED'}
+        
+        self.run = PresetApplier(self.report, _presetViewLayer(context)).run(context)
+        _chunkedRun = self.run
+        
+        # Start the run, so that cancelling it before the first timer event can restore what it's done so far. It may also 
+        # finish right away, like when there's no root collection.
+        try:
+            next(self.run)
+        except StopIteration as finished:
+            _chunkedRun = None
+            return finished.value
+        except Exception as ex:
+            self.run.close()
+            _chunkedRun = None
+            self.report({'ERROR'}, f"Could not start applying the preset: {ex}")
+            return {'CANCELLED'}
+        
+        windowManager = context.window_manager
+        windowManager.progress_begin(0, 1)
+        self.timer = windowManager.event_timer_add(0.001, window=context.window)
+        windowManager.modal_handler_add(self)
+        
+        return {'RUNNING_MODAL'}
+    
+    # Process a chunk -------------------------------------------------------------------------------------------------------------
+    def modal(self, context, event):
+        """
+        Apply the next chunk upon timer events, and cancel upon pressing Esc.
+        
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+            event: The event passed by Blender.
+            
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        if event.type == 'ESC' and event.value == 'PRESS':
+            try:
+                self.run.throw(RunCancelled())
+            except StopIteration as finished:
+                return self._finish(context, finished.value)
+            except Exception as ex:
+                return self._abort(context, ex)
+            
+            # Not expected, as the run doesn't pause while restoring visibility
+            self.run.close()
+            return self._finish(context, {'CANCELLED'})
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        # Go on until the time of the chunk is spent, but make some progress anyway
+        deadline = time.perf_counter() + CHUNK_SECONDS
+        
+        try:
+            phase, done, total = next(self.run)
+            
+            while time.perf_counter() < deadline:
+                phase, done, total = next(self.run)
+        except StopIteration as finished:
+            return self._finish(context, finished.value)
+        except Exception as ex:
+            return self._abort(context, ex)
+        
+        # Tell the progress of the phase in progress
+        if total > 0:
+            context.window_manager.progress_update(done / total)
+        
+        self._showStatus(context, f"Focus Wizard: {phase}, {done} of {total} objects done (Esc to cancel)")
+        
+        return {'RUNNING_MODAL'}
+    
+    # Stop when Blender cancels the operator --------------------------------------------------------------------------------------
+    def cancel(self, context):
+        """
+        Stop the run when Blender cancels the operator, for example upon loading another file.
+        
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+        """
+        
+        self.run.close()
+        self._finish(context, {'CANCELLED'})
+    
+
+# Applying the selected preset in chunks without Blender's global undo ############################################################
+class T1NKER_OT_FocusWizardChunkedNoUndo(T1NKER_OT_FocusWizardChunked):
+    """
+    Applies the selected preset in chunks like `T1NKER_OT_FocusWizardChunked`, but without pushing a step to Blender's global 
+    undo when done. Used when the add-on keeps its own visibility history, as a global undo step takes long and eats memory for 
+    huge files, which are the ones applied in chunks.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizardchunkednoundo"
+    bl_options = {'REGISTER'}
+    
+
+
+# Exporting results of test runs ##################################################################################################
+class T1NKER_OT_FocusWizardDryRunExport(Operator):
+    """
+    Export the results of the last test run to a JSON or CSV file.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizarddryrunexport"
+    bl_label = "T1nk-R Focus Wizard - Export Test Results"
+    bl_description = "Export what applying the preset would do to a file"
+    bl_options = {'REGISTER'}
+    
+    # Other properties ------------------------------------------------------------------------------------------------------------
+    
+    fileFormat: EnumProperty(
+        items=(
+            ('JSON', "JSON", "Export to JSON"),
+            ('CSV', "CSV", "Export to CSV")
+            ))
+    """
+    The format to export to. The extension of the file name is set accordingly.
+    """
+    
+    # Public functions ============================================================================================================
+    
+    # Poll callback for accessibility ---------------------------------------------------------------------------------------------
+    @classmethod
+    def poll(cls, context):
+        """Standard method requested by Blender to tell if the operator can be run.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Boolean: True if there are results to export.
+        """
+        
+        return dryRun.lastDryRun is not None
+    
+    # Execute the operator --------------------------------------------------------------------------------------------------------
+    def execute(self, context):
+        """Export the results of the last test run.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        settings = context.scene.t1nkrFocusWizardSettings
+        path = os.path.splitext(bpy.path.abspath(settings.dryRunFile))[0] + (".json" if self.fileFormat == "JSON" else ".csv")
+        
+        try:
+            if self.fileFormat == "JSON":
+                dryRun.lastDryRun.saveJson(path)
+            else:
+                dryRun.lastDryRun.saveCsv(path)
+        except Exception as ex:
+            self.report({'ERROR'}, f"Could not save test results to '{path}' for an error of {ex}.")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Test results saved to '{path}'")
+        
+        return {'FINISHED'}
+    
+
+
+# Selecting presets without Blender's global undo #################################################################################
+class T1NKER_OT_FocusWizardSelectPreset(Operator):
+    """
+    Select and apply a preset. Used instead of the preset drop-down when the add-on keeps its own visibility history, as changing 
+    a property on the UI pushes a step to Blender's global undo, which takes long and eats memory for huge files.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizardselectpreset"
+    bl_label = "T1nk-R Focus Wizard - Select Preset"
+    bl_description = "Select and apply a preset"
+    bl_options = {'REGISTER'}
+    
+    # Other properties ------------------------------------------------------------------------------------------------------------
+    
+    presetName: EnumProperty(
+        items=presetManager.T1nkerFocusWizardSettings._getLodLevels,
+        name="Preset",
+        description="The preset to select and apply")
+    """
+    The name of the preset to select and apply.
+    """
+    
+    # Public functions ============================================================================================================
+    
+    # Execute the operator --------------------------------------------------------------------------------------------------------
+    def execute(self, context):
+        """Select and apply the preset.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        settings = context.scene.t1nkrFocusWizardSettings
+        
+        # Selecting another preset applies it, and selecting the same preset again shall reapply it
+        if settings.presetLodLevel != self.presetName:
+            settings.presetLodLevel = self.presetName
+        else:
+            _applySelectedPreset(context, self.report)
+        
+        return {'FINISHED'}
+    
+
+
+# Undoing and redoing visibility changes ##########################################################################################
+class T1NKER_OT_FocusWizardVisibilityHistory(Operator):
+    """
+    Undo or redo visibility changes recorded in the add-on's own history, without touching Blender's global undo.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizardvisibilityhistory"
+    bl_label = "T1nk-R Focus Wizard - Undo/Redo Visibility"
+    bl_description = "Undo or redo visibility changes made by applying presets"
+    bl_options = {'REGISTER'}
+    
+    # Other properties ------------------------------------------------------------------------------------------------------------
+    
+    action: EnumProperty(
+        items=(
+            ('UNDO', "Undo", "Undo the last visibility change"),
+            ('REDO', "Redo", "Redo the last visibility change undone")
+            ))
+    """
+    Tells whether to undo or redo.
+    """
+    
+    # Public functions ============================================================================================================
+    
+    # Execute the operator --------------------------------------------------------------------------------------------------------
+    def execute(self, context):
+        """Undo or redo a step of the visibility history.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        undo = self.action == "UNDO"
+        step = visibilityHistory.history.undo() if undo else visibilityHistory.history.redo()
+        
+        if step is None:
+            self.report({'INFO'}, f"Nothing to {self.action.lower()}")
+            return {'CANCELLED'}
+        
+        viewLayer = context.view_layer
+        objects = bpy.data.objects
+        
+        # Objects and modifiers renamed or deleted since are skipped
+        for objectName, hidden in step.objectStates(undo):
+            obj = objects.get(objectName)
+            
+            if obj is None:
+                continue
+            
+            changeTracker.ignoreOwnChanges((objectName,))
+            
+            if step.hideFlags:
+                for flag in step.hideFlags:
+                    setattr(obj, flag, hidden)
+            elif obj.hide_get(view_layer=viewLayer) != hidden:
+                obj.hide_set(hidden, view_layer=viewLayer)
+        
+        for collectionName, hidden in step.collectionStates(undo):
+            collection = bpy.data.collections.get(collectionName)
+            
+            if collection is None:
+                continue
+            
+            changeTracker.ignoreOwnChanges(collections=True)
+            
+            if step.hideFlags:
+                for flag in step.hideFlags:
+                    setattr(collection, flag, hidden)
+            else:
+                for layerCollection in collectionVisibility.layerCollectionsOf(viewLayer.layer_collection, collection):
+                    layerCollection.hide_viewport = hidden
+        
+        for objectName, modifierName, shown in step.modifierStates(undo):
+            obj = objects.get(objectName)
+            modifier = obj.modifiers.get(modifierName) if obj is not None else None
+            
+            if modifier is not None and modifier.show_viewport != shown:
+                changeTracker.ignoreOwnChanges((objectName,))
+                modifier.show_viewport = shown
+        
+        # Visibility no longer reflects the preset applied
+        _membershipIndex.markApplied(-1)
+        
+        self.report({'INFO'}, f"{'Undone' if undo else 'Redone'} applying {step.presetName}")
+        
+        return {'FINISHED'}
+    
+
+
+# Editing the lists of collections defining the scope #############################################################################
+class T1NKER_OT_FocusWizardScopeCollections(Operator):
+    """
+    Add or remove an additional root collection or an excluded collection.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    # Blender-specific stuff ------------------------------------------------------------------------------------------------------
+    bl_idname = "t1nker.focuswizardscopecollections"
+    bl_label = "T1nk-R Focus Wizard - Edit Scope"
+    bl_description = "Add or remove a collection defining the scope"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Other properties ------------------------------------------------------------------------------------------------------------
+    
+    action: EnumProperty(
+        items=(
+            ('ADD_ROOT', "Add root", "Add one more root collection"),
+            ('REMOVE_ROOT', "Remove root", "Remove an additional root collection"),
+            ('ADD_EXCLUDED', "Exclude", "Add a collection to exclude"),
+            ('REMOVE_EXCLUDED', "Include", "Remove a collection from the excluded ones")
+            ))
+    """
+    Tells what to add or remove.
+    """
+    
+    index: IntProperty(default=-1)
+    """
+    The position of the item to remove in its list.
+    """
+    
+    # Public functions ============================================================================================================
+    
+    # Execute the operator --------------------------------------------------------------------------------------------------------
+    def execute(self, context):
+        """Add or remove the item.
+
+        Args:
+            context (bpy.types.Context): The bpy.context object passed by Blender.
+
+        Returns:
+            Operator return set as requested by Blender (https://docs.blender.org/api/current/bpy.ops.html) to indicate success or failure.
+        """
+        
+        settings = context.scene.t1nkrFocusWizardSettings
+        references = settings.additionalRootCollections if self.action.endswith("_ROOT") else settings.excludedCollections
+        
+        if self.action.startswith("ADD"):
+            references.add()
+        elif 0 <= self.index < len(references):
+            references.remove(self.index)
+        else:
+            return {'CANCELLED'}
+        
+        return {'FINISHED'}
@@ -0,0 +1,346 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains timing and counters recorded while applying presets.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from collections import OrderedDict
+import cProfile
+import json
+import os
+import tempfile
+import time
+
+
+# Statistics of a run #############################################################################################################
+class RunStats:
+    """
+    Time spent in each phase and counters of things done while applying a preset. Phases are measured one after the other: 
+    beginning a phase ends the previous one. A phase entered more than once accumulates time.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, presetName: str = ""):
+        """Creates empty statistics for a run.
+
+        Args:
+            presetName (str, optional): The name of the preset applied. Defaults to "".
+        """
+        
+        self.presetName = presetName
+        """
+        The name of the preset applied.
+        """
+        
+        self.startedAt = time.time()
+        """
+        When the run started, in seconds since the epoch.
+        """
+        
+        self.phases = OrderedDict()
+        """
+        Seconds spent in phases, keyed by phase name, in the order phases were first entered.
+        """
+        
+        self.counters = OrderedDict()
+        """
+        Counters keyed by name, in the order they were first updated.
+        """
+        
+        self.spans = []
+        """
+        (name, start, seconds) triplets of phases in the order they happened, where `start` is seconds since `origin`. Unlike 
+        `phases`, phases entered more than once have a span each time.
+        """
+        
+        self.origin = time.perf_counter()
+        """
+        The `time.perf_counter()` value when the run started.
+        """
+        
+        self._phase = None
+        """
+        The name of the phase in progress, if any.
+        """
+        
+        self._phaseStartedAt = 0.0
+        """
+        The `time.perf_counter()` value when the phase in progress began.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Begin a phase ---------------------------------------------------------------------------------------------------------------
+    def beginPhase(self, name: str):
+        """Ends the phase in progress (if any), and begins a new one.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        
+        self.endPhase()
+        
+        self._phase = name
+        self._phaseStartedAt = time.perf_counter()
+    
+    # End the phase in progress ---------------------------------------------------------------------------------------------------
+    def endPhase(self):
+        """Ends the phase in progress, if any.
+        """
+        
+        if self._phase is None:
+            return
+        
+        seconds = time.perf_counter() - self._phaseStartedAt
+        
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + seconds
+        self.spans.append((self._phase, self._phaseStartedAt - self.origin, seconds))
+        self._phase = None
+    
+    # Increase a counter ----------------------------------------------------------------------------------------------------------
+    def count(self, name: str, amount: int = 1):
+        """Increases a counter.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int, optional): The amount to add. Defaults to 1.
+        """
+        
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    # Get the total time ----------------------------------------------------------------------------------------------------------
+    def totalSeconds(self) -> float:
+        """Returns the time spent in all phases.
+
+        Returns:
+            float: Seconds.
+        """
+        
+        return sum(self.phases.values())
+    
+    # Convert to a dictionary -----------------------------------------------------------------------------------------------------
+    def asDict(self) -> dict:
+        """Returns the statistics as a dictionary of built-in types, ready to be serialized.
+
+        Returns:
+            dict: The statistics.
+        """
+        
+        return {
+            "presetName": self.presetName,
+            "startedAt": self.startedAt,
+            "totalSeconds": self.totalSeconds(),
+            "phases": dict(self.phases),
+            "counters": dict(self.counters)
+        }
+    
+    # Convert to JSON -------------------------------------------------------------------------------------------------------------
+    def asJson(self, indent: int = 2) -> str:
+        """Returns the statistics in JSON format.
+
+        Args:
+            indent (int, optional): Indentation of the JSON text. Defaults to 2.
+
+        Returns:
+            str: The statistics in JSON.
+        """
+        
+        return json.dumps(self.asDict(), indent=indent)
+
+
+# Last run ########################################################################################################################
+
+lastRun: RunStats = None
+"""
+Statistics of the last run, or `None` if no preset has been applied since the add-on was enabled.
+"""
+
+# Get the statistics of the last run ----------------------------------------------------------------------------------------------
+def lastRunAsDict() -> dict:
+    """Returns the statistics of the last run as a dictionary, for those who want to collect them from Python.
+
+    Returns:
+        dict: The statistics, or `None` if no preset has been applied since the add-on was enabled.
+    """
+    
+    return lastRun.asDict() if lastRun is not None else None
+
+# Get the statistics of the last run in JSON --------------------------------------------------------------------------------------
+def lastRunAsJson(indent: int = 2) -> str:
+    """Returns the statistics of the last run in JSON format.
+
+    Args:
+        indent (int, optional): Indentation of the JSON text. Defaults to 2.
+
+    Returns:
+        str: The statistics in JSON (`null` if no preset has been applied since the add-on was enabled).
+    """
+    
+    return json.dumps(lastRunAsDict(), indent=indent)
+
+
+# Profiling #######################################################################################################################
+
+_activeProfile: cProfile.Profile = None
+"""
+The profiler running, if any.
+"""
+
+_profilingStartedAt = 0.0
+"""
+The `time.perf_counter()` value when the profiler was started.
+"""
+
+# Start profiling -----------------------------------------------------------------------------------------------------------------
+def startProfiling() -> bool:
+    """Starts profiling unless it's already running, for example, when selecting a preset starts profiling before running the 
+    operator, which would start profiling as well.
+
+    Returns:
+        bool: True if profiling has been started by this call, in which case the caller shall stop it by `stopProfiling`.
+    """
+    
+    global _activeProfile, _profilingStartedAt
+    
+    if _activeProfile is not None:
+        return False
+    
+    _activeProfile = cProfile.Profile()
+    _profilingStartedAt = time.perf_counter()
+    _activeProfile.enable()
+    
+    return True
+
+# Stop profiling and save results -------------------------------------------------------------------------------------------------
+def stopProfiling(folder: str, spanName: str) -> tuple:
+    """Stops profiling, and saves the profile to a `.prof` file (to be opened by `pstats`, snakeviz and the like), and the phases
+    of the last run to a Chrome trace JSON file (to be opened by chrome://tracing or Perfetto).
+
+    Args:
+        folder (str): The folder to save files to. The temporary folder of the system is used if empty.
+        spanName (str): The name of the span covering the whole profiled time in the trace.
+
+    Returns:
+        tuple: The paths of the profile and the trace.
+    """
+    
+    global _activeProfile
+    
+    _activeProfile.disable()
+    stoppedAt = time.perf_counter()
+    
+    profile = _activeProfile
+    _activeProfile = None
+    
+    if len(folder) == 0:
+        folder = tempfile.gettempdir()
+    
+    os.makedirs(folder, exist_ok=True)
+    
+    fileNameTrunk = os.path.join(folder, f"focusWizard-{time.strftime('%Y%m%d-%H%M%S')}")
+    profilePath = fileNameTrunk + ".prof"
+    tracePath = fileNameTrunk + ".trace.json"
+    
+    profile.dump_stats(profilePath)
+    
+    # Chrome trace events take microseconds
+    events = [_traceEvent(spanName, 0.0, stoppedAt - _profilingStartedAt, 0)]
+    
+    if lastRun is not None and lastRun.origin >= _profilingStartedAt:
+        offset = lastRun.origin - _profilingStartedAt
+        
+        events.extend(_traceEvent(name, offset + start, seconds, 1) for name, start, seconds in lastRun.spans)
+        events.append(_traceCounters(lastRun, offset + lastRun.totalSeconds()))
+    
+    with open(tracePath, "w") as traceFile:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp=traceFile, indent=1)
+    
+    return profilePath, tracePath
+
+# Make a trace event for a span ---------------------------------------------------------------------------------------------------
+def _traceEvent(name: str, start: float, seconds: float, depth: int) -> dict:
+    """Makes a complete event of the Chrome trace format.
+
+    Args:
+        name (str): The name of the span.
+        start (float): When the span started, in seconds since profiling started.
+        seconds (float): The length of the span.
+        depth (int): 0 for the span covering the whole profiled time, 1 for phases.
+
+    Returns:
+        dict: The event.
+    """
+    
+    return {"name": name, "cat": "phase" if depth > 0 else "run", "ph": "X", "ts": start * 1e6, "dur": seconds * 1e6, 
+            "pid": 1, "tid": 1}
+
+# Make a trace event for counters -------------------------------------------------------------------------------------------------
+def _traceCounters(stats: RunStats, start: float) -> dict:
+    """Makes a counter event of the Chrome trace format with the counters of a run.
+
+    Args:
+        stats (RunStats): The statistics of the run.
+        start (float): When to show the counters, in seconds since profiling started.
+
+    Returns:
+        dict: The event.
+    """
+    
+    return {"name": "counters", "ph": "C", "ts": start * 1e6, "pid": 1, "tid": 1, "args": dict(stats.counters)}
@@ -0,0 +1,363 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains matching patterns of presets against huge sets of objects in parallel, in worker processes.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from multiprocessing import shared_memory
+import importlib
+import multiprocessing
+import operator
+import os
+import site
+
+# Worker processes load this module as a top-level module from the folder of the add-on, so that they don't import the add-on
+# itself, which needs Blender
+if __package__:
+    from . import ruleEngine
+else:
+    import ruleEngine
+
+
+# Settings ########################################################################################################################
+
+SHARDS_PER_WORKER = 4
+"""
+The number of shards to cut the objects into for each worker process, so that workers finishing early can take over work.
+"""
+
+POOL_ERRORS = (OSError, BrokenExecutor)
+"""
+Errors telling that the pool of worker processes cannot be started or has died. Patterns shall be matched serially then.
+"""
+
+_RULES = (
+    ruleEngine.RULE_SHOW_ALL,
+    ruleEngine.RULE_SHOW_BY_NAME,
+    ruleEngine.RULE_NOT_SHOWN_BY_NAME,
+    ruleEngine.RULE_HIDE_BY_NAME,
+    ruleEngine.RULE_SHOW_BY_PROPERTY,
+    ruleEngine.RULE_HIDE_BY_PROPERTY)
+"""
+Rules deciding the visibility of objects, in the order of the codes workers return them by.
+"""
+
+_RULE_CODES = {rule: code for code, rule in enumerate(_RULES)}
+"""
+Codes of rules deciding the visibility of objects, keyed by rule.
+"""
+
+_VISIBLE = (True, True, False, False, True, False)
+"""
+The visibility decided by each rule, in the order of `_RULES`.
+"""
+
+_pool = None
+"""
+The pool of worker processes, started upon first use and kept, as starting it takes much longer than a run.
+"""
+
+
+# Worker side #####################################################################################################################
+
+# Evaluate presets against a shard of objects -------------------------------------------------------------------------------------
+def decideShard(
+    inputName: str, outputName: str, planFields: list, start: int, end: int, byteStart: int, byteEnd: int, carriers: dict, 
+    withRules: bool):
+    """Evaluates presets against a shard of objects, in a worker process. Names of objects are read from, and results are written
+    to shared memory.
+
+    Args:
+        inputName (str): The name of the shared memory holding the names of all objects, encoded in UTF-8, separated by zero 
+        bytes.
+        outputName (str): The name of the shared memory to write results to.
+        planFields (list): The fields of each preset (see `ruleEngine.presetFields`), in the order of presets.
+        start (int): The position of the first object of the shard.
+        end (int): The position after the last object of the shard.
+        byteStart (int): The offset of the name of the first object of the shard in the input.
+        byteEnd (int): The offset after the name of the last object of the shard in the input.
+        carriers (dict): Maps positions of objects in the shard carrying visibility control properties to a dictionary of their
+        property values.
+        withRules (bool): True to write the code of the rule deciding each object for each preset (one byte per object and 
+        preset), False to write the visibility of objects as a bitmask of presets (as many bytes per object as needed).
+    """
+    
+    plans = [ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "", *fields)) for fields in planFields]
+    width = len(plans) if withRules else _maskWidth(len(plans))
+    
+    source = shared_memory.SharedMemory(name=inputName)
+    target = shared_memory.SharedMemory(name=outputName)
+    
+    try:
+        names = bytes(source.buf[byteStart:byteEnd]).decode("utf-8").split("\0") if end > start else []
+        results = bytearray((end - start) * width)
+        
+        for offset, name in enumerate(names):
+            values = carriers.get(start + offset)
+            mask = 0
+            
+            for bit, plan in enumerate(plans):
+                propertyValue = values.get(plan.propertyName) if plan.hasPropertyRules and values else None
+                visible, rule = plan.decideObjectVisibility(name, propertyValue)
+                
+                if withRules:
+                    results[offset * width + bit] = _RULE_CODES[rule]
+                elif visible:
+                    mask |= 1 << bit
+            
+            if not withRules:
+                results[offset * width:(offset + 1) * width] = mask.to_bytes(width, "little")
+        
+        target.buf[start * width:end * width] = results
+    finally:
+        source.close()
+        target.close()
+
+
+# Main process side ###############################################################################################################
+
+# Tell how many bytes a bitmask takes ---------------------------------------------------------------------------------------------
+def _maskWidth(presetCount: int) -> int:
+    """Tells how many bytes a bitmask of presets takes.
+
+    Args:
+        presetCount (int): The number of presets.
+
+    Returns:
+        int: The number of bytes.
+    """
+    
+    return max(1, (presetCount + 7) // 8)
+
+# Reference this module in worker processes ---------------------------------------------------------------------------------------
+class _WorkerModule:
+    """
+    Pickled as importing this module by its top-level name, so that tasks sent to workers refer to this module as workers load
+    it, instead of as a part of the add-on.
+    """
+    
+    def __reduce__(self):
+        return (importlib.import_module, (__name__.rpartition(".")[2],))
+
+# Get the pool of worker processes ------------------------------------------------------------------------------------------------
+def _getPool() -> ProcessPoolExecutor:
+    """Returns the pool of worker processes, starting it if not started yet. Workers are spawned rather than forked, as forking
+    Blender is not safe, and add the folder of the add-on to their path to be able to load this module.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    
+    global _pool
+    
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=workerCount(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=site.addsitedir,
+            initargs=(os.path.dirname(os.path.abspath(__file__)),))
+    
+    return _pool
+
+# Evaluate presets against objects in worker processes ----------------------------------------------------------------------------
+def _decide(names: list, propertyValues: list, plans: list, withRules: bool) -> bytes:
+    """Evaluates presets against objects in worker processes. Names are passed to workers in shared memory, and only the values 
+    of properties of objects carrying any (usually a few) are pickled. Raises `re.error` if a pattern is invalid.
+
+    Args:
+        names (list): Names of objects.
+        propertyValues (list): A dictionary for each object in `names`, mapping the names of visibility control properties 
+        carried by the object to their values, or `None`.
+        plans (list): The rule plan of each preset.
+        withRules (bool): See `decideShard`.
+
+    Returns:
+        bytes: The results of `decideShard` for all objects, in the order of `names`.
+    """
+    
+    pool = _getPool()
+    width = len(plans) if withRules else _maskWidth(len(plans))
+    planFields = [plan.fields for plan in plans]
+    shardSize = max(1, -(-len(names) // (workerCount() * SHARDS_PER_WORKER)))
+    
+    # Encode names shard by shard to know where shards start in the input
+    encoded = bytearray()
+    shards = []
+    
+    for start in range(0, len(names), shardSize):
+        end = min(start + shardSize, len(names))
+        shard = "\0".join(names[start:end]).encode("utf-8")
+        carriers = {position: propertyValues[position] for position in range(start, end) if propertyValues[position]}
+        
+        shards.append((start, end, len(encoded), len(encoded) + len(shard), carriers))
+        encoded += shard
+    
+    source = shared_memory.SharedMemory(create=True, size=max(1, len(encoded)))
+    target = shared_memory.SharedMemory(create=True, size=max(1, len(names) * width))
+    
+    try:
+        source.buf[:len(encoded)] = encoded
+        
+        futures = [
+            pool.submit(
+                operator.methodcaller(
+                    "decideShard", source.name, target.name, planFields, start, end, byteStart, byteEnd, carriers, withRules), 
+                _WorkerModule())
+            for start, end, byteStart, byteEnd, carriers in shards]
+        
+        # Raises the error of the first failing shard, like `re.error` for an invalid pattern
+        for future in futures:
+            future.result()
+        
+        return bytes(target.buf[:len(names) * width])
+    finally:
+        source.close()
+        source.unlink()
+        target.close()
+        target.unlink()
+
+# Tell the number of worker processes ---------------------------------------------------------------------------------------------
+def workerCount() -> int:
+    """Tells the number of worker processes to use, leaving a core to Blender.
+
+    Returns:
+        int: The number of worker processes.
+    """
+    
+    return max(1, (os.cpu_count() or 2) - 1)
+
+# Work out the visibility of objects and modifiers in parallel --------------------------------------------------------------------
+def evaluate(
+    snapshot: ruleEngine.Snapshot, plan: ruleEngine.RulePlan, collectionVerdicts: list = None, 
+    modifierDecisions: dict = None) -> ruleEngine.VisibilityPlan:
+    """Works out the target visibility of objects and modifiers in a snapshot under a preset, like `ruleEngine.evaluate` does, 
+    but matching names of objects in worker processes. Modifiers are still decided here, as they are decided once for each 
+    distinct name anyway. Raises `re.error` if a pattern is invalid, or one of `POOL_ERRORS` if the pool cannot be used.
+
+    Args:
+        snapshot (ruleEngine.Snapshot): The objects to evaluate the preset for.
+        plan (ruleEngine.RulePlan): The compiled rules of the preset.
+        collectionVerdicts (list, optional): The visibility of objects decided by collection rules, overriding object rules (see
+        `ruleEngine.evaluate`). Defaults to None.
+        modifierDecisions (dict, optional): Decisions already made for modifier names (see `ruleEngine.evaluate`). Defaults to 
+        None.
+
+    Returns:
+        ruleEngine.VisibilityPlan: The target visibility of objects and modifiers.
+    """
+    
+    result = ruleEngine.evaluate(snapshot, plan, objects=False, modifierDecisions=modifierDecisions)
+    codes = _decide(snapshot.names, snapshot.propertyValues, [plan], withRules=True)
+    
+    result.objectVisible = list(map(_VISIBLE.__getitem__, codes))
+    result.objectRules = list(map(_RULES.__getitem__, codes))
+    
+    # Workers only know object rules, so let collections decide afterwards
+    if collectionVerdicts is not None:
+        for position, verdict in enumerate(collectionVerdicts):
+            if verdict is not None:
+                result.objectVisible[position] = verdict
+                result.objectRules[position] = (
+                    ruleEngine.RULE_SHOW_BY_COLLECTION if verdict else ruleEngine.RULE_HIDE_BY_COLLECTION)
+    
+    # Count pattern matches the way `ruleEngine.evaluate` does
+    namePatterns = (plan.objectsToShowByName is not None) + (plan.objectsToHideByName is not None)
+    valuePatterns = (plan.propertyValueForShowing is not None) + (plan.propertyValueForHiding is not None)
+    carriers = 0
+    
+    if plan.hasPropertyRules:
+        carriers = sum(1 for values in snapshot.propertyValues if values and values.get(plan.propertyName) is not None)
+    
+    result.patternMatches += namePatterns * len(snapshot.names) + valuePatterns * carriers
+    
+    return result
+
+# Evaluate all presets against all objects in parallel ----------------------------------------------------------------------------
+def membershipMasks(names: list, propertyValues: list, plans: list) -> list:
+    """Evaluates all presets against all objects in worker processes, to build a `ruleEngine.MembershipIndex` from. Raises 
+    `re.error` if a pattern is invalid, or one of `POOL_ERRORS` if the pool cannot be used.
+
+    Args:
+        names (list): Names of objects in scope.
+        propertyValues (list): A dictionary for each object in `names`, mapping the names of visibility control properties 
+        carried by the object to their values.
+        plans (list): The rule plan of each preset, in the order of presets.
+
+    Returns:
+        list: One bitmask per object, with bit n set if the object shall be visible under the nth preset.
+    """
+    
+    width = _maskWidth(len(plans))
+    masks = _decide(names, propertyValues, plans, withRules=False)
+    
+    return [int.from_bytes(masks[offset:offset + width], "little") for offset in range(0, len(masks), width)]
+
+# Stop worker processes -----------------------------------------------------------------------------------------------------------
+def shutdown():
+    """
+    Stops worker processes. Call this when the add-on is disabled, or when the pool died.
+    """
+    
+    global _pool
+    
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -68,11 +68,219 @@ import os.path
 import copy
 from bpy.props import StringProperty, BoolProperty, EnumProperty, CollectionProperty
 from bpy.types import Context, Panel, Operator, AddonPreferences, PropertyGroup, PointerProperty
+from . import ruleEngine
+from . import instrumentation
+from . import runLog
+from . import collectionVisibility
+from . import scopeResolver
+from . import changeTracker
+from .ruleEngine import PresetDefinition
+
+
+# Selecting presets ###############################################################################################################
+
+applyPresetCallback = None
+"""
+A function to call with the context and a function to report results with (see `_reporterFor`) to apply the selected preset when
+a preset is selected. Set by the module applying presets.
+"""
+
+_presetPositions = {}
+"""
+Positions of presets in the list of presets, keyed by preset name.
+"""
+
+_noPreset = PresetDefinition(builtIn=False)
+"""
+An empty preset standing for the selected preset while no preset is selected.
+"""
+
+presetGeneration = 0
+"""
+Bumped by `presetsChanged` each time presets are added, removed, renamed or imported, so that caches built from the list of 
+presets can tell if they are stale.
+"""
+
+_presetItems = []
+"""
+Cached items of the preset selector enum. Besides saving rebuilding them upon each redraw, Blender needs the strings of enum 
+items returned by a function to be kept referenced from Python, or it may show garbage.
+"""
+
+_presetItemsKey = None
+"""
+The (`presetGeneration`, settings pointer) tuple `_presetItems` have been built for.
+"""
+
+# Report results of applying presets to the user ----------------------------------------------------------------------------------
+def _reporterFor(context: Context):
+    """Returns a function reporting the results of applying a preset like the `report` function of operators, for applying 
+    presets upon changing settings, where there is no operator to report in the status bar. Errors and warnings are shown in a 
+    pop-up if there's a window to show it in. Everything is also in the log of the run anyway.
+
+    Args:
+        context (Context): A bpy.context object.
+
+    Returns:
+        function: A function taking a set of report types (like {'ERROR'}) and a message.
+    """
+    
+    windowManager = context.window_manager
+    
+    def report(type: set, message: str):
+        if context.window is None or len(type & {'ERROR', 'WARNING'}) == 0:
+            return
+        
+        lines = message.splitlines()
+        
+        def draw(menu, context):
+            for line in lines:
+                menu.layout.label(text=line)
+        
+        windowManager.popup_menu(draw, title="T1nk-R Focus Wizard", icon='CANCEL' if 'ERROR' in type else 'ERROR')
+    
+    return report
+
+# Tell that presets changed -------------------------------------------------------------------------------------------------------
+def presetsChanged():
+    """
+    Bumps `presetGeneration`. Call this when presets are added, removed, renamed or imported.
+    """
+    
+    global presetGeneration
+    
+    presetGeneration += 1
+    _presetPositions.clear()
+
+# Find a preset by name -----------------------------------------------------------------------------------------------------------
+def findPresetPosition(presets, presetName: str) -> int:
+    """Finds the position of a preset in the list of presets by the help of a map of names to positions. The map is checked 
+    against the list upon each lookup, and rebuilt if found stale, so adding, removing, reordering or renaming presets needs no
+    extra care.
+
+    Args:
+        presets: The list of presets (`T1nkerFocusWizardSettings.presets`).
+        presetName (str): The name of the preset.
+
+    Returns:
+        int: The index of the preset, or -1 if there's no preset by this name.
+    """
+    
+    position = _presetPositions.get(presetName, -1)
+    
+    if 0 <= position < len(presets) and presets[position].presetName == presetName:
+        return position
+    
+    _presetPositions.clear()
+    
+    # Keep the first of presets with the same name, as a linear search would find that
+    for ix, preset in enumerate(presets):
+        _presetPositions.setdefault(preset.presetName, ix)
+    
+    return _presetPositions.get(presetName, -1)
+
+
+# Hiding collections ##############################################################################################################
+
+# Show collections in scope hidden as a whole -------------------------------------------------------------------------------------
+def _showCollections(scope: scopeResolver.Scope, context: Context, hideMode: str, 
+                     flags: tuple = ("hide_viewport", "hide_render")):
+    """Shows all collections in scope hidden as a whole the way a hide mode tells, so that only objects hidden one by one 
+    remain hidden.
+
+    Args:
+        scope (scopeResolver.Scope): The scope.
+        context (Context): A bpy.context object.
+        hideMode (str): The hide mode collections were hidden by (see `T1nkerFocusWizardSettings.hideMode`).
+        flags (tuple, optional): Names of collection flags to clear if `hideMode` is `VIEWPORT`. Defaults to 
+        ("hide_viewport", "hide_render").
+    """
+    
+    changeTracker.ignoreOwnChanges(collections=True)
+    
+    if hideMode == "VIEWPORT":
+        for collection in scope.collections():
+            for flag in flags:
+                if getattr(collection, flag):
+                    setattr(collection, flag, False)
+        
+        return
+    
+    pending = []
+    
+    for root in scope.roots:
+        for layerCollection in collectionVisibility.layerCollectionsOf(context.view_layer.layer_collection, root):
+            pending.extend(layerCollection.children)
+    
+    while len(pending) > 0:
+        layerCollection = pending.pop()
+        
+        if layerCollection.collection.name in scope.excluded:
+            continue
+        
+        if layerCollection.hide_viewport:
+            layerCollection.hide_viewport = False
+        
+        pending.extend(layerCollection.children)
+
+
+# Preset view layers ##############################################################################################################
+
+PRESET_VIEW_LAYER_PREFIX = "Focus Wizard: "
+"""
+Prefix of the names of view layers built for presets, followed by the name of the preset.
+"""
+
+# Remove view layers built for presets --------------------------------------------------------------------------------------------
+def _removePresetViewLayers(context: Context) -> int:
+    """Removes the view layers built for presets from the scene. Windows showing any of them are switched to the first other 
+    view layer first.
+
+    Args:
+        context (Context): A bpy.context object.
+
+    Returns:
+        int: The number of view layers removed.
+    """
+    
+    scene = context.scene
+    presetLayers = [viewLayer for viewLayer in scene.view_layers if viewLayer.name.startswith(PRESET_VIEW_LAYER_PREFIX)]
+    otherLayers = [viewLayer for viewLayer in scene.view_layers if not viewLayer.name.startswith(PRESET_VIEW_LAYER_PREFIX)]
+    
+    # A scene needs a view layer, so let's keep them if there's nothing else (this only happens if the user removed the others)
+    if len(otherLayers) == 0:
+        return 0
+    
+    for window in context.window_manager.windows:
+        if window.scene == scene and window.view_layer.name.startswith(PRESET_VIEW_LAYER_PREFIX):
+            window.view_layer = otherLayers[0]
+    
+    for viewLayer in presetLayers:
+        scene.view_layers.remove(viewLayer)
+    
+    return len(presetLayers)
 
 
 # Preset Property #################################################################################################################
 class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
+    # Event Handlers ==============================================================================================================
+    
+    # Drop compiled rule plans when a pattern changes -----------------------------------------------------------------------------
+    def _patternChanged(self, context):
+        """Event handler for changing any pattern field of a preset. Drops compiled rule plans so that the next run compiles
+        the new patterns.
+        """
+        
+        ruleEngine.invalidateRulePlans()
+    
+    # Rebuild the list of presets when one is renamed -----------------------------------------------------------------------------
+    def _nameChanged(self, context):
+        """Event handler for renaming a preset. Tells that presets changed so that the preset selector shows the new name.
+        """
+        
+        presetsChanged()
+    
     # Properties ==================================================================================================================
     
     """
@@ -82,7 +290,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     presetName: bpy.props.StringProperty(
         name="Preset name",
-        description="The (unique) name of the preset"
+        description="The (unique) name of the preset",
+        update=_nameChanged
         )
     """
     The (unique) name of the preset. If the name is not unique, behavior is up to Blender. It may choose the first object with the same name,
@@ -100,7 +309,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     objectsToShowByName: bpy.props.StringProperty(
         name="Objects by name to show",
-        description="Name pattern of objects to show"
+        description="Name pattern of objects to show",
+        update=_patternChanged
         )
     """
     Objects within the scope and with a name matching this pattern will be made visible.
@@ -109,7 +319,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     objectsToHideByName: bpy.props.StringProperty(
         name="Objects by name to hide",
-        description="Name pattern of objects to hide"
+        description="Name pattern of objects to hide",
+        update=_patternChanged
     )
     """
     Objects within the scope and with a name matching this pattern will be made hidden.
@@ -118,7 +329,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     propertyName: bpy.props.StringProperty(
         name="Visibility control property",
-        description="The name of the custom object property governing object visibility"
+        description="The name of the custom object property governing object visibility",
+        update=_patternChanged
         )
     """
     The name of the custom object property governing object visibility.
@@ -126,7 +338,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     propertyValueForShowing: bpy.props.StringProperty(
         name="Objects by value to show",
-        description="Value pattern of object properties for showing the object"
+        description="Value pattern of object properties for showing the object",
+        update=_patternChanged
         )
     """
     If an object within the scope has the custom property specified in `propertyName`, and its value matches
@@ -135,7 +348,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     propertyValueForHiding: bpy.props.StringProperty(
         name="Objects by value to hide",
-        description="Value pattern of object properties for hiding the object"
+        description="Value pattern of object properties for hiding the object",
+        update=_patternChanged
         )
     """
     If an object within the scope has the custom property specified in `propertyName`, and its value matches
@@ -144,7 +358,8 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     
     modifiersToShow: bpy.props.StringProperty(
         name="Modifiers to show",
-        description="Regex name pattern of modifiers to show for objects in scope"
+        description="Regex name pattern of modifiers to show for objects in scope",
+        update=_patternChanged
         )
     """
     If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
@@ -152,13 +367,49 @@ class T1nkerFocusWizardPreset(bpy.types.PropertyGroup):
     """
     
     modifiersToHide: bpy.props.StringProperty(name="Modifiers to hide",
-        description="Regex name pattern of modifiers to hide for objects in scope"
+        description="Regex name pattern of modifiers to hide for objects in scope",
+        update=_patternChanged
         )
     """
     If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
     and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made hidden in the viewport.
     """
     
+    collectionsToShow: bpy.props.StringProperty(
+        name="Collections to show",
+        description="Name pattern of collections to show as a whole, along with all objects in them",
+        update=_patternChanged
+        )
+    """
+    Collections within the scope and with a name matching this pattern will be shown as a whole, along with all objects in them,
+    regardless of object rules. An empty string means no collection is shown by name.
+    """
+    
+    collectionsToHide: bpy.props.StringProperty(
+        name="Collections to hide",
+        description="Name pattern of collections to hide as a whole, along with all objects in them",
+        update=_patternChanged
+        )
+    """
+    Collections within the scope and with a name matching this pattern will be hidden as a whole, along with all objects in them,
+    regardless of object rules. An empty string means no collection is hidden by name.
+    """
+    
+# Reference to a collection #######################################################################################################
+class T1nkerFocusWizardCollectionReference(bpy.types.PropertyGroup):
+    """
+    An item of a list of collections in the settings, such as additional root collections or collections excluded from the scope.
+    """
+    
+    collection: bpy.props.PointerProperty(
+        type=bpy.types.Collection,
+        name="Collection",
+        description="The collection"
+    )
+    """
+    The collection referred to.
+    """
+    
 # Addon settings ##################################################################################################################
 class T1nkerFocusWizardSettings(bpy.types.PropertyGroup):
     """
@@ -169,46 +420,191 @@ class T1nkerFocusWizardSettings(bpy.types.PropertyGroup):
     
     # Returns the enum of presets for the combo box -------------------------------------------------------------------------------
     def _getLodLevels(self, context):
-        """Returns the enum of presets for the enum property of the preset combo box.
+        """Returns the enum of presets for the enum property of the preset combo box. Blender asks for it upon each redraw, so 
+        items are cached, and only rebuilt if presets changed (see `presetsChanged`) or the settings of another scene are asked.
 
         Returns:
             enum: Contents for the enum property in the structure of a list of (key, name description) tuples required by Blender.
         """
         
-        presetNames = []
-        for preset in context.scene.t1nkrFocusWizardSettings.presets:
-            presetNames.append((preset.presetName, preset.presetName, f"Select preset {preset.presetName}" ))
+        global _presetItems, _presetItemsKey
+        
+        settings = context.scene.t1nkrFocusWizardSettings
+        key = (presetGeneration, settings.as_pointer())
+        
+        if key != _presetItemsKey:
+            _presetItems = [
+                (preset.presetName, preset.presetName, f"Select preset {preset.presetName}") for preset in settings.presets]
+            _presetItemsKey = key
         
-        return presetNames
+        return _presetItems
     
     # Event handler for selecting a different item in the Preset drop-down --------------------------------------------------------
     def _lodLevelChanged(self, context):
         """Event handler for selecting a different item in the Preset drop-down.
 
-        This method stores the values of the selected preset in a shorthand object.
+        Applies the selected preset right away. The preset is applied by calling `applyPresetCallback` directly rather than the 
+        operator, as calling an operator costs a lookup, context checks and undo handling, which is too much when switching 
+        presets with a hotkey.
         """
         
         settings = context.scene.t1nkrFocusWizardSettings
-        presets: T1nkerFocusWizardPreset = settings.presets
-
-        for preset in presets:
-            if preset.presetName == settings.presetLodLevel: # this is the currently selected item
-                settings.selectedPreset.builtIn = preset.builtIn
-                settings.selectedPreset.presetName = preset.presetName
-                settings.selectedPreset.objectsToShowByName = preset.objectsToShowByName
-                settings.selectedPreset.objectsToHideByName = preset.objectsToHideByName
-                settings.selectedPreset.propertyName = preset.propertyName
-                settings.selectedPreset.propertyValueForShowing = preset.propertyValueForShowing
-                settings.selectedPreset.propertyValueForHiding = preset.propertyValueForHiding
-                settings.selectedPreset.modifiersToShow = preset.modifiersToShow
-                settings.selectedPreset.modifiersToHide = preset.modifiersToHide
-                break
+        
+        if applyPresetCallback is None:
+            return
+        
+        # Profile selecting the preset together with applying it, if asked to
+        isProfiling = settings.isProfilingNextRun and instrumentation.startProfiling()
+        
+        try:
+            applyPresetCallback(context, _reporterFor(context))
+        finally:
+            if isProfiling:
+                log = runLog.RunLog()
+                settings.saveProfile("select preset", log)
+                log.flush(bpy.path.abspath(settings.logFile))
+    
+    # Event handler for changing how objects are hidden ---------------------------------------------------------------------------
+    def _hideModeChanged(self, context):
+        """Event handler for changing `hideMode`.
+
+        Shows the objects in scope hidden the way no longer used, so that only the flags of the selected mode are in effect, and
+        applies the selected preset again the new way.
+        """
+        
+        scope = scopeResolver.resolve(self)
+        
+        if scope is None:
+            return
+        
+        # Show collections hidden the previous way
+        if self.isControllingCollections():
+            if self.hideMode == "VIEWPORT":
+                _showCollections(scope, context, "VIEW_LAYER")
+            else:
+                _showCollections(
+                    scope, context, "VIEWPORT", ("hide_viewport", "hide_render") if self.isHidingRender else ("hide_viewport",))
+        
+        if self.hideMode == "VIEWPORT":
+            # Was hidden in the view layer
+            viewLayer = context.view_layer
+            
+            for obj in scope.objects:
+                if obj.hide_get(view_layer=viewLayer):
+                    changeTracker.ignoreOwnChanges((obj.name,))
+                    obj.hide_set(False, view_layer=viewLayer)
+        else:
+            # Was hidden by flags
+            flags = ("hide_viewport", "hide_render") if self.isHidingRender else ("hide_viewport",)
+            
+            for obj in scope.objects:
+                for flag in flags:
+                    if getattr(obj, flag):
+                        changeTracker.ignoreOwnChanges((obj.name,))
+                        setattr(obj, flag, False)
+        
+        if applyPresetCallback is not None:
+            applyPresetCallback(context, _reporterFor(context))
+    
+    # Event handler for toggling hiding from renders ------------------------------------------------------------------------------
+    def _hidingRenderChanged(self, context):
+        """Event handler for changing `isHidingRender`.
+
+        Only has effect when hiding objects by flags. Shows the objects in scope in renders if turned off, or applies the selected
+        preset again to hide them from renders if turned on.
+        """
+        
+        scope = scopeResolver.resolve(self)
+        
+        if scope is None or self.hideMode != "VIEWPORT":
+            return
+        
+        if not self.isHidingRender:
+            for obj in scope.objects:
+                if obj.hide_render:
+                    changeTracker.ignoreOwnChanges((obj.name,))
+                    obj.hide_render = False
             
+            if self.isControllingCollections():
+                _showCollections(scope, context, "VIEWPORT", ("hide_render",))
+        elif applyPresetCallback is not None:
+            applyPresetCallback(context, _reporterFor(context))
+    
+    # Event handler for toggling hiding whole collections -------------------------------------------------------------------------
+    def _hidingCollectionsChanged(self, context):
+        """Event handler for changing `isHidingCollections`.
+
+        Shows the collections in scope if turned off, and applies the selected preset again either way, to hide objects one by 
+        one or as whole collections.
+        """
+        
+        scope = scopeResolver.resolve(self)
+        
+        if scope is None:
+            return
         
-        # Item changed, execute operation
-        # TODO: The following may drop an error, don't forget to check
-        bpy.ops.t1nker.focuswizard()
+        if not self.isHidingCollections:
+            _showCollections(scope, context, self.hideMode, self.hideFlags())
         
+        if applyPresetCallback is not None:
+            applyPresetCallback(context, _reporterFor(context))
+    
+    # Event handler for toggling view layers per preset ---------------------------------------------------------------------------
+    def _presetViewLayersChanged(self, context):
+        """Event handler for changing `isUsingPresetViewLayers`.
+
+        Removes the view layers built for presets if turned off, and applies the selected preset again either way, to the view 
+        layer of the preset or to the view layer shown instead.
+        """
+        
+        if not self.isUsingPresetViewLayers:
+            _removePresetViewLayers(context)
+        
+        if applyPresetCallback is not None:
+            applyPresetCallback(context, _reporterFor(context))
+    
+    # Public functions ============================================================================================================
+    
+    # Tell which flags hide objects -----------------------------------------------------------------------------------------------
+    def hideFlags(self) -> tuple:
+        """Tells which object flags are set to hide objects, according to `hideMode` and `isHidingRender`.
+
+        Returns:
+            tuple: Names of the flags, or an empty tuple if objects are hidden in the view layer by `hide_set`.
+        """
+        
+        if self.hideMode != "VIEWPORT":
+            return ()
+        
+        return ("hide_viewport", "hide_render") if self.isHidingRender else ("hide_viewport",)
+    
+    # Tell if collections are shown and hidden ------------------------------------------------------------------------------------
+    def isControllingCollections(self) -> bool:
+        """Tells whether the visibility of collections in scope is controlled, either because `isHidingCollections` is set or
+        because any preset has a collection name pattern, which shows or hides matching collections as a whole.
+
+        Returns:
+            bool: `True` if collections may be shown and hidden when applying presets, `False` otherwise.
+        """
+        
+        return self.isHidingCollections or any(
+            preset.collectionsToShow or preset.collectionsToHide for preset in self.presets)
+    
+    # Save the profile of a run ---------------------------------------------------------------------------------------------------
+    def saveProfile(self, spanName: str, log: runLog.RunLog):
+        """Stops profiling started as `isProfilingNextRun` is set, saves results to `profileFolder`, and clears 
+        `isProfilingNextRun` so that only one run is profiled.
+
+        Args:
+            spanName (str): The name of the span covering the whole profiled time in the trace.
+            log (runLog.RunLog): The log to tell where results are saved in. Flushing it is up to the caller.
+        """
+        
+        profilePath, tracePath = instrumentation.stopProfiling(bpy.path.abspath(self.profileFolder), spanName)
+        self.isProfilingNextRun = False
+        
+        log.info("Profile saved to %s, and trace saved to %s", profilePath, tracePath)
+    
     
     # Properties ==================================================================================================================
     
@@ -221,10 +617,18 @@ class T1nkerFocusWizardSettings(bpy.types.PropertyGroup):
     Collection of presets (in the form of `T1nkerFocusWizardPreset` objects) governing object and modifier visibility.
     """
     
-    selectedPreset: bpy.props.PointerProperty(type=T1nkerFocusWizardPreset)
-    """
-    Shorthand reference to the currently selected preset.
-    """
+    @property
+    def selectedPreset(self):
+        """Shorthand reference to the currently selected preset, looked up in `presets` by the help of `findPresetPosition`.
+
+        Returns:
+            T1nkerFocusWizardPreset: The selected preset, or an empty preset (showing all objects and modifiers) if no preset is
+            selected.
+        """
+        
+        position = findPresetPosition(self.presets, self.presetLodLevel)
+        
+        return self.presets[position] if position > -1 else _noPreset
     
     presetLodLevel: EnumProperty(        
         items=_getLodLevels,
@@ -246,6 +650,53 @@ class T1nkerFocusWizardSettings(bpy.types.PropertyGroup):
     outside this collection.
     """
 
+    additionalRootCollections: CollectionProperty(
+        type=T1nkerFocusWizardCollectionReference,
+        name="Additional root collections",
+        description="More top level collections containing your objects"
+    )
+    """
+    More top level collections whose objects are in scope besides those of `rootCollection`.
+    """
+    
+    excludedCollections: CollectionProperty(
+        type=T1nkerFocusWizardCollectionReference,
+        name="Excluded collections",
+        description="Collections under the root collections whose objects are left alone, along with their sub-collections"
+    )
+    """
+    Collections under the root collections excluded from the scope along with their sub-collections. Objects also linked to 
+    collections in scope are still in scope.
+    """
+    
+    objectTypes: EnumProperty(
+        items=(
+            ('MESH', "Mesh", "Process meshes"),
+            ('CURVE', "Curve", "Process curves"),
+            ('SURFACE', "Surface", "Process surfaces"),
+            ('META', "Metaball", "Process metaballs"),
+            ('FONT', "Text", "Process texts"),
+            ('CURVES', "Hair Curves", "Process hair curves"),
+            ('POINTCLOUD', "Point Cloud", "Process point clouds"),
+            ('VOLUME', "Volume", "Process volumes"),
+            ('GPENCIL', "Grease Pencil", "Process grease pencil objects"),
+            ('ARMATURE', "Armature", "Process armatures"),
+            ('LATTICE', "Lattice", "Process lattices"),
+            ('EMPTY', "Empty", "Process empties"),
+            ('LIGHT', "Light", "Process lights"),
+            ('LIGHT_PROBE', "Light Probe", "Process light probes"),
+            ('CAMERA', "Camera", "Process cameras"),
+            ('SPEAKER', "Speaker", "Process speakers")
+            ),
+        name="Object types",
+        description="Only process objects of these types. All objects are processed if none is selected",
+        options={'ENUM_FLAG'},
+        default=set()
+    )
+    """
+    Types of objects in scope (such as `MESH`). Objects of all types are in scope if empty.
+    """
+    
     affectSelectedObjectsOnly: BoolProperty(
         name="Only process selected objects",
         description="If unchecked, it will process all of your visible objects",
@@ -274,6 +725,169 @@ class T1nkerFocusWizardSettings(bpy.types.PropertyGroup):
     Controls if actions are actually taken or just simulated.
     """
     
+    isLiveUpdate: BoolProperty(
+        name="Keep view up to date",
+        description="Apply the selected preset to objects as you add, rename or change them, without having to click Refresh",
+        default=False
+    )
+    """
+    Controls whether to apply the selected preset to objects added, renamed or changed (including custom properties and modifiers)
+    as changes happen. Only changed objects are processed, unless collections are hidden as a whole, when the preset is applied to
+    the whole scope quietly, writing only what differs.
+    """
+    
+    dryRunFile: StringProperty(
+        subtype="FILE_PATH",
+        name="Test results file",
+        description="The file to export the results of the last test run to. The extension is set by the format",
+        default="//T1nk-R Focus Wizard Test Results.json"
+    )
+    """
+    The file to export the results of the last test run to. The extension is replaced according to the format exported to.
+    """
+    
+    logDetailLimit: bpy.props.IntProperty(
+        name="Max lines on objects",
+        description="The maximum number of log lines on individual objects and modifiers per run. 0 means no limit",
+        default=1000,
+        min=0
+    )
+    """
+    The maximum number of log lines on individual objects and modifiers per run, so that verbose runs on huge scenes don't 
+    flood the console. 0 means no limit.
+    """
+    
+    logFile: StringProperty(
+        subtype="FILE_PATH",
+        name="Log file",
+        description="The file to append the log to. The console if empty",
+        default=""
+    )
+    """
+    The file to append the log of runs to. The log is written to the console if empty.
+    """
+    
+    chunkedApplyThreshold: bpy.props.IntProperty(
+        name="Apply in chunks above",
+        description="Apply presets in chunks, showing progress and letting you cancel by pressing Esc, if there are more objects "
+                    "in scope than this. 0 means never",
+        default=50000,
+        min=0
+    )
+    """
+    Presets are applied in chunks by `T1NKER_OT_FocusWizardChunked` if there are more objects in scope than this, so that the UI 
+    stays responsive, progress is shown, and the run can be canceled. 0 means presets are never applied in chunks.
+    """
+    
+    parallelThreshold: bpy.props.IntProperty(
+        name="Match in parallel above",
+        description="Match patterns against objects in worker processes if there are more objects in scope than this. Starting "
+                    "the workers takes a few seconds upon first use. 0 means never",
+        default=100000,
+        min=0
+    )
+    """
+    Patterns are matched against objects in worker processes (see `parallelEvaluation`) if there are more objects in scope than 
+    this, so that small scenes don't pay for starting and feeding workers. 0 means patterns are always matched serially.
+    """
+    
+    isUsingVisibilityHistory: BoolProperty(
+        name="Keep own visibility history",
+        description="Select and apply presets without pushing steps to Blender's global undo, and undo or redo visibility "
+                    "changes with the add-on's own buttons. Recommended for huge files",
+        default=False
+    )
+    """
+    Controls whether applying presets is recorded in the add-on's own visibility history (see `visibilityHistory`) instead of 
+    Blender's global undo, which saves the whole file in memory for each step.
+    """
+    
+    hideMode: EnumProperty(
+        items=(
+            ('VIEW_LAYER', "In view layer", "Hide objects in the view layer, like pressing H does. Hidden objects are still "
+                                            "evaluated and use memory"),
+            ('VIEWPORT', "Disable in viewports", "Disable objects in viewports, setting them for all objects in one go. Hidden "
+                                                 "objects are not evaluated, which saves memory and time on huge files")
+            ),
+        name="Hide objects",
+        description="How to hide objects",
+        default='VIEW_LAYER',
+        update=_hideModeChanged
+    )
+    """
+    Controls how objects are hidden. `VIEW_LAYER` hides them in the view layer by `hide_set`, one call per object. `VIEWPORT` 
+    sets `hide_viewport` of all objects in scope by one `foreach_set` call, and objects disabled this way are left out of 
+    depsgraph evaluation, freeing the memory of their evaluated meshes.
+    """
+    
+    isHidingRender: BoolProperty(
+        name="Hide in renders too",
+        description="When disabling objects in viewports, disable them in renders too",
+        default=False,
+        update=_hidingRenderChanged
+    )
+    """
+    Controls whether `hide_render` is set along with `hide_viewport` when `hideMode` is `VIEWPORT`.
+    """
+    
+    isHidingCollections: BoolProperty(
+        name="Hide whole collections",
+        description="Hide collections under the root collection as a whole if all objects in them are to be hidden, and only hide "
+                    "objects one by one in collections mixing objects to show and hide. Not used when processing only selected "
+                    "objects",
+        default=False,
+        update=_hidingCollectionsChanged
+    )
+    """
+    Controls whether collections under `rootCollection` whose objects are all to be hidden are hidden as a whole (see 
+    `collectionVisibility`), so that switching presets costs a write per collection instead of a write per object when LOD 
+    levels are organized into collections. Collections are hidden by `LayerCollection.hide_viewport` or, if `hideMode` is 
+    `VIEWPORT`, by the flags of the collection. Not used when `affectSelectedObjectsOnly` is set, as collections contain objects
+    not selected too.
+    """
+    
+    isUsingPresetViewLayers: BoolProperty(
+        name="One view layer per preset",
+        description="Build a view layer for each preset upon first use, and switch to it when the preset is selected, so that "
+                    "switching back and forth is almost instant. Only used when hiding objects in the view layer",
+        default=False,
+        update=_presetViewLayersChanged
+    )
+    """
+    Controls whether presets are applied to view layers of their own, named by `PRESET_VIEW_LAYER_PREFIX` and the name of the
+    preset, and selecting a preset switches the window to its view layer. A view layer is built upon first use, and only checked
+    again if the membership index changed since. Modifiers are shared by all view layers, so they are still set upon each switch.
+    Not used if `hideMode` is `VIEWPORT`, as flags hiding objects and collections in viewports are the same in all view layers.
+    """
+    
+    isShowingStatistics: BoolProperty(
+        name="Show statistics of the last run",
+        description="Show where time went and what was done when the last preset was applied",
+        default=False
+    )
+    """
+    Controls whether the panel shows the timing and counters recorded when a preset was last applied.
+    """
+    
+    isProfilingNextRun: BoolProperty(
+        name="Profile next run",
+        description="Profile applying the next preset, and save the profile and a trace of its phases to the profile folder",
+        default=False
+    )
+    """
+    Controls whether the next run shall be profiled. Cleared once the profile is saved, so that only one run is profiled.
+    """
+    
+    profileFolder: StringProperty(
+        subtype="DIR_PATH",
+        name="Profile folder",
+        description="The folder to save profiles and traces to. The temporary folder of your system if empty",
+        default=""
+    )
+    """
+    The folder to save profiles (`.prof`) and traces (`.trace.json`) to. The temporary folder of the system is used if empty.
+    """
+    
     confirmRevert: BoolProperty(
         name="Confirm resetting all built-in presets",
         description="Select to confirm your intent before clicking the button.",
@@ -328,73 +942,6 @@ class T1nkerFocusWizardPresetOperationParameters(bpy.types.PropertyGroup):
     Index of the preset selected in the list of presets. Used for some actions. The default value of -1 means no item is selected.
     """
 
-# Definition of a preset ##########################################################################################################
-class PresetDefinition:
-    """
-    The definition of a preset. Instance-level properties initialized in the constructor include:
-    * builtIn: Tells whether this preset is a built-in or custom one. The name of built-in presets cannot be changed.
-    Built-in presets can be reverted to factory state.
-    * name: The (unique) name of the preset. If the name is not unique, behavior is up to Blender. It may choose the first object with the same name,
-    but don't take it as granted and don't rely on this assumptions.
-    * objectsToShowByName: Objects within the scope and with a name matching this pattern will be made visible.
-    An empty string means all objects in the scope will be made visible.
-    * objectsToHideByName: Objects within the scope and with a name matching this pattern will be made hidden.
-    An empty string means no objects in the scope will be made hidden.
-    * propertyName: The name of the custom object property governing object visibility.
-    * propertyValueForShowing: If an object within the scope has the custom property specified in `propertyName`, and its value matches
-    this regex, the object will be made visible.
-    * propertyValueForHiding: If an object within the scope has the custom property specified in `propertyName`, and its value matches
-    this regex, the object will be made hidden.
-    * modifiersToShow: If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
-    and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made visible in the viewport.
-    * modifiersToHide: If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
-    and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made hidden in the viewport.    
-    """    
-    
-    def __init__(
-        self,
-        builtIn: bool = True,
-        presetName: str = "", 
-        oShow: str = "", 
-        oHide: str = "", 
-        pName: str = "", 
-        pShow: str = "", 
-        pHide: str = "", 
-        mShow: str = "", 
-        mHide: str = ""):
-        """Creates a new preset definition.
-
-        Args:
-            builtIn (bool, optional): Tells whether this preset is a built-in or custom one. The name of built-in presets cannot be changed. Built-in presets can be reverted to factory state. Defaults to True.
-            
-            presetName (str, optional): The (unique) name of the preset. If the name is not unique, behavior is up to Blender. It may choose the first object with the same name, but don't take it as granted and don't rely on this assumptions. Defaults to "".
-            
-            oShow (str, optional): Objects within the scope and with a name matching this pattern will be made visible. An empty string means all objects in the scope will be made visible. Defaults to "".
-            
-            oHide (str, optional): Objects within the scope and with a name matching this pattern will be made hidden. An empty string means no objects in the scope will be made hidden. Defaults to "".
-            
-            pName (str, optional): The name of the custom object property governing object visibility. Defaults to "".
-            
-            pShow (str, optional): If an object within the scope has the custom property specified in `propertyName`, and its value matches this regex, the object will be made visible. Defaults to "".
-            
-            pHide (str, optional): If an object within the scope has the custom property specified in `propertyName`, and its value matches this regex, the object will be made hidden. Defaults to "".
-            
-            mShow (str, optional): If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing` and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made visible in the viewport. Defaults to "".
-            
-            mHide (str, optional): If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing` and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made hidden in the viewport. Defaults to "".
-        """
-        # Keep doc strings in one line as VS Code only displays one line of text for an argument
-        
-        self.builtIn = builtIn
-        self.presetName = presetName
-        self.objectsToShowByName = oShow
-        self.objectsToHideByName = oHide
-        self.propertyName = pName
-        self.propertyValueForShowing = pShow
-        self.propertyValueForHiding = pHide
-        self.modifiersToShow = mShow
-        self.modifiersToHide = mHide
-
 # Operator performing import/replace and export operations ########################################################################
 class T1NKER_OT_FocusWizardPresetImportExport(Operator):    
     """Import/export UI for presets.
@@ -510,25 +1057,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
     A `T1nkerFocusWizardPresetOperationParameters` specifying what to do and with which preset.
     """
             
-    presetDefinitions = [
-        # Presets with direct reference to lod levels (modifier set for lod n shall not be visible for other lod levels)
-        # Expects lod levels be indicated in the form of #lodn or #lodn-m as trailing parts of names for objects, and #lodn for modifiers
-        PresetDefinition(presetName = "Direct: Lod 0", oShow = "#lod0",                   oHide = "#lod[12345]",                          pName = "Hide at Lod Level",    pShow = "",     pHide = "0",        mShow = "",     mHide = "#lod[12345]"),
-        PresetDefinition(presetName = "Direct: Lod 1", oShow = "#lod.*1|#lod0-",          oHide = "#lod[02345]$|#lod[234]-",              pName = "Hide at Lod Level",    pShow = "",     pHide = "[01]",     mShow = "",     mHide = "#lod[02345]$|#lod[234]-"),
-        PresetDefinition(presetName = "Direct: Lod 2", oShow = "#lod.*2|#lod[01]-[345]",  oHide = "#lod[01345]$|#lod.*-1|#lod[34]-",      pName = "Hide at Lod Level",    pShow = "",     pHide = "[012]",    mShow = "",     mHide = "#lod[01345]$|#lod.*-1|#lod[34]-"),
-        PresetDefinition(presetName = "Direct: Lod 3", oShow = "#lod.*3|#lod[012]-[45]",  oHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-",   pName = "Hide at Lod Level",    pShow = "",     pHide = "[0123]",   mShow = "",     mHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-"),
-        PresetDefinition(presetName = "Direct: Lod 4", oShow = "#lod.*4|#lod[0123]-5",    oHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-",  pName = "Hide at Lod Level",    pShow = "",     pHide = "[01234]",  mShow = "",     mHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-"),
-        PresetDefinition(presetName = "Direct: Lod 5", oShow = "#lod.*5|#lod[01234]-",    oHide = "#lod[01234]$|#lod.*-[01234]",          pName = "Hide at Lod Level",    pShow = "",     pHide = "[012345]", mShow = "",     mHide = "#lod[01234]$|#lod.*-[01234]"),
-        
-        # Presets with cascaded reference to lod levels (modifier set for lod n shall be visible for n and n+ levels)
-        # Expects lod levels be indicated in the form of #lodn or #lodn-m as trailing parts of names for objects, and #lodn for modifiers
-        PresetDefinition(presetName = "Cascaded: Lod 0", oShow = "#lod0",                     oHide = "#lod[12345]$",                         pName = "Hide at Lod Level",    pShow = "",     pHide = "0",        mShow = "",  mHide = "#lod[12345]"),
-        PresetDefinition(presetName = "Cascaded: Lod 1", oShow = "#lod.*1|#lod0-",            oHide = "#lod[02345]$|#lod[234]-",              pName = "Hide at Lod Level",    pShow = "",     pHide = "[01]",     mShow = "",  mHide = "#lod[2345]"),
-        PresetDefinition(presetName = "Cascaded: Lod 2", oShow = "#lod.*2|#lod[01]-[2345]",   oHide = "#lod[01345]$|#lod.*-1|#lod[34]-",      pName = "Hide at Lod Level",    pShow = "",     pHide = "[012]",    mShow = "",  mHide = "#lod[345]"),
-        PresetDefinition(presetName = "Cascaded: Lod 3", oShow = "#lod.*3|#lod[012]-[345]",   oHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-",   pName = "Hide at Lod Level",    pShow = "",     pHide = "[0123]",   mShow = "",  mHide = "#lod[45]"),
-        PresetDefinition(presetName = "Cascaded: Lod 4", oShow = "#lod.*4|#lod[0123]-[45]",   oHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-",  pName = "Hide at Lod Level",    pShow = "",     pHide = "[01234]",  mShow = "",  mHide = "#lod[5]"),
-        PresetDefinition(presetName = "Cascaded: Lod 5", oShow = "#lod.*5|#lod[01234]-5",     oHide = "#lod[01234]$|#lod.*-[01234]",          pName = "Hide at Lod Level",    pShow = "",     pHide = "[012345]", mShow = "",  mHide = ""),
-    ]
+    presetDefinitions = ruleEngine.BUILT_IN_PRESETS
     """
     Definitions of the built-in presets in the form of `PresetDefinition`.
     """
@@ -611,7 +1140,9 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                 pShow = customPreset.propertyValueForShowing,
                 pHide = customPreset.propertyValueForHiding,
                 mShow = customPreset.modifiersToShow,
-                mHide = customPreset.modifiersToHide   
+                mHide = customPreset.modifiersToHide,
+                cShow = customPreset.collectionsToShow,
+                cHide = customPreset.collectionsToHide
             )
             
             customPresets.append(preset)
@@ -632,6 +1163,8 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
             preset.propertyValueForHiding = presetDefinition.propertyValueForHiding
             preset.modifiersToShow = presetDefinition.modifiersToShow
             preset.modifiersToHide = presetDefinition.modifiersToHide
+            preset.collectionsToShow = presetDefinition.collectionsToShow
+            preset.collectionsToHide = presetDefinition.collectionsToHide
         
         # Add previously saved custom presets
         for customPreset in customPresets:
@@ -645,6 +1178,8 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
             preset.propertyValueForHiding = customPreset.propertyValueForHiding
             preset.modifiersToShow = customPreset.modifiersToShow
             preset.modifiersToHide = customPreset.modifiersToHide
+            preset.collectionsToShow = customPreset.collectionsToShow
+            preset.collectionsToHide = customPreset.collectionsToHide
 
     # Reset a specific built-in preset to factory state ---------------------------------------------------------------------------
     def _revertBuiltInPreset(self, context: Context):
@@ -688,6 +1223,8 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                 presetToRevert.propertyValueForHiding = presetDefinition.propertyValueForHiding
                 presetToRevert.modifiersToShow = presetDefinition.modifiersToShow
                 presetToRevert.modifiersToHide = presetDefinition.modifiersToHide
+                presetToRevert.collectionsToShow = presetDefinition.collectionsToShow
+                presetToRevert.collectionsToHide = presetDefinition.collectionsToHide
         
     # Total reset: delete all custom presets and revert built-in ones -------------------------------------------------------------   
     def _resetFactoryPresets(self, context: Context):
@@ -733,7 +1270,9 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                 pShow=preset.propertyValueForShowing,
                 pHide=preset.propertyValueForHiding,
                 mShow=preset.modifiersToShow,
-                mHide=preset.modifiersToHide                
+                mHide=preset.modifiersToHide,
+                cShow=preset.collectionsToShow,
+                cHide=preset.collectionsToHide
             )
             
             presetDefinitions.append(presetDef)
@@ -743,6 +1282,26 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
             # Write the objects, using the JSON encoder
             json.dump(presetDefinitions, fp=jsonFile, default=self._objectEncoder, indent=2)
     
+    # Get a field of an imported preset -------------------------------------------------------------------------------------------
+    def _importedField(self, importedPreset: dict, *keys: str) -> str:
+        """Returns a field of a preset read from a JSON file, looking it up by more keys. Files are exported with the name patterns
+        of objects under `objectsToShowByName` and `objectsToHideByName`, while they used to be imported from `objectsToShow` and
+        `objectsToHide`, so both are accepted.
+
+        Args:
+            importedPreset (dict): The preset read from the file.
+            keys (str): The keys to try, in order of preference.
+
+        Returns:
+            str: The value of the first key found, or an empty string if none is found.
+        """
+        
+        for key in keys:
+            if key in importedPreset:
+                return importedPreset[key]
+        
+        return ""
+    
     # Import presets --------------------------------------------------------------------------------------------------------------        
     def _loadPresetsFromFile(self, append: bool):
         """
@@ -788,13 +1347,15 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
             preset = self.settings.presets.add()
             preset.builtIn                  = importedPreset["builtIn"]                 if "builtIn" in importedPreset                  else False
             preset.presetName               = importedPreset["presetName"]              # exists for sure, no-names has been already dropped
-            preset.objectsToShowByName      = importedPreset["objectsToShow"]           if "objectsToShow" in importedPreset            else ""
-            preset.objectsToHideByName      = importedPreset["objectsToHide"]           if "objectsToHide" in importedPreset            else ""
+            preset.objectsToShowByName      = self._importedField(importedPreset, "objectsToShowByName", "objectsToShow")
+            preset.objectsToHideByName      = self._importedField(importedPreset, "objectsToHideByName", "objectsToHide")
             preset.propertyName             = importedPreset["propertyName"]            if "propertyName" in importedPreset             else ""
             preset.propertyValueForShowing  = importedPreset["propertyValueForShowing"] if "propertyValueForShowing" in importedPreset  else ""
             preset.propertyValueForHiding  = importedPreset["propertyValueForHiding"]  if "propertyValueForHiding" in importedPreset   else ""
             preset.modifiersToShow          = importedPreset["modifiersToShow"]         if "modifiersToShow" in importedPreset          else ""
             preset.modifiersToHide          = importedPreset["modifiersToHide"]         if "modifiersToHide" in importedPreset          else ""  
+            preset.collectionsToShow        = importedPreset["collectionsToShow"]       if "collectionsToShow" in importedPreset        else ""
+            preset.collectionsToHide        = importedPreset["collectionsToHide"]       if "collectionsToHide" in importedPreset        else ""
         
     # Public functions ============================================================================================================
         
@@ -817,6 +1378,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
             match self.operationParameters.action:
                 case "ADD": # Add new preset
                     self._addCustomPreset(context)
+                    presetsChanged()
                     
                     return {'FINISHED'}
                     
@@ -824,6 +1386,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                     # Check if an item is selected for the operation
                     if hasattr(self.operationParameters, "selectedItemIndex") and self.operationParameters.selectedItemIndex is not None:            
                         self._removeCustomPreset(context)
+                        presetsChanged()
                         self.report({'DEBUG'}, f"Preset {self.operationParameters.selectedItemIndex} removed")
                     else:
                         self.report({'ERROR'}, "No preset belongs to the 'Remove Custom Preset' button. This should not happen. The best is to file a bug.")
@@ -844,6 +1407,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                     # Fail if the file specified is not a file at all
                     if os.path.isfile(self.settings.presetFile):
                         self._loadPresetsFromFile(append=True)
+                        presetsChanged()
                     else:
                         self.report({'ERROR'}, f"The value specified ({self.settings.presetFile}) is not a file. Cannot load presets.")
                         return {'CANCELLED'}
@@ -854,6 +1418,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                     # Fail if the file specified is not a file at all
                     if os.path.isfile(self.settings.presetFile):
                         self._loadPresetsFromFile(append=False)
+                        presetsChanged()
                     else:
                         self.report({'ERROR'}, f"The value specified ({self.settings.presetFile}) is not a file. Cannot load presets.")
                         return {'CANCELLED'}
@@ -864,10 +1429,12 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                     # See if there's an item selected for the operation
                     if self.operationParameters.selectedItemIndex > -1: # No, so revert all built-in preset
                         self._revertBuiltInPreset(context)
+                        presetsChanged()
                     else: # only revert a specific preset
                         # Check if confirmation checkbox is checked
                         if self.settings.confirmRevert:
                             self._revertFactoryPresets(context)
+                            presetsChanged()
                             self.report({'DEBUG'}, f"Built-in presets reverted to factory state")
                             
                             # Revert confirmation to prevent accidental future clicks
@@ -882,6 +1449,7 @@ class T1NKER_OT_FocusWizardPresetOperations(Operator):
                     # Check if confirmation checkbox is checked
                     if self.settings.confirmReset:
                         self._resetFactoryPresets(context)
+                        presetsChanged()
                         self.report({'DEBUG'}, f"Custom presets deleted and built-in presets reverted to factory state")
                         
                         # Revert confirmation to prevent accidental future clicks
@@ -952,6 +1520,8 @@ class T1NKER_OT_FocusWizardPresetEditor(Operator):
         propToHideColumn = row.column(align=True)
         modifierToShowColumn = row.column(align=True)
         modifierToHideColumn = row.column(align=True)
+        collectionToShowColumn = row.column(align=True)
+        collectionToHideColumn = row.column(align=True)
         actionColumn = row.column(align=True)
         
         # This didn't work as headers were not displaed for columns containing other than editable props
@@ -984,6 +1554,10 @@ class T1NKER_OT_FocusWizardPresetEditor(Operator):
         modifierToShowColumn.label(text="Show", icon="DOT")
         modifierToHideColumn.label(text=" ")
         modifierToHideColumn.label(text="Hide", icon="DOT")        
+        collectionToShowColumn.label(text="Collections by name", icon="DOT")
+        collectionToShowColumn.label(text="Show", icon="DOT")
+        collectionToHideColumn.label(text=" ")
+        collectionToHideColumn.label(text="Hide", icon="DOT")
         actionColumn.label(text=" ")
         actionColumn.label(text="Actions", icon="DOT")
         
@@ -1005,6 +1579,8 @@ class T1NKER_OT_FocusWizardPresetEditor(Operator):
             propToHideColumn.prop(item, "propertyValueForHiding", text="")
             modifierToShowColumn.prop(item, "modifiersToShow", text="")
             modifierToHideColumn.prop(item, "modifiersToHide", text="")        
+            collectionToShowColumn.prop(item, "collectionsToShow", text="")
+            collectionToHideColumn.prop(item, "collectionsToHide", text="")
         
             # Actions depent on prese type        
             if item.builtIn: # you can revert it
@@ -0,0 +1,1564 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains the compiled rule plans used to evaluate presets.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from collections import OrderedDict
+from typing import NamedTuple
+import functools
+import re
+
+
+# Rules deciding visibility #######################################################################################################
+
+RULE_SHOW_ALL = "lack of a name-based showing pattern"
+"""
+The object is visible because there's no pattern to show objects by name, meaning all objects shall be shown.
+"""
+
+RULE_SHOW_BY_NAME = "name-based showing pattern"
+"""
+The object is visible because its name matches the pattern to show objects by name.
+"""
+
+RULE_NOT_SHOWN_BY_NAME = "not matching the name-based showing pattern"
+"""
+The object is hidden because its name doesn't match the pattern to show objects by name.
+"""
+
+RULE_HIDE_BY_NAME = "name-based hiding pattern"
+"""
+The object is hidden because its name matches the pattern to hide objects by name.
+"""
+
+RULE_SHOW_BY_PROPERTY = "property-based showing pattern"
+"""
+The object is visible because the value of its visibility control property matches the pattern to show objects.
+"""
+
+RULE_HIDE_BY_PROPERTY = "property-based hiding pattern"
+"""
+The object is hidden because the value of its visibility control property matches the pattern to hide objects.
+"""
+
+RULE_SHOW_BY_COLLECTION = "collection showing pattern"
+"""
+The object is visible because it's in a collection shown as a whole, as the collection or one of its parents matches the pattern 
+to show collections.
+"""
+
+RULE_HIDE_BY_COLLECTION = "collection hiding pattern"
+"""
+The object is hidden along with its collections, as each of them or one of their parents matches the pattern to hide collections.
+"""
+
+RULE_MEMBERSHIP_INDEX = "the rules of the preset, as recorded in the membership index"
+"""
+The visibility of the object has been looked up from the `MembershipIndex` instead of evaluating rules again.
+"""
+
+
+RULE_SHOW_ALL_MODIFIERS = "lack of a modifier showing pattern"
+"""
+The modifier is visible because there's no pattern to show modifiers, meaning all modifiers shall be shown.
+"""
+
+RULE_SHOW_MODIFIER = "modifier showing pattern"
+"""
+The modifier is visible because its name matches the pattern to show modifiers.
+"""
+
+RULE_NOT_SHOWN_MODIFIER = "not matching the modifier showing pattern"
+"""
+The modifier is hidden because its name doesn't match the pattern to show modifiers.
+"""
+
+RULE_HIDE_MODIFIER = "modifier hiding pattern"
+"""
+The modifier is hidden because its name matches the pattern to hide modifiers.
+"""
+
+
+# LOD tags ########################################################################################################################
+
+LOD_TAG_PREFIX = "#lod"
+"""
+The prefix of LOD tags in object and modifier names, as used by built-in presets.
+"""
+
+_lodTagPattern = re.compile(r"#lod(\d)(?:-(\d))?$")
+"""
+A regular LOD tag at the end of a name, such as `#lod2` or `#lod0-3`.
+"""
+
+class LodRange(NamedTuple):
+    """
+    The LOD levels an object or modifier is tagged for, as parsed from a regular LOD tag such as `#lod2` or `#lod0-3`.
+    """
+    
+    lowest: int
+    """
+    The lowest LOD level in the range, or the only level for tags like `#lod2`.
+    """
+    
+    highest: int
+    """
+    The highest LOD level in the range, or the only level for tags like `#lod2`.
+    """
+    
+    isRange: bool
+    """
+    Tells if the tag has been specified as a range, like `#lod0-3`. Note that `#lod2` and `#lod2-2` don't match the same patterns.
+    """
+    
+    # Compose the tag -------------------------------------------------------------------------------------------------------------
+    def text(self) -> str:
+        """Composes the tag the range has been parsed from.
+
+        Returns:
+            str: The tag, such as `#lod2` or `#lod0-3`.
+        """
+        
+        return f"{LOD_TAG_PREFIX}{self.lowest}-{self.highest}" if self.isRange else f"{LOD_TAG_PREFIX}{self.lowest}"
+
+IRREGULAR_LOD_TAG = LodRange(-1, -1, False)
+"""
+Returned by `parseLodTag` for names with a tag that is not regular, such as names with more than one tag, with a tag not at the
+end (like `Tank#lod1.001`), or with a multi-digit LOD level. Such names need to be matched against regexes.
+"""
+
+# Extract the LOD tag from a name -------------------------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1 << 17)
+def parseLodTag(name: str):
+    """Extracts the LOD tag from a name. Results are cached, so each name is parsed only once.
+
+    Args:
+        name (str): The name of an object or modifier.
+
+    Returns:
+        `None` if the name has no LOD tag, `IRREGULAR_LOD_TAG` if the tag is not regular, otherwise a `LodRange`.
+    """
+    
+    occurrences = name.count(LOD_TAG_PREFIX)
+    
+    if occurrences == 0:
+        return None
+    
+    match = _lodTagPattern.search(name) if occurrences == 1 else None
+    
+    if match is None:
+        return IRREGULAR_LOD_TAG
+    
+    lowest = int(match.group(1))
+    
+    if match.group(2) is None:
+        return LodRange(lowest, lowest, False)
+    
+    return LodRange(lowest, int(match.group(2)), True)
+
+# Split a pattern to alternatives -------------------------------------------------------------------------------------------------
+def _splitAlternatives(pattern: str):
+    """Splits a regex to its top-level alternatives, that is, at `|` characters not in a group or character set.
+
+    Args:
+        pattern (str): The regex.
+
+    Returns:
+        list: The alternatives, or `None` if the pattern is too irregular to tell.
+    """
+    
+    alternatives = []
+    depth = 0
+    inSet = False
+    start = 0
+    ix = 0
+    
+    while ix < len(pattern):
+        char = pattern[ix]
+        
+        if char == "\\":
+            # Skip the escaped character
+            ix += 2
+            continue
+        
+        if inSet:
+            if char == "]":
+                inSet = False
+        elif char == "[":
+            inSet = True
+            
+            # A closing bracket right after the opening one (or after a negation) is a literal
+            if pattern[ix + 1:ix + 2] == "^":
+                ix += 1
+            if pattern[ix + 1:ix + 2] == "]":
+                ix += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == "|" and depth == 0:
+            alternatives.append(pattern[start:ix])
+            start = ix + 1
+        
+        ix += 1
+    
+    if depth != 0 or inSet:
+        return None
+    
+    alternatives.append(pattern[start:])
+    
+    return alternatives
+
+# Tell if a pattern only matches LOD tags -----------------------------------------------------------------------------------------
+def _isLodPattern(pattern: str) -> bool:
+    """Tells if a name pattern can only match at a LOD tag, that is, each of its alternatives starts with a literal `#lod`. Such
+    patterns match a name with a regular tag if and only if they match the tag itself.
+
+    Args:
+        pattern (str): The regex.
+
+    Returns:
+        bool: True if each alternative starts with a literal `#lod`.
+    """
+    
+    # Lookbehinds could peek before the tag
+    if "(?<" in pattern:
+        return False
+    
+    alternatives = _splitAlternatives(pattern)
+    
+    if alternatives is None:
+        return False
+    
+    for alternative in alternatives:
+        if not alternative.startswith(LOD_TAG_PREFIX):
+            return False
+        
+        # Make sure the 'd' in '#lod' is not made optional or repeated by a quantifier
+        if alternative[len(LOD_TAG_PREFIX):len(LOD_TAG_PREFIX) + 1] in ("?", "*", "+", "{"):
+            return False
+    
+    return True
+
+
+# Matching paths ##################################################################################################################
+
+PATH_REGEX = "regex"
+"""
+The pattern is a true regex, and is matched by the regex engine.
+"""
+
+PATH_LITERAL = "literal"
+"""
+The pattern is a plain string (optionally anchored), and is matched by substring, prefix, suffix or equality checks.
+"""
+
+PATH_ALTERNATION = "literal alternation"
+"""
+The pattern is an alternation of plain strings, and is matched by checking each of them, without the regex engine.
+"""
+
+PATH_LOD_TAG = "LOD tag lookup"
+"""
+The pattern only matches LOD tags, and is answered by the LOD range of names, falling back to one of the other paths for names 
+with irregular tags.
+"""
+
+_regexMetaCharacters = frozenset(".^$*+?{}[]|()")
+"""
+Characters with a special meaning in regexes outside character sets (apart from the backslash).
+"""
+
+# Parse a literal alternative -----------------------------------------------------------------------------------------------------
+def _parseLiteral(alternative: str):
+    """Parses an alternative of a regex if it's a plain string, optionally anchored to the start and/or the end.
+
+    Args:
+        alternative (str): An alternative of a regex, as returned by `_splitAlternatives`.
+
+    Returns:
+        tuple: A (anchoredToStart, text, anchoredToEnd) triplet, or `None` if the alternative is not a plain string.
+    """
+    
+    anchoredToStart = alternative.startswith("^")
+    if anchoredToStart:
+        alternative = alternative[1:]
+    
+    # A trailing $ is an anchor, unless it's escaped
+    anchoredToEnd = alternative.endswith("$") and not alternative.endswith("\\$")
+    if anchoredToEnd:
+        alternative = alternative[:-1]
+    
+    text = []
+    ix = 0
+    
+    while ix < len(alternative):
+        char = alternative[ix]
+        
+        if char == "\\":
+            escaped = alternative[ix + 1:ix + 2]
+            
+            # Escaped letters and digits have special meanings like \d or \1
+            if len(escaped) == 0 or escaped.isalnum() or escaped == "_":
+                return None
+            
+            text.append(escaped)
+            ix += 2
+            continue
+        
+        if char in _regexMetaCharacters:
+            return None
+        
+        text.append(char)
+        ix += 1
+    
+    return anchoredToStart, "".join(text), anchoredToEnd
+
+
+# Compiled text pattern ###########################################################################################################
+class TextPattern:
+    """
+    A compiled pattern for texts such as property values. 
+    
+    Most real-world patterns are plain strings like `_collider` or alternations of plain strings like `_col|_phys`. These are 
+    matched by substring, prefix and suffix checks, which are cheaper than running the regex engine. True regexes fall back to
+    the regex engine. The checks needed are worked out when compiling the pattern, and `matches` is set to a function doing only 
+    those, so that no time is wasted on telling cases apart upon each match.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, pattern: str):
+        """Compiles a pattern. Raises `re.error` if the pattern is not a valid regex.
+
+        Args:
+            pattern (str): The regex as specified in the preset.
+        """
+        
+        self.pattern = pattern
+        """
+        The regex as specified in the preset.
+        """
+        
+        self.regex = re.compile(pattern)
+        """
+        The compiled regex. Compiled even if not used, to report invalid patterns the same way regardless of the path.
+        """
+        
+        self.path = PATH_REGEX
+        """
+        Tells how the pattern is matched, see the `PATH_*` constants.
+        """
+        
+        alternatives = _splitAlternatives(pattern)
+        literals = None if alternatives is None else [_parseLiteral(alternative) for alternative in alternatives]
+        
+        if literals is None or None in literals:
+            self.matches = _regexMatcher(self.regex)
+        else:
+            self.path = PATH_LITERAL if len(literals) == 1 else PATH_ALTERNATION
+            self.matches = _literalMatcher(literals)
+    
+    # Public functions ============================================================================================================
+    
+    # Match a text ----------------------------------------------------------------------------------------------------------------
+    def matches(self, text: str) -> bool:
+        """Tells if a text matches the pattern, that is, if the regex can be found in the text. Replaced by a function specific
+        to the pattern upon compiling it.
+
+        Args:
+            text (str): The text to match.
+
+        Returns:
+            bool: True if the text matches.
+        """
+        
+        return self.regex.search(text) is not None
+
+
+# Create a function matching by the regex engine ----------------------------------------------------------------------------------
+def _regexMatcher(regex: re.Pattern):
+    """Creates a function telling if a regex can be found in a text.
+
+    Args:
+        regex (re.Pattern): The compiled regex.
+
+    Returns:
+        function: A function taking a text and returning True if it matches.
+    """
+    
+    search = regex.search
+    
+    return lambda text: search(text) is not None
+
+# Create a function matching plain strings ----------------------------------------------------------------------------------------
+def _literalMatcher(literals: list):
+    """Creates a function telling if any of the plain strings matches a text, without running the regex engine. As `$` also 
+    matches before a trailing newline, strings anchored to the end are also checked with a newline appended.
+
+    Args:
+        literals (list): (anchoredToStart, text, anchoredToEnd) triplets as returned by `_parseLiteral`.
+
+    Returns:
+        function: A function taking a text and returning True if it matches.
+    """
+    
+    substrings = tuple(text for atStart, text, atEnd in literals if not atStart and not atEnd)
+    prefixes = tuple(text for atStart, text, atEnd in literals if atStart and not atEnd)
+    suffixes = tuple(
+        suffix for atStart, text, atEnd in literals if atEnd and not atStart for suffix in (text, text + "\n"))
+    exactTexts = frozenset(
+        exact for atStart, text, atEnd in literals if atStart and atEnd for exact in (text, text + "\n"))
+    
+    # The usual cases get the simplest functions possible
+    if len(literals) == 1:
+        atStart, literal, atEnd = literals[0]
+        
+        if not atStart and not atEnd:
+            return lambda text: literal in text
+        
+        if atStart and not atEnd:
+            return lambda text: text.startswith(literal)
+        
+        if atEnd and not atStart:
+            return lambda text: text.endswith(suffixes)
+        
+        return lambda text: text in exactTexts
+    
+    if len(prefixes) == 0 and len(suffixes) == 0 and len(exactTexts) == 0:
+        def matchSubstrings(text: str) -> bool:
+            for substring in substrings:
+                if substring in text:
+                    return True
+            
+            return False
+        
+        return matchSubstrings
+    
+    def matchAny(text: str) -> bool:
+        for substring in substrings:
+            if substring in text:
+                return True
+        
+        return text.startswith(prefixes) or text.endswith(suffixes) or text in exactTexts
+    
+    return matchAny
+
+
+# Compiled name pattern ###########################################################################################################
+class NamePattern(TextPattern):
+    """
+    A compiled pattern for object or modifier names. 
+    
+    Patterns of built-in presets only match LOD tags like `#lod2` or `#lod0-3` at the end of names. For such patterns the decision
+    only depends on the LOD range parsed from the name, so it's made once per distinct range, and then answered by a lookup keyed 
+    by the range, without matching the pattern again. Other patterns and names with irregular tags are matched as described for
+    `TextPattern`.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, pattern: str):
+        """Compiles a name pattern. Raises `re.error` if the pattern is not a valid regex.
+
+        Args:
+            pattern (str): The regex as specified in the preset.
+        """
+        
+        super().__init__(pattern)
+        
+        self.isLodPattern = _isLodPattern(pattern)
+        """
+        Tells if the pattern can only match at a LOD tag, so that decisions can be made based on the LOD range of names.
+        """
+        
+        self._matchText = self.matches
+        """
+        The function matching names without relying on LOD tags, used for names with irregular tags.
+        """
+        
+        self._lodDecisions = {}
+        """
+        Decisions made so far for LOD ranges, keyed by `LodRange`.
+        """
+        
+        if self.isLodPattern:
+            self.path = PATH_LOD_TAG
+            self.matches = self._matchLodTag
+    
+    # Private functions ===========================================================================================================
+    
+    # Match a name by its LOD tag -------------------------------------------------------------------------------------------------
+    def _matchLodTag(self, name: str) -> bool:
+        """Tells if a name matches the pattern based on the LOD range in its tag.
+
+        Args:
+            name (str): The name of an object or modifier.
+
+        Returns:
+            bool: True if the name matches.
+        """
+        
+        lodRange = parseLodTag(name)
+        
+        # A name without a tag can't match a pattern requiring one
+        if lodRange is None:
+            return False
+        
+        if lodRange is IRREGULAR_LOD_TAG:
+            return self._matchText(name)
+        
+        decision = self._lodDecisions.get(lodRange)
+        
+        if decision is None:
+            decision = self._matchText(lodRange.text())
+            self._lodDecisions[lodRange] = decision
+            
+        return decision
+
+
+# Definition of a preset ##########################################################################################################
+class PresetDefinition:
+    """
+    The definition of a preset. Instance-level properties initialized in the constructor include:
+    * builtIn: Tells whether this preset is a built-in or custom one. The name of built-in presets cannot be changed.
+    Built-in presets can be reverted to factory state.
+    * name: The (unique) name of the preset. If the name is not unique, behavior is up to Blender. It may choose the first object with the same name,
+    but don't take it as granted and don't rely on this assumptions.
+    * objectsToShowByName: Objects within the scope and with a name matching this pattern will be made visible.
+    An empty string means all objects in the scope will be made visible.
+    * objectsToHideByName: Objects within the scope and with a name matching this pattern will be made hidden.
+    An empty string means no objects in the scope will be made hidden.
+    * propertyName: The name of the custom object property governing object visibility.
+    * propertyValueForShowing: If an object within the scope has the custom property specified in `propertyName`, and its value matches
+    this regex, the object will be made visible.
+    * propertyValueForHiding: If an object within the scope has the custom property specified in `propertyName`, and its value matches
+    this regex, the object will be made hidden.
+    * modifiersToShow: If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
+    and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made visible in the viewport.
+    * modifiersToHide: If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing`
+    and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made hidden in the viewport.    
+    * collectionsToShow: Collections within the scope and with a name matching this pattern will be shown as a whole, along with
+    all objects in them. An empty string means no collection is shown by name.
+    * collectionsToHide: Collections within the scope and with a name matching this pattern will be hidden as a whole, along with
+    all objects in them. An empty string means no collection is hidden by name.
+    """    
+    
+    def __init__(
+        self,
+        builtIn: bool = True,
+        presetName: str = "", 
+        oShow: str = "", 
+        oHide: str = "", 
+        pName: str = "", 
+        pShow: str = "", 
+        pHide: str = "", 
+        mShow: str = "", 
+        mHide: str = "",
+        cShow: str = "",
+        cHide: str = ""):
+        """Creates a new preset definition.
+
+        Args:
+            builtIn (bool, optional): Tells whether this preset is a built-in or custom one. The name of built-in presets cannot be changed. Built-in presets can be reverted to factory state. Defaults to True.
+            
+            presetName (str, optional): The (unique) name of the preset. If the name is not unique, behavior is up to Blender. It may choose the first object with the same name, but don't take it as granted and don't rely on this assumptions. Defaults to "".
+            
+            oShow (str, optional): Objects within the scope and with a name matching this pattern will be made visible. An empty string means all objects in the scope will be made visible. Defaults to "".
+            
+            oHide (str, optional): Objects within the scope and with a name matching this pattern will be made hidden. An empty string means no objects in the scope will be made hidden. Defaults to "".
+            
+            pName (str, optional): The name of the custom object property governing object visibility. Defaults to "".
+            
+            pShow (str, optional): If an object within the scope has the custom property specified in `propertyName`, and its value matches this regex, the object will be made visible. Defaults to "".
+            
+            pHide (str, optional): If an object within the scope has the custom property specified in `propertyName`, and its value matches this regex, the object will be made hidden. Defaults to "".
+            
+            mShow (str, optional): If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing` and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made visible in the viewport. Defaults to "".
+            
+            mHide (str, optional): If an object is visible within the scope after applying `objectsToShowByName`, `objectsToHideByName`, `propertyValueForShowing` and `propertyValueForHiding`, all of its modifiers with a name matching this regex will be made hidden in the viewport. Defaults to "".
+            
+            cShow (str, optional): Collections within the scope and with a name matching this pattern will be shown as a whole, along with all objects in them, regardless of object rules. An empty string means no collection is shown by name. Defaults to "".
+            
+            cHide (str, optional): Collections within the scope and with a name matching this pattern will be hidden as a whole, along with all objects in them, regardless of object rules. An empty string means no collection is hidden by name. Defaults to "".
+        """
+        # Keep doc strings in one line as VS Code only displays one line of text for an argument
+        
+        self.builtIn = builtIn
+        self.presetName = presetName
+        self.objectsToShowByName = oShow
+        self.objectsToHideByName = oHide
+        self.propertyName = pName
+        self.propertyValueForShowing = pShow
+        self.propertyValueForHiding = pHide
+        self.modifiersToShow = mShow
+        self.modifiersToHide = mHide
+        self.collectionsToShow = cShow
+        self.collectionsToHide = cHide
+
+
+# Built-in presets ################################################################################################################
+
+BUILT_IN_PRESETS = [
+    # Presets with direct reference to lod levels (modifier set for lod n shall not be visible for other lod levels)
+    # Expects lod levels be indicated in the form of #lodn or #lodn-m as trailing parts of names for objects, and #lodn for modifiers
+    PresetDefinition(presetName = "Direct: Lod 0", oShow = "#lod0",                   oHide = "#lod[12345]",                          pName = "Hide at Lod Level",    pShow = "",     pHide = "0",        mShow = "",     mHide = "#lod[12345]"),
+    PresetDefinition(presetName = "Direct: Lod 1", oShow = "#lod.*1|#lod0-",          oHide = "#lod[02345]$|#lod[234]-",              pName = "Hide at Lod Level",    pShow = "",     pHide = "[01]",     mShow = "",     mHide = "#lod[02345]$|#lod[234]-"),
+    PresetDefinition(presetName = "Direct: Lod 2", oShow = "#lod.*2|#lod[01]-[345]",  oHide = "#lod[01345]$|#lod.*-1|#lod[34]-",      pName = "Hide at Lod Level",    pShow = "",     pHide = "[012]",    mShow = "",     mHide = "#lod[01345]$|#lod.*-1|#lod[34]-"),
+    PresetDefinition(presetName = "Direct: Lod 3", oShow = "#lod.*3|#lod[012]-[45]",  oHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-",   pName = "Hide at Lod Level",    pShow = "",     pHide = "[0123]",   mShow = "",     mHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-"),
+    PresetDefinition(presetName = "Direct: Lod 4", oShow = "#lod.*4|#lod[0123]-5",    oHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-",  pName = "Hide at Lod Level",    pShow = "",     pHide = "[01234]",  mShow = "",     mHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-"),
+    PresetDefinition(presetName = "Direct: Lod 5", oShow = "#lod.*5|#lod[01234]-",    oHide = "#lod[01234]$|#lod.*-[01234]",          pName = "Hide at Lod Level",    pShow = "",     pHide = "[012345]", mShow = "",     mHide = "#lod[01234]$|#lod.*-[01234]"),
+    
+    # Presets with cascaded reference to lod levels (modifier set for lod n shall be visible for n and n+ levels)
+    # Expects lod levels be indicated in the form of #lodn or #lodn-m as trailing parts of names for objects, and #lodn for modifiers
+    PresetDefinition(presetName = "Cascaded: Lod 0", oShow = "#lod0",                     oHide = "#lod[12345]$",                         pName = "Hide at Lod Level",    pShow = "",     pHide = "0",        mShow = "",  mHide = "#lod[12345]"),
+    PresetDefinition(presetName = "Cascaded: Lod 1", oShow = "#lod.*1|#lod0-",            oHide = "#lod[02345]$|#lod[234]-",              pName = "Hide at Lod Level",    pShow = "",     pHide = "[01]",     mShow = "",  mHide = "#lod[2345]"),
+    PresetDefinition(presetName = "Cascaded: Lod 2", oShow = "#lod.*2|#lod[01]-[2345]",   oHide = "#lod[01345]$|#lod.*-1|#lod[34]-",      pName = "Hide at Lod Level",    pShow = "",     pHide = "[012]",    mShow = "",  mHide = "#lod[345]"),
+    PresetDefinition(presetName = "Cascaded: Lod 3", oShow = "#lod.*3|#lod[012]-[345]",   oHide = "#lod[01245]$|#lod.*-[012]|#lod[4]-",   pName = "Hide at Lod Level",    pShow = "",     pHide = "[0123]",   mShow = "",  mHide = "#lod[45]"),
+    PresetDefinition(presetName = "Cascaded: Lod 4", oShow = "#lod.*4|#lod[0123]-[45]",   oHide = "#lod[01235]$|#lod.*-[0123]|#lod[4]-",  pName = "Hide at Lod Level",    pShow = "",     pHide = "[01234]",  mShow = "",  mHide = "#lod[5]"),
+    PresetDefinition(presetName = "Cascaded: Lod 5", oShow = "#lod.*5|#lod[01234]-5",     oHide = "#lod[01234]$|#lod.*-[01234]",          pName = "Hide at Lod Level",    pShow = "",     pHide = "[012345]", mShow = "",  mHide = ""),
+]
+"""
+Definitions of the built-in presets in the form of `PresetDefinition`.
+"""
+
+
+# Compiled rule plan ##############################################################################################################
+class RulePlan:
+    """
+    Compiled form of the nine pattern fields of a preset. Patterns are compiled once when the plan is created, so applying a 
+    preset doesn't need to look up each pattern in Python's regex cache for every object and modifier.
+    
+    Pattern fields are stored under the same name as in `T1nkerFocusWizardPreset`, but hold a compiled pattern, or `None` if the
+    pattern is empty in the preset. Name patterns are compiled to `NamePattern`, property value patterns to regexes. The only 
+    exception is `propertyName`, which is kept as a string.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(
+        self, 
+        objectsToShowByName: str = "", 
+        objectsToHideByName: str = "", 
+        propertyName: str = "", 
+        propertyValueForShowing: str = "", 
+        propertyValueForHiding: str = "", 
+        modifiersToShow: str = "", 
+        modifiersToHide: str = "",
+        collectionsToShow: str = "",
+        collectionsToHide: str = ""):
+        """Compiles the patterns of a preset. Raises `re.error` if any of the patterns is not a valid regex.
+
+        Args:
+            objectsToShowByName (str, optional): Name pattern of objects to show. Defaults to "".
+            objectsToHideByName (str, optional): Name pattern of objects to hide. Defaults to "".
+            propertyName (str, optional): The name of the custom object property governing object visibility. Defaults to "".
+            propertyValueForShowing (str, optional): Value pattern of object properties for showing the object. Defaults to "".
+            propertyValueForHiding (str, optional): Value pattern of object properties for hiding the object. Defaults to "".
+            modifiersToShow (str, optional): Name pattern of modifiers to show. Defaults to "".
+            modifiersToHide (str, optional): Name pattern of modifiers to hide. Defaults to "".
+            collectionsToShow (str, optional): Name pattern of collections to show. Defaults to "".
+            collectionsToHide (str, optional): Name pattern of collections to hide. Defaults to "".
+        """
+        
+        self.fields = (
+            objectsToShowByName, 
+            objectsToHideByName, 
+            propertyName, 
+            propertyValueForShowing, 
+            propertyValueForHiding, 
+            modifiersToShow, 
+            modifiersToHide,
+            collectionsToShow,
+            collectionsToHide)
+        """
+        The raw pattern fields the plan was compiled from, in the order used for computing the cache key.
+        """
+        
+        self.objectsToShowByName = _compileNamePattern(objectsToShowByName)
+        self.objectsToHideByName = _compileNamePattern(objectsToHideByName)
+        self.propertyName = propertyName
+        self.propertyValueForShowing = _compileTextPattern(propertyValueForShowing)
+        self.propertyValueForHiding = _compileTextPattern(propertyValueForHiding)
+        self.modifiersToShow = _compileNamePattern(modifiersToShow)
+        self.modifiersToHide = _compileNamePattern(modifiersToHide)
+        self.collectionsToShow = _compileNamePattern(collectionsToShow)
+        self.collectionsToHide = _compileNamePattern(collectionsToHide)
+        
+        self.hasPropertyRules = len(str.strip(propertyName)) > 0
+        """
+        Tells if visibility shall be controlled by custom property values. Mirrors the check `execute` has always done: a property
+        name consisting of whitespace only means no property rules.
+        """
+        
+        self.hasCollectionRules = self.collectionsToShow is not None or self.collectionsToHide is not None
+        """
+        Tells if collections shall be shown or hidden as a whole by name.
+        """
+
+        self.paths = {
+            fieldName: (pattern.path if pattern is not None else None)
+            for fieldName, pattern in (
+                ("objectsToShowByName", self.objectsToShowByName),
+                ("objectsToHideByName", self.objectsToHideByName),
+                ("propertyValueForShowing", self.propertyValueForShowing),
+                ("propertyValueForHiding", self.propertyValueForHiding),
+                ("modifiersToShow", self.modifiersToShow),
+                ("modifiersToHide", self.modifiersToHide),
+                ("collectionsToShow", self.collectionsToShow),
+                ("collectionsToHide", self.collectionsToHide))}
+        """
+        Tells how each pattern field is matched (see the `PATH_*` constants), keyed by field name. `None` for empty fields.
+        """
+
+    # Public functions ============================================================================================================
+    
+    # Decide if an object shall be visible --------------------------------------------------------------------------------------
+    def decideObjectVisibility(self, name: str, propertyValue = None) -> tuple:
+        """Works out the final visibility of an object in one go. Rules are evaluated in the documented order, that is showing 
+        by name, hiding by name, showing by property value and hiding by property value, and the last matching rule wins.
+
+        Args:
+            name (str): The name of the object.
+            propertyValue (optional): The value of the object's custom property named `propertyName`, or `None` if the object 
+            doesn't have such a property. Defaults to None.
+
+        Returns:
+            tuple: A (visible, rule) pair, where `visible` tells if the object shall be visible, and `rule` is one of the `RULE_*`
+            constants telling which rule made the decision.
+        """
+        
+        if self.objectsToShowByName is None:
+            visible, rule = True, RULE_SHOW_ALL
+        elif self.objectsToShowByName.matches(name):
+            visible, rule = True, RULE_SHOW_BY_NAME
+        else:
+            visible, rule = False, RULE_NOT_SHOWN_BY_NAME
+        
+        if self.objectsToHideByName is not None and self.objectsToHideByName.matches(name):
+            visible, rule = False, RULE_HIDE_BY_NAME
+        
+        if self.hasPropertyRules and propertyValue is not None:
+            if self.propertyValueForShowing is not None and _matchValue(self.propertyValueForShowing, propertyValue):
+                visible, rule = True, RULE_SHOW_BY_PROPERTY
+            
+            if self.propertyValueForHiding is not None and _matchValue(self.propertyValueForHiding, propertyValue):
+                visible, rule = False, RULE_HIDE_BY_PROPERTY
+        
+        return visible, rule
+    
+    # Decide if a modifier shall be visible -------------------------------------------------------------------------------------
+    def decideModifierVisibility(self, name: str) -> tuple:
+        """Works out the final viewport visibility of a modifier of a visible object in one go. The hiding pattern overrides the
+        showing pattern.
+
+        Args:
+            name (str): The name of the modifier.
+
+        Returns:
+            tuple: A (visible, rule) pair, where `visible` is the target value of `show_viewport`, and `rule` is one of the 
+            `RULE_*` constants telling which rule made the decision.
+        """
+        
+        if self.modifiersToShow is None:
+            visible, rule = True, RULE_SHOW_ALL_MODIFIERS
+        elif self.modifiersToShow.matches(name):
+            visible, rule = True, RULE_SHOW_MODIFIER
+        else:
+            visible, rule = False, RULE_NOT_SHOWN_MODIFIER
+        
+        if self.modifiersToHide is not None and self.modifiersToHide.matches(name):
+            visible, rule = False, RULE_HIDE_MODIFIER
+        
+        return visible, rule
+    
+    # Decide if a collection shall be shown or hidden -----------------------------------------------------------------------------
+    def decideCollectionVisibility(self, name: str):
+        """Tells if a collection shall be shown or hidden as a whole by its name. Unlike for objects, an empty showing pattern 
+        doesn't show all collections, but leaves collections to object rules. The hiding pattern overrides the showing pattern.
+
+        Args:
+            name (str): The name of the collection.
+
+        Returns:
+            bool: True to show the collection, False to hide it, or `None` if no pattern matches the name.
+        """
+        
+        visible = None
+        
+        if self.collectionsToShow is not None and self.collectionsToShow.matches(name):
+            visible = True
+        
+        if self.collectionsToHide is not None and self.collectionsToHide.matches(name):
+            visible = False
+        
+        return visible
+
+
+# Match a property value ----------------------------------------------------------------------------------------------------------
+def _matchValue(pattern: TextPattern, value) -> bool:
+    """Tells if a custom property value matches a pattern. Values may be of any type, and non-string ones are passed to the regex
+    engine to be handled (that is, rejected) as they have always been.
+
+    Args:
+        pattern (TextPattern): The compiled pattern.
+        value: The value of the property.
+
+    Returns:
+        bool: True if the value matches.
+    """
+    
+    if isinstance(value, str):
+        return pattern.matches(value)
+    
+    return pattern.regex.search(value) is not None
+
+
+# Rule plan cache #################################################################################################################
+
+PLAN_CACHE_SIZE = 64
+"""
+Maximum number of rule plans kept in the cache. Way more than the number of presets anyone uses.
+"""
+
+_planCache: OrderedDict = OrderedDict()
+"""
+Rule plans keyed by the hash of the pattern fields they were compiled from, in least recently used order.
+"""
+
+# Compile a pattern if it's not empty ---------------------------------------------------------------------------------------------
+def _compileTextPattern(pattern: str):
+    """Compiles `pattern` into a `TextPattern`.
+
+    Args:
+        pattern (str): The pattern as specified in the preset.
+
+    Returns:
+        TextPattern: The compiled pattern, or `None` for an empty pattern, which has a meaning of its own for each field.
+    """
+    
+    return TextPattern(pattern) if len(pattern) > 0 else None
+
+# Compile a name pattern if it's not empty ----------------------------------------------------------------------------------------
+def _compileNamePattern(pattern: str):
+    """Compiles `pattern` into a `NamePattern`.
+
+    Args:
+        pattern (str): The pattern as specified in the preset.
+
+    Returns:
+        NamePattern: The compiled pattern, or `None` for an empty pattern, which has a meaning of its own for each field.
+    """
+    
+    return NamePattern(pattern) if len(pattern) > 0 else None
+
+# Get the pattern fields of a preset ----------------------------------------------------------------------------------------------
+def presetFields(preset) -> tuple:
+    """Returns the pattern fields of a preset in the order used to compute the cache key.
+
+    Args:
+        preset: A `T1nkerFocusWizardPreset`, or anything else with the same pattern attributes such as a `PresetDefinition`.
+
+    Returns:
+        tuple: The nine pattern fields.
+    """
+    
+    return (
+        preset.objectsToShowByName,
+        preset.objectsToHideByName,
+        preset.propertyName,
+        preset.propertyValueForShowing,
+        preset.propertyValueForHiding,
+        preset.modifiersToShow,
+        preset.modifiersToHide,
+        preset.collectionsToShow,
+        preset.collectionsToHide)
+
+# Get the compiled rule plan of a preset ------------------------------------------------------------------------------------------
+def getRulePlan(preset) -> RulePlan:
+    """Returns the rule plan of a preset, compiling it only if there's no plan cached for the same patterns.
+
+    Args:
+        preset: A `T1nkerFocusWizardPreset`, or anything else with the same pattern attributes such as a `PresetDefinition`.
+
+    Returns:
+        RulePlan: The compiled rule plan. Raises `re.error` if a pattern is not a valid regex.
+    """
+    
+    fields = presetFields(preset)
+    key = hash(fields)
+    
+    plan = _planCache.get(key)
+    
+    # Compare fields as well, two different sets of patterns may hash to the same value
+    if plan is not None and plan.fields == fields:
+        _planCache.move_to_end(key)
+        return plan
+    
+    plan = RulePlan(*fields)
+    _planCache[key] = plan
+    
+    # Drop the least recently used plan if the cache is full
+    if len(_planCache) > PLAN_CACHE_SIZE:
+        _planCache.popitem(last=False)
+    
+    return plan
+
+# Drop all cached rule plans ------------------------------------------------------------------------------------------------------
+def invalidateRulePlans():
+    """
+    Drops all cached rule plans. Call this when any pattern field of a preset changes.
+    """
+    
+    _planCache.clear()
+
+
+# Object x preset membership index ################################################################################################
+class MembershipIndex:
+    """
+    Tells the visibility of each object in scope under each preset, as one bitmask per object with one bit per preset. The 
+    index is built by evaluating all presets against the scope once, so that switching presets only needs to read bits and touch
+    objects whose bit differs between the old and the new preset.
+    
+    The index is identified by a signature composed of the names of objects in scope and the patterns of all presets, and shall
+    be rebuilt whenever the signature changes.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self):
+        """
+        Creates an empty index which is not valid for any signature.
+        """
+        
+        self.signature = None
+        """
+        The signature the index has been built for.
+        """
+        
+        self.names = []
+        """
+        Names of objects in scope, in the order of `masks`.
+        """
+        
+        self.masks = []
+        """
+        One bitmask per object. Bit n is set if the object shall be visible under the nth preset.
+        """
+        
+        self.positions = {}
+        """
+        Positions of objects in `names` and `masks`, keyed by object name.
+        """
+        
+        self.collectionMasks = None
+        """
+        (decided, shown) bitmask pairs for each object, aligned with `masks`, or `None` if no preset has collection rules. Bit n
+        of `decided` is set if the nth preset decides the visibility of the object by its collections (see 
+        `collectionVisibility.decideCollections`), and bit n of `shown` tells the decision. These bits override object rules.
+        """
+        
+        self.pending = set()
+        """
+        Positions of objects whose bitmask changed since the last time a preset was applied. These objects may not reflect the
+        applied preset, and shall be checked upon the next switch even if their bits are the same for both presets.
+        """
+        
+        self.appliedPreset = -1
+        """
+        Index of the preset last applied to the scope by the help of this index, or -1 if the scope may not reflect any preset.
+        """
+        
+        self.appliedViewLayer = None
+        """
+        The name of the view layer `appliedPreset` has been applied in. Objects may be in any state in other view layers.
+        """
+        
+        self.version = 0
+        """
+        Bumped whenever the index is rebuilt or any bitmask changes, so that visibility worked out from the index can tell if it's
+        stale.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Check if the index can be used ----------------------------------------------------------------------------------------------
+    def isValid(self, signature) -> bool:
+        """Tells if the index is up to date.
+
+        Args:
+            signature: The current signature of the scope and presets.
+
+        Returns:
+            bool: True if the index has been built for `signature`.
+        """
+        
+        return self.signature is not None and self.signature == signature
+    
+    # Evaluate all presets against the scope --------------------------------------------------------------------------------------
+    def rebuild(self, signature, names: list, propertyValues: list, plans: list, masks: list = None, collectionMasks: list = None):
+        """Evaluates all presets against all objects and stores the results.
+
+        Args:
+            signature: The signature of the scope and presets the index is built for.
+            names (list): Names of objects in scope.
+            propertyValues (list): A dictionary for each object in `names`, mapping the names of visibility control properties 
+            carried by the object to their values. 
+            plans (list): The rule plan of each preset, in the order of presets.
+            masks (list, optional): The bitmasks of objects if already worked out elsewhere (like in worker processes by 
+            `parallelEvaluation.membershipMasks`). Worked out here if `None`. Defaults to None.
+            collectionMasks (list, optional): (decided, shown) bitmask pairs of objects telling the decisions of collection rules
+            (see `collectionMasks`), or `None` if no preset has collection rules. Defaults to None.
+        """
+        
+        self.signature = signature
+        self.names = list(names)
+        
+        if masks is None:
+            masks = membershipMasks(names, propertyValues, plans)
+        
+        if collectionMasks is not None:
+            masks = [(mask & ~decided) | shown for mask, (decided, shown) in zip(masks, collectionMasks)]
+        
+        self.masks = list(masks)
+        self.collectionMasks = collectionMasks
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.pending = set()
+        self.appliedPreset = -1
+        self.appliedViewLayer = None
+        self.version += 1
+    
+    # Evaluate all presets against a changed object -------------------------------------------------------------------------------
+    def updateObject(self, name: str, propertyValues: dict, plans: list):
+        """Evaluates all presets against an object whose custom properties might have changed.
+
+        Args:
+            name (str): The name of the object. Objects not in the index are ignored.
+            propertyValues (dict): Maps the names of visibility control properties carried by the object to their values.
+            plans (list): The rule plan of each preset, in the order of presets.
+        """
+        
+        position = self.positions.get(name)
+        
+        if position is None:
+            return
+        
+        mask = _membershipMask(name, propertyValues, plans)
+        
+        if self.collectionMasks is not None:
+            decided, shown = self.collectionMasks[position]
+            mask = (mask & ~decided) | shown
+        
+        if mask != self.masks[position]:
+            self.masks[position] = mask
+            self.pending.add(position)
+            self.version += 1
+    
+    # Record that a preset has been applied ---------------------------------------------------------------------------------------
+    def markApplied(self, preset: int, viewLayerName: str = None):
+        """Records that the visibility of all objects in scope reflects a preset in a view layer.
+
+        Args:
+            preset (int): The index of the preset applied, or -1 if visibility doesn't reflect any preset.
+            viewLayerName (str, optional): The name of the view layer the preset has been applied in. Defaults to None.
+        """
+        
+        self.appliedPreset = preset
+        self.appliedViewLayer = viewLayerName if preset > -1 else None
+        self.pending.clear()
+    
+    # Drop the contents of the index ----------------------------------------------------------------------------------------------
+    def invalidate(self):
+        """
+        Makes the index invalid for any signature, so that it's rebuilt upon next use.
+        """
+        
+        self.signature = None
+        self.names = []
+        self.masks = []
+        self.positions = {}
+        self.collectionMasks = None
+        self.pending = set()
+        self.appliedPreset = -1
+        self.appliedViewLayer = None
+        self.version += 1
+    
+    # Tell the visibility of an object under a preset -----------------------------------------------------------------------------
+    def isVisible(self, position: int, preset: int) -> bool:
+        """Tells if an object shall be visible under a preset.
+
+        Args:
+            position (int): The position of the object in `names`.
+            preset (int): The index of the preset.
+
+        Returns:
+            bool: True if the object shall be visible.
+        """
+        
+        return (self.masks[position] >> preset) & 1 == 1
+    
+    # Find objects affected by switching presets ----------------------------------------------------------------------------------
+    def changedPositions(self, oldPreset: int, newPreset: int) -> list:
+        """Finds objects whose visibility differs between two presets.
+
+        Args:
+            oldPreset (int): The index of the preset currently applied.
+            newPreset (int): The index of the preset to apply.
+
+        Returns:
+            list: Positions of objects in `names` with different bits for the two presets, as well as positions of objects whose
+            bits changed since `oldPreset` has been applied.
+        """
+        
+        difference = (1 << oldPreset) | (1 << newPreset)
+        
+        return [
+            position for position, mask in enumerate(self.masks) 
+            if (mask & difference != 0 and mask & difference != difference) or position in self.pending
+        ]
+
+
+# Evaluate all presets against objects --------------------------------------------------------------------------------------------
+def membershipMasks(names: list, propertyValues: list, plans: list) -> list:
+    """Evaluates all presets against objects, to build a `MembershipIndex` from. Objects can be evaluated part by part, as the 
+    masks of an object don't depend on other objects.
+
+    Args:
+        names (list): Names of objects.
+        propertyValues (list): A dictionary for each object in `names`, mapping the names of visibility control properties 
+        carried by the object to their values.
+        plans (list): The rule plan of each preset, in the order of presets.
+
+    Returns:
+        list: One bitmask per object, with bit n set if the object shall be visible under the nth preset.
+    """
+    
+    return [_membershipMask(name, values, plans) for name, values in zip(names, propertyValues)]
+
+# Compute the membership bitmask of an object -------------------------------------------------------------------------------------
+def _membershipMask(name: str, propertyValues: dict, plans: list) -> int:
+    """Evaluates all presets against an object.
+
+    Args:
+        name (str): The name of the object.
+        propertyValues (dict): Maps the names of visibility control properties carried by the object to their values.
+        plans (list): The rule plan of each preset, in the order of presets.
+
+    Returns:
+        int: A bitmask with bit n set if the object shall be visible under the nth preset.
+    """
+    
+    mask = 0
+    
+    for bit, plan in enumerate(plans):
+        propertyValue = propertyValues.get(plan.propertyName) if plan.hasPropertyRules else None
+        visible, _ = plan.decideObjectVisibility(name, propertyValue)
+        
+        if visible:
+            mask |= 1 << bit
+    
+    return mask
+
+
+# Custom property value index #####################################################################################################
+class PropertyIndex:
+    """
+    Values of visibility control properties, keyed by property name and then by object name. Only objects actually carrying a 
+    property are listed for it, so rules based on property values only need to look at those objects. 
+    
+    The index is built in one pass over the objects, and then kept up to date by updating objects changed one by one. It shall be 
+    rebuilt when its signature, composed of the scope and the names of properties presets use, changes.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self):
+        """
+        Creates an empty index which is not valid for any signature.
+        """
+        
+        self.signature = None
+        """
+        The signature the index has been built for.
+        """
+        
+        self.propertyNames = frozenset()
+        """
+        The names of properties indexed.
+        """
+        
+        self.values = {}
+        """
+        Property values keyed by property name, each being a dictionary mapping names of objects carrying the property to values.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Check if the index can be used ----------------------------------------------------------------------------------------------
+    def isValid(self, signature) -> bool:
+        """Tells if the index has been built for a signature.
+
+        Args:
+            signature: The current signature of the scope and property names.
+
+        Returns:
+            bool: True if the index has been built for `signature`.
+        """
+        
+        return self.signature is not None and self.signature == signature
+    
+    # Build the index -------------------------------------------------------------------------------------------------------------
+    def rebuild(self, signature, propertyNames: frozenset, objects):
+        """Builds the index from scratch.
+
+        Args:
+            signature: The signature of the scope and property names the index is built for.
+            propertyNames (frozenset): The names of properties to index.
+            objects: An iterable of (name, values) pairs, where `values` maps the names of properties in `propertyNames` carried by 
+            the object to their values.
+        """
+        
+        self.signature = signature
+        self.propertyNames = propertyNames
+        self.values = {propName: {} for propName in propertyNames}
+        
+        for name, values in objects:
+            for propName, value in values.items():
+                self.values[propName][name] = value
+    
+    # Update a changed object -----------------------------------------------------------------------------------------------------
+    def updateObject(self, name: str, values: dict):
+        """Updates the values of properties for an object which has been added or changed.
+
+        Args:
+            name (str): The name of the object.
+            values (dict): Maps the names of properties in `propertyNames` carried by the object to their values.
+        """
+        
+        for propName, carriers in self.values.items():
+            if propName in values:
+                carriers[name] = values[propName]
+            else:
+                carriers.pop(name, None)
+    
+    # Drop the contents of the index ----------------------------------------------------------------------------------------------
+    def invalidate(self):
+        """
+        Makes the index invalid for any signature, so that it's rebuilt upon next use.
+        """
+        
+        self.signature = None
+        self.propertyNames = frozenset()
+        self.values = {}
+    
+    # Get the value of a property of an object ------------------------------------------------------------------------------------
+    def valueOf(self, propertyName: str, name: str):
+        """Returns the value of a property of an object.
+
+        Args:
+            propertyName (str): The name of the property.
+            name (str): The name of the object.
+
+        Returns:
+            The value of the property, or `None` if the object doesn't carry the property, or the property is not indexed.
+        """
+        
+        carriers = self.values.get(propertyName)
+        
+        return None if carriers is None else carriers.get(name)
+    
+    # Get the values of all properties of an object -------------------------------------------------------------------------------
+    def valuesOf(self, name: str) -> dict:
+        """Returns the values of all indexed properties an object carries.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            dict: Values keyed by property name.
+        """
+        
+        return {propName: carriers[name] for propName, carriers in self.values.items() if name in carriers}
+
+
+# Snapshot of objects #############################################################################################################
+class Snapshot:
+    """
+    What the rule engine needs to know about objects in scope, extracted from Blender in one go, so that presets can be evaluated 
+    (and profiled, and tested) without Blender. Lists are aligned, that is, the i-th item of each list belongs to the same object.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(
+        self, 
+        names: list, 
+        propertyValues: list = None, 
+        modifierNames: list = None, 
+        hidden: list = None, 
+        modifierShown: list = None):
+        """Creates a snapshot.
+
+        Args:
+            names (list): The names of objects.
+            propertyValues (list, optional): Dictionaries with the values of custom properties of objects, keyed by property name. 
+            Objects not carrying properties may have `None` instead of an empty dictionary. Defaults to None, meaning no object 
+            has properties.
+            modifierNames (list, optional): Tuples with the names of modifiers of objects. Defaults to None, meaning no object has 
+            modifiers.
+            hidden (list, optional): Tells if objects are currently hidden. Only needed to tell what a plan would change. Defaults 
+            to None, meaning unknown.
+            modifierShown (list, optional): Tuples with the current value of `show_viewport` of modifiers of objects. Only needed 
+            to tell what a plan would change. Defaults to None, meaning unknown.
+        """
+        
+        self.names = list(names)
+        """
+        The names of objects.
+        """
+        
+        self.propertyValues = list(propertyValues) if propertyValues is not None else [None] * len(self.names)
+        """
+        Dictionaries with the values of custom properties of objects, or `None` for objects without properties.
+        """
+        
+        self.modifierNames = list(modifierNames) if modifierNames is not None else [()] * len(self.names)
+        """
+        Tuples with the names of modifiers of objects.
+        """
+        
+        self.hidden = list(hidden) if hidden is not None else None
+        """
+        Tells if objects are currently hidden, or `None` if unknown.
+        """
+        
+        self.modifierShown = list(modifierShown) if modifierShown is not None else None
+        """
+        Tuples with the current value of `show_viewport` of modifiers of objects, or `None` if unknown.
+        """
+    
+    # Get the number of objects ---------------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        """Returns the number of objects in the snapshot.
+
+        Returns:
+            int: The number of objects.
+        """
+        
+        return len(self.names)
+    
+    # Take a part of the snapshot -------------------------------------------------------------------------------------------------
+    def slice(self, start: int, end: int):
+        """Returns the objects of a range of the snapshot as a snapshot of their own, so that a preset can be evaluated part by 
+        part.
+
+        Args:
+            start (int): The position of the first object to take.
+            end (int): The position after the last object to take.
+
+        Returns:
+            Snapshot: The snapshot of the objects in the range.
+        """
+        
+        return Snapshot(
+            self.names[start:end],
+            self.propertyValues[start:end],
+            self.modifierNames[start:end],
+            self.hidden[start:end] if self.hidden is not None else None,
+            self.modifierShown[start:end] if self.modifierShown is not None else None)
+
+
+# Visibility plan #################################################################################################################
+class VisibilityPlan:
+    """
+    The result of evaluating a preset on a snapshot: the target visibility of each object and each of its modifiers, and the rules
+    deciding them. Lists are aligned with the lists of the snapshot.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self):
+        """Creates an empty plan.
+        """
+        
+        self.objectVisible = []
+        """
+        Tells if objects shall be visible.
+        """
+        
+        self.objectRules = []
+        """
+        The rules (`RULE_*` constants) deciding the visibility of objects.
+        """
+        
+        self.modifierVisible = []
+        """
+        Tuples with the target value of `show_viewport` of the modifiers of objects. Modifiers are processed for visible objects 
+        only, but whether an object is actually visible also depends on things out of the scope of the snapshot (like the 
+        visibility of its collections), so this is worked out for all objects, and it's up to the caller to skip hidden ones.
+        """
+        
+        self.modifierRules = []
+        """
+        Tuples with the rules (`RULE_*` constants) deciding the visibility of modifiers of objects.
+        """
+        
+        self.patternMatches = 0
+        """
+        The number of times a name or value was matched against a pattern while working out the plan (whether the regex engine 
+        was run or the match was answered by one of the faster paths).
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Count visible objects -------------------------------------------------------------------------------------------------------
+    def visibleCount(self) -> int:
+        """Counts the objects to be made visible.
+
+        Returns:
+            int: The number of objects to be visible.
+        """
+        
+        return sum(self.objectVisible)
+    
+    # Append the plan of more objects ---------------------------------------------------------------------------------------------
+    def extend(self, other):
+        """Appends the plan worked out for the objects following those in this plan, like for the next part of a snapshot (see
+        `Snapshot.slice`).
+
+        Args:
+            other (VisibilityPlan): The plan to append.
+        """
+        
+        self.objectVisible.extend(other.objectVisible)
+        self.objectRules.extend(other.objectRules)
+        self.modifierVisible.extend(other.modifierVisible)
+        self.modifierRules.extend(other.modifierRules)
+        self.patternMatches += other.patternMatches
+
+
+# Evaluate a preset on a snapshot -------------------------------------------------------------------------------------------------
+def evaluate(
+    snapshot: Snapshot, preset, objects: bool = True, modifiers: bool = True, collectionVerdicts: list = None, 
+    modifierDecisions: dict = None) -> VisibilityPlan:
+    """Works out the target visibility of objects and modifiers in a snapshot under a preset. Doesn't need Blender. Raises 
+    `re.error` if a pattern of the preset is invalid.
+
+    Args:
+        snapshot (Snapshot): The objects to evaluate the preset for.
+        preset: A `PresetDefinition`, a `T1nkerFocusWizardPreset`, or a `RulePlan` compiled from either.
+        objects (bool, optional): Set to False to skip working out the visibility of objects, when it's known from elsewhere 
+        (like the membership index). The object lists of the plan are left empty then. Defaults to True.
+        modifiers (bool, optional): Set to False to skip working out the visibility of modifiers. The modifier lists of the plan
+        are left empty then. Defaults to True.
+        collectionVerdicts (list, optional): The visibility of objects decided by collection rules, aligned with the snapshot, 
+        with `None` for objects left to object rules (see `collectionVisibility.decideCollections`). Objects decided by 
+        collections are not checked against object rules. Defaults to None, meaning no object is decided by collections.
+        modifierDecisions (dict, optional): Decisions already made for modifier names, keyed by name, to be reused and extended 
+        when evaluating a snapshot part by part (see `Snapshot.slice`). Defaults to None, meaning a new dictionary.
+
+    Returns:
+        VisibilityPlan: The target visibility of objects and modifiers.
+    """
+    
+    plan = preset if isinstance(preset, RulePlan) else getRulePlan(preset)
+    result = VisibilityPlan()
+    
+    if objects:
+        propName = plan.propertyName
+        namePatterns = (plan.objectsToShowByName is not None) + (plan.objectsToHideByName is not None)
+        valuePatterns = (plan.propertyValueForShowing is not None) + (plan.propertyValueForHiding is not None)
+        
+        for position, (name, values) in enumerate(zip(snapshot.names, snapshot.propertyValues)):
+            verdict = collectionVerdicts[position] if collectionVerdicts is not None else None
+            
+            if verdict is not None:
+                result.objectVisible.append(verdict)
+                result.objectRules.append(RULE_SHOW_BY_COLLECTION if verdict else RULE_HIDE_BY_COLLECTION)
+                continue
+            
+            propertyValue = values.get(propName) if plan.hasPropertyRules and values else None
+            visible, rule = plan.decideObjectVisibility(name, propertyValue)
+            
+            result.patternMatches += namePatterns if propertyValue is None else namePatterns + valuePatterns
+            
+            result.objectVisible.append(visible)
+            result.objectRules.append(rule)
+    
+    if modifiers:
+        # Objects share a few modifier names (like the ones Blender gives by default), so decide each distinct name only once
+        if modifierDecisions is None:
+            modifierDecisions = {}
+        
+        modifierPatterns = (plan.modifiersToShow is not None) + (plan.modifiersToHide is not None)
+        
+        for modifierNames in snapshot.modifierNames:
+            decisions = []
+            
+            for modifierName in modifierNames:
+                decision = modifierDecisions.get(modifierName)
+                
+                if decision is None:
+                    decision = plan.decideModifierVisibility(modifierName)
+                    modifierDecisions[modifierName] = decision
+                    result.patternMatches += modifierPatterns
+                
+                decisions.append(decision)
+            
+            result.modifierVisible.append(tuple(decision[0] for decision in decisions))
+            result.modifierRules.append(tuple(decision[1] for decision in decisions))
+    
+    return result
@@ -0,0 +1,260 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains the buffered, leveled log of applying presets.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from collections import deque
+import sys
+
+
+# Log levels ######################################################################################################################
+
+LEVEL_ERROR = 40
+"""
+Errors, always shown.
+"""
+
+LEVEL_WARNING = 30
+"""
+Things worth attention, always shown.
+"""
+
+LEVEL_INFO = 20
+"""
+What's done, shown by default.
+"""
+
+LEVEL_DEBUG = 10
+"""
+Details of what's checked and why, shown in verbose mode.
+"""
+
+BUFFER_SIZE = 50000
+"""
+The maximum number of lines kept in the buffer. When exceeded, the oldest lines are dropped.
+"""
+
+
+# Buffered log ####################################################################################################################
+class RunLog:
+    """
+    A log of a run of applying a preset. Messages take arguments like `logging` does, and are only formatted if their level is 
+    enabled. Lines are collected in a ring buffer and written in one go by `flush`, as Blender's console is slow to write to line 
+    by line. Messages about individual objects and modifiers (details) are capped, so that verbose runs on huge scenes don't 
+    produce more lines than anyone could read.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, level: int = LEVEL_INFO, detailLimit: int = 0, capacity: int = BUFFER_SIZE):
+        """Creates an empty log.
+
+        Args:
+            level (int, optional): The lowest level of messages to log, one of the `LEVEL_*` constants. Defaults to LEVEL_INFO.
+            detailLimit (int, optional): The maximum number of detail lines to log. 0 means no limit. Defaults to 0.
+            capacity (int, optional): The maximum number of lines kept in the buffer. Defaults to BUFFER_SIZE.
+        """
+        
+        self.level = level
+        """
+        The lowest level of messages to log.
+        """
+        
+        self.detailLimit = detailLimit
+        """
+        The maximum number of detail lines to log. 0 means no limit.
+        """
+        
+        self.lines = deque(maxlen=capacity)
+        """
+        The lines logged and not yet flushed. 
+        """
+        
+        self.lineCount = 0
+        """
+        The number of lines logged since the last flush, including those dropped from the buffer.
+        """
+        
+        self.detailCount = 0
+        """
+        The number of detail lines logged.
+        """
+        
+        self.suppressedDetails = 0
+        """
+        The number of detail lines not logged because of `detailLimit`.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Check if a level is enabled -------------------------------------------------------------------------------------------------
+    def isEnabled(self, level: int) -> bool:
+        """Tells if messages of a level are logged. Use it to skip collecting arguments which are expensive to get.
+
+        Args:
+            level (int): One of the `LEVEL_*` constants.
+
+        Returns:
+            bool: True if messages of the level are logged.
+        """
+        
+        return level >= self.level
+    
+    # Log a message ---------------------------------------------------------------------------------------------------------------
+    def log(self, level: int, message: str, *args):
+        """Logs a message if its level is enabled.
+
+        Args:
+            level (int): One of the `LEVEL_*` constants.
+            message (str): The message, with %-style placeholders for `args`.
+            args: Arguments of the message.
+        """
+        
+        if level < self.level:
+            return
+        
+        self.lines.append(message % args if args else message)
+        self.lineCount += 1
+    
+    # Log an error ----------------------------------------------------------------------------------------------------------------
+    def error(self, message: str, *args):
+        """Logs an error. See `log`.
+        """
+        
+        self.log(LEVEL_ERROR, message, *args)
+    
+    # Log a warning ---------------------------------------------------------------------------------------------------------------
+    def warning(self, message: str, *args):
+        """Logs a warning. See `log`.
+        """
+        
+        self.log(LEVEL_WARNING, message, *args)
+    
+    # Log information -------------------------------------------------------------------------------------------------------------
+    def info(self, message: str, *args):
+        """Logs information. See `log`.
+        """
+        
+        self.log(LEVEL_INFO, message, *args)
+    
+    # Log a debug message ---------------------------------------------------------------------------------------------------------
+    def debug(self, message: str, *args):
+        """Logs a debug message. See `log`.
+        """
+        
+        self.log(LEVEL_DEBUG, message, *args)
+    
+    # Log a detail ----------------------------------------------------------------------------------------------------------------
+    def detail(self, level: int, message: str, *args):
+        """Logs a message about an individual object or modifier, unless `detailLimit` lines have already been logged. See `log`.
+        """
+        
+        if level < self.level:
+            return
+        
+        if self.detailLimit > 0 and self.detailCount >= self.detailLimit:
+            self.suppressedDetails += 1
+            return
+        
+        self.detailCount += 1
+        self.log(level, message, *args)
+    
+    # Summarize the log -----------------------------------------------------------------------------------------------------------
+    def summary(self) -> str:
+        """Tells how many lines were logged, and how many were left out.
+
+        Returns:
+            str: The summary line.
+        """
+        
+        summary = f"{self.lineCount} lines logged"
+        
+        if self.suppressedDetails > 0:
+            summary += f", {self.suppressedDetails} lines on objects and modifiers left out over the limit of {self.detailLimit}"
+        
+        dropped = self.lineCount - len(self.lines)
+        
+        if dropped > 0:
+            summary += f", {dropped} oldest lines dropped from the buffer"
+        
+        return summary
+    
+    # Write the log ---------------------------------------------------------------------------------------------------------------
+    def flush(self, path: str = ""):
+        """Writes the lines logged and a summary line in one go, and empties the buffer.
+
+        Args:
+            path (str, optional): The path of a file to append the lines to. The console (standard output) if empty. Defaults to
+            "".
+        """
+        
+        text = "\n".join(self.lines) + "\n" + self.summary() + "\n"
+        
+        if len(path) > 0:
+            with open(path, "a") as logFile:
+                logFile.write(text)
+        else:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        
+        self.lines.clear()
+        self.lineCount = 0
+        self.detailCount = 0
+        self.suppressedDetails = 0
@@ -0,0 +1,273 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains capturing and restoring the visibility and selection state of objects and modifiers.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+
+# State of objects and modifiers ##################################################################################################
+class SceneState:
+    """
+    The visibility and selection state of objects, captured before changing anything (in one pass or part by part), and the 
+    original state of modifiers changed since. States of objects are stored as flags in byte arrays aligned with the list of 
+    objects, so capturing and restoring are O(n), and only objects whose state actually differs are written when restoring. 
+    Modifiers are recorded when they are about to be changed (see `noteModifier`), so restoring them only touches those changed.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, objects: list, viewLayer, isCapturingNow: bool = True):
+        """Captures the state of objects.
+
+        Args:
+            objects (list): The objects whose state to capture.
+            viewLayer (bpy.types.ViewLayer): The view layer to capture visibility and selection in.
+            isCapturingNow (bool, optional): False to only capture the active object now, and let the caller capture objects
+            part by part by calling `capture`. Defaults to True.
+        """
+        
+        self.objects = objects
+        """
+        The objects whose state is captured.
+        """
+        
+        self.viewLayer = viewLayer
+        """
+        The view layer the state is captured in.
+        """
+        
+        self.hidden = bytearray()
+        """
+        Tells if objects were hidden, aligned with `objects`. Objects not captured yet are missing from the end, and left alone 
+        when restoring.
+        """
+        
+        self.selected = bytearray()
+        """
+        Tells if objects were selected, aligned with `objects`. Objects not captured yet are missing from the end, and left alone 
+        when restoring.
+        """
+        
+        self.activeObject = viewLayer.objects.active
+        """
+        The object which was active.
+        """
+        
+        self.modifiers = {}
+        """
+        The original `show_viewport` of modifiers changed, keyed by modifier.
+        """
+        
+        self.collections = {}
+        """
+        The original values of flags of collections and layer collections changed, keyed by (collection, flag name) tuples.
+        """
+        
+        self.flags = {}
+        """
+        The original values of flags set in bulk, keyed by flag name, as tuples of the collection and the values.
+        """
+        
+        if isCapturingNow:
+            self.capture(len(objects))
+    
+    # Public functions ============================================================================================================
+    
+    # Capture the state of more objects -------------------------------------------------------------------------------------------
+    def capture(self, count: int):
+        """Captures the state of the next objects not captured yet.
+
+        Args:
+            count (int): The number of objects to capture.
+        """
+        
+        start = len(self.hidden)
+        objects = self.objects[start:start + count]
+        viewLayer = self.viewLayer
+        
+        self.hidden.extend(obj.hide_get(view_layer=viewLayer) for obj in objects)
+        self.selected.extend(obj.select_get(view_layer=viewLayer) for obj in objects)
+    
+    # Note a modifier about to be changed -----------------------------------------------------------------------------------------
+    def noteModifier(self, modifier):
+        """Records the original state of a modifier about to be changed. Only the first call for a modifier counts.
+
+        Args:
+            modifier (bpy.types.Modifier): The modifier.
+        """
+        
+        self.modifiers.setdefault(modifier, modifier.show_viewport)
+    
+    # Note a flag of a collection about to be changed -----------------------------------------------------------------------------
+    def noteCollection(self, collection, flag: str):
+        """Records the original value of a flag of a collection or layer collection about to be changed. Only the first call for
+        a flag of a collection counts.
+
+        Args:
+            collection (bpy.types.Collection | bpy.types.LayerCollection): The collection.
+            flag (str): The name of the flag, such as `hide_viewport`.
+        """
+        
+        self.collections.setdefault((collection, flag), getattr(collection, flag))
+    
+    # Note flags about to be set in bulk ------------------------------------------------------------------------------------------
+    def noteFlags(self, collection, flag: str, values):
+        """Records the original values of a flag of all objects in a collection, about to be set in bulk by `foreach_set`. Only 
+        the first call for a flag counts.
+
+        Args:
+            collection (bpy.types.bpy_prop_collection): The collection of objects.
+            flag (str): The name of the flag, such as `hide_viewport`.
+            values (sequence): The original values, aligned with `collection`. Shall not be changed later.
+        """
+        
+        self.flags.setdefault(flag, (collection, values))
+    
+    # Restore visibility of objects -----------------------------------------------------------------------------------------------
+    def restoreVisibility(self) -> int:
+        """Restores the visibility of objects whose visibility changed.
+
+        Returns:
+            int: The number of objects restored.
+        """
+        
+        viewLayer = self.viewLayer
+        restored = 0
+        
+        for obj, hidden in zip(self.objects, self.hidden):
+            if obj.hide_get(view_layer=viewLayer) != hidden:
+                obj.hide_set(bool(hidden), view_layer=viewLayer)
+                restored += 1
+        
+        return restored
+    
+    # Restore flags of collections ------------------------------------------------------------------------------------------------
+    def restoreCollections(self) -> int:
+        """Restores the flags of collections and layer collections changed.
+
+        Returns:
+            int: The number of flags restored.
+        """
+        
+        restored = 0
+        
+        for (collection, flag), value in self.collections.items():
+            if getattr(collection, flag) != value:
+                setattr(collection, flag, value)
+                restored += 1
+        
+        self.collections.clear()
+        
+        return restored
+    
+    # Restore flags set in bulk ---------------------------------------------------------------------------------------------------
+    def restoreFlags(self) -> int:
+        """Restores the flags set in bulk, by one `foreach_set` call per flag.
+
+        Returns:
+            int: The number of `foreach_set` calls made.
+        """
+        
+        for flag, (collection, values) in self.flags.items():
+            collection.foreach_set(flag, values)
+        
+        restored = len(self.flags)
+        self.flags.clear()
+        
+        return restored
+    
+    # Restore modifiers -----------------------------------------------------------------------------------------------------------
+    def restoreModifiers(self) -> int:
+        """Restores the viewport visibility of modifiers changed.
+
+        Returns:
+            int: The number of modifiers restored.
+        """
+        
+        restored = 0
+        
+        for modifier, shown in self.modifiers.items():
+            if modifier.show_viewport != shown:
+                modifier.show_viewport = shown
+                restored += 1
+        
+        self.modifiers.clear()
+        
+        return restored
+    
+    # Restore selection -----------------------------------------------------------------------------------------------------------
+    def restoreSelection(self) -> int:
+        """Restores the selection of objects whose selection changed, and the active object.
+
+        Returns:
+            int: The number of objects restored.
+        """
+        
+        viewLayer = self.viewLayer
+        restored = 0
+        
+        for obj, selected in zip(self.objects, self.selected):
+            if obj.select_get(view_layer=viewLayer) != selected:
+                obj.select_set(bool(selected), view_layer=viewLayer)
+                restored += 1
+        
+        if viewLayer.objects.active != self.activeObject:
+            viewLayer.objects.active = self.activeObject
+        
+        return restored
@@ -0,0 +1,315 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains resolving the objects in scope, cached until the collection hierarchy changes.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import bpy
+from . import changeTracker
+
+
+# Objects in scope ################################################################################################################
+class Scope:
+    """
+    The objects in scope, that is, objects in the root collections and their sub-collections, except for excluded 
+    sub-collections, optionally filtered by object type. Objects are in the order of a depth-first walk of collections, and each
+    object is listed once even if linked to more collections.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, key: tuple, roots: list, excluded: frozenset, objects: list):
+        """Creates a scope.
+
+        Args:
+            key (tuple): Identifies the settings the scope is resolved for, see `resolve`.
+            roots (list): The root collections, none of which is under another.
+            excluded (frozenset): Names of collections excluded along with their sub-collections.
+            objects (list): The objects in scope.
+        """
+        
+        self.key = key
+        """
+        Identifies the settings the scope is resolved for: the names of root collections, the names of excluded collections, and
+        the object types allowed. Stays the same as long as these settings do, even if the scope is resolved again.
+        """
+        
+        self.roots = roots
+        """
+        The root collections.
+        """
+        
+        self.excluded = excluded
+        """
+        Names of collections excluded along with their sub-collections.
+        """
+        
+        self.objects = objects
+        """
+        The objects in scope.
+        """
+        
+        self.positions = {obj.name: position for position, obj in enumerate(objects)}
+        """
+        Positions of objects in `objects`, keyed by object name.
+        """
+        
+        self._dataPositions = None
+        """
+        Positions of objects in scope in `bpy.data.objects`, aligned with `objects`, built upon first use.
+        """
+        
+        self._dataCount = -1
+        """
+        The number of objects in `bpy.data.objects` when `_dataPositions` was built.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Get the number of objects in scope ------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        """Returns the number of objects in scope.
+
+        Returns:
+            int: The number of objects.
+        """
+        
+        return len(self.objects)
+    
+    # Get the positions of objects among all objects ------------------------------------------------------------------------------
+    def dataPositions(self, dataObjects) -> list:
+        """Returns the positions of objects in scope in `bpy.data.objects`, so that flags of objects in scope can be set in bulk 
+        by `foreach_set` on `bpy.data.objects`. The order of `bpy.data.objects` only changes when objects are added, removed or 
+        renamed, which also makes the scope resolved again.
+
+        Args:
+            dataObjects (bpy.types.BlendDataObjects): `bpy.data.objects`.
+
+        Returns:
+            list: Positions in `dataObjects`, aligned with `objects`.
+        """
+        
+        if self._dataPositions is None or self._dataCount != len(dataObjects):
+            self._dataPositions = [0] * len(self.objects)
+            
+            for dataPosition, obj in enumerate(dataObjects):
+                position = self.positions.get(obj.name)
+                
+                if position is not None:
+                    self._dataPositions[position] = dataPosition
+            
+            self._dataCount = len(dataObjects)
+        
+        return self._dataPositions
+    
+    # Get selected objects in scope -----------------------------------------------------------------------------------------------
+    def selectedObjects(self, viewLayer) -> list:
+        """Returns the objects in scope selected in a view layer, going through the selected objects only, instead of checking 
+        each object in scope.
+
+        Args:
+            viewLayer (bpy.types.ViewLayer): The view layer.
+
+        Returns:
+            list: The objects.
+        """
+        
+        return [obj for obj in viewLayer.objects.selected if obj.name in self.positions]
+    
+    # Get collections in scope ----------------------------------------------------------------------------------------------------
+    def collections(self) -> list:
+        """Returns the collections under the root collections, except for excluded collections and their sub-collections. Root 
+        collections are not included.
+
+        Returns:
+            list: The collections, each listed once.
+        """
+        
+        found = []
+        seen = set()
+        pending = [child for root in self.roots for child in root.children]
+        
+        while len(pending) > 0:
+            collection = pending.pop()
+            
+            if collection.name in self.excluded or collection.name in seen:
+                continue
+            
+            seen.add(collection.name)
+            found.append(collection)
+            pending.extend(collection.children)
+        
+        return found
+
+
+# Resolving the scope #############################################################################################################
+
+_scope = None
+"""
+The scope resolved last.
+"""
+
+_scopeGeneration = -1
+"""
+The `changeTracker.structureGeneration` `_scope` has been resolved at.
+"""
+
+_objectCount = -1
+"""
+The number of objects in `bpy.data.objects` when `_scope` has been resolved. Deleting objects doesn't always bump 
+`changeTracker.structureGeneration`, but changes this number.
+"""
+
+# Resolve the scope ---------------------------------------------------------------------------------------------------------------
+def resolve(settings) -> Scope:
+    """Returns the objects in scope according to the settings. The scope is only resolved again if the settings defining it 
+    changed, the collection hierarchy may have changed since (see `changeTracker.structureGeneration`), or objects have been 
+    added or removed, so it can be asked for as often as needed. Objects removed in ways going unnoticed here are only found 
+    out upon touching them, which raises `ReferenceError`, so call `invalidate` and resolve the scope again then.
+
+    Args:
+        settings (presetManager.T1nkerFocusWizardSettings): The settings of the add-on.
+
+    Returns:
+        Scope: The scope, or `None` if no root collection is selected.
+    """
+    
+    global _scope, _scopeGeneration, _objectCount
+    
+    if settings.rootCollection is None:
+        return None
+    
+    roots = [settings.rootCollection]
+    
+    for reference in settings.additionalRootCollections:
+        if reference.collection is not None and reference.collection not in roots:
+            roots.append(reference.collection)
+    
+    excluded = frozenset(
+        reference.collection.name for reference in settings.excludedCollections if reference.collection is not None)
+    objectTypes = frozenset(settings.objectTypes)
+    key = (tuple(root.name for root in roots), excluded, objectTypes)
+    
+    if (_scope is not None 
+        and _scope.key == key 
+        and _scopeGeneration == changeTracker.structureGeneration
+        and _objectCount == len(bpy.data.objects)
+        and _isAlive(_scope.roots)):
+        return _scope
+    
+    objects = []
+    seen = set()
+    visited = set()
+    pending = list(reversed(roots))
+    
+    while len(pending) > 0:
+        collection = pending.pop()
+        
+        if collection.name in excluded or collection.name in visited:
+            continue
+        
+        visited.add(collection.name)
+        
+        for obj in collection.objects:
+            if obj.name not in seen and (len(objectTypes) == 0 or obj.type in objectTypes):
+                seen.add(obj.name)
+                objects.append(obj)
+        
+        pending.extend(reversed(collection.children))
+    
+    _scope = Scope(key, roots, excluded, objects)
+    
+    # Roots under other roots are in scope anyway, and shall not be treated as roots when hiding collections
+    if len(roots) > 1:
+        nested = {collection.name for collection in _scope.collections()}
+        _scope.roots = [root for root in roots if root.name not in nested]
+    
+    _scopeGeneration = changeTracker.structureGeneration
+    _objectCount = len(bpy.data.objects)
+    
+    return _scope
+
+# Tell if collections still exist -------------------------------------------------------------------------------------------------
+def _isAlive(collections: list) -> bool:
+    """Tells if collections referred to still exist, that is, if they have not been removed since they were looked up.
+
+    Args:
+        collections (list): The collections.
+
+    Returns:
+        bool: True if all of them exist.
+    """
+    
+    try:
+        for collection in collections:
+            collection.name
+    except ReferenceError:
+        return False
+    
+    return True
+
+# Forget the scope ----------------------------------------------------------------------------------------------------------------
+def invalidate():
+    """
+    Forgets the scope resolved, so that it's resolved again upon next use.
+    """
+    
+    global _scope
+    
+    _scope = None
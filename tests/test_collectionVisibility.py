@@ -0,0 +1,234 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This file tests working out which collections to hide and show as a whole.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+from types import SimpleNamespace
+
+import collectionVisibility
+
+
+# Plain stand-ins of Blender data #################################################################################################
+
+# Collection ----------------------------------------------------------------------------------------------------------------------
+class Collection:
+    """
+    What the module reads of a `bpy.types.Collection`.
+    """
+    
+    def __init__(self, name: str, objectNames: tuple = (), children: tuple = ()):
+        """Creates a collection.
+        
+        Args:
+            name (str): The name of the collection.
+            objectNames (tuple, optional): The names of objects directly in the collection. Defaults to ().
+            children (tuple, optional): Child collections. Defaults to ().
+        """
+        
+        self.name = name
+        self.objects = [SimpleNamespace(name=objectName) for objectName in objectNames]
+        self.children = list(children)
+    
+    @property
+    def all_objects(self) -> list:
+        """
+        Objects in the collection and its sub-collections.
+        """
+        
+        return self.objects + [obj for child in self.children for obj in child.all_objects]
+
+# Layer collection ----------------------------------------------------------------------------------------------------------------
+class LayerCollection:
+    """
+    What the module reads of a `bpy.types.LayerCollection`, created for a collection and its sub-tree.
+    """
+    
+    def __init__(self, collection: Collection):
+        """Creates the layer collections of a collection and its sub-tree.
+        
+        Args:
+            collection (Collection): The collection.
+        """
+        
+        self.collection = collection
+        self.children = [LayerCollection(child) for child in collection.children]
+
+
+# Helpers #########################################################################################################################
+
+# Get names of layer collections --------------------------------------------------------------------------------------------------
+def namesOf(layerCollections: list) -> list:
+    """Returns the names of the collections of layer collections.
+    
+    Args:
+        layerCollections (list): The layer collections.
+    
+    Returns:
+        list: The names, sorted.
+    """
+    
+    return sorted(layerCollection.collection.name for layerCollection in layerCollections)
+
+
+# Rolling up object visibility to collections #####################################################################################
+
+# Collections are hidden as a whole if all objects in their sub-tree are hidden ---------------------------------------------------
+def test_collectionsRollUp():
+    tree = Collection("Root", ("r1",), [
+        Collection("A", ("a1", "a2")),
+        Collection("B", ("b1",), [Collection("B1", ("b2",))]),
+        Collection("C", ("c1", "outsider")),
+        Collection("D", (), [Collection("D1", ("d1",)), Collection("D2", ("d2",))]),
+        Collection("E", ("outsider2",)),
+        Collection("X", ("x1",))])
+    positions = {name: position for position, name in enumerate(["r1", "a1", "a2", "b1", "b2", "c1", "d1", "d2", "x1"])}
+    visible = [False, False, False, True, False, False, False, False, False]
+    
+    plan = collectionVisibility.planCollections(LayerCollection(tree), positions, visible, excluded=frozenset({"X"}))
+    
+    # D is hidden as a whole rather than D1 and D2 one by one, while C keeps an object out of scope shown
+    assert namesOf(plan.hidden) == ["A", "B1", "D"]
+    assert namesOf(plan.shown) == ["B", "C", "E"]
+    assert plan.covered == {positions[name] for name in ("a1", "a2", "b2", "d1", "d2")}
+
+# The root collection is never hidden ---------------------------------------------------------------------------------------------
+def test_rootIsNeverHidden():
+    tree = Collection("Root", ("r1", "r2"))
+    
+    plan = collectionVisibility.planCollections(LayerCollection(tree), {"r1": 0, "r2": 1}, [False, False])
+    
+    assert plan.hidden == []
+    assert plan.shown == []
+    assert plan.covered == set()
+
+# Objects also linked to a collection shown are not covered -----------------------------------------------------------------------
+def test_objectsLinkedToCollectionShownAreNotCovered():
+    tree = Collection("Root", (), [Collection("A", ("shared", "a1")), Collection("B", ("shared", "b1"))])
+    positions = {"shared": 0, "a1": 1, "b1": 2}
+    
+    plan = collectionVisibility.planCollections(LayerCollection(tree), positions, [False, False, True])
+    
+    assert namesOf(plan.hidden) == ["A"]
+    assert plan.covered == {1}
+
+# Plans of more roots are merged ------------------------------------------------------------------------------------------------
+def test_mergePlans():
+    first = collectionVisibility.CollectionPlan()
+    first.covered = {0, 1}
+    second = collectionVisibility.CollectionPlan()
+    second.uncovered = {1}
+    
+    merged = collectionVisibility.mergePlans([first, second])
+    
+    assert merged.covered == {0}
+
+# Layer collections of a collection linked to more parents are found --------------------------------------------------------------
+def test_layerCollectionsOf():
+    shared = Collection("Shared", ("s1",))
+    tree = LayerCollection(Collection("Root", (), [Collection("A", (), [shared]), Collection("B", (), [shared])]))
+    
+    found = collectionVisibility.layerCollectionsOf(tree, shared)
+    
+    assert len(found) == 2
+    assert all(layerCollection.collection is shared for layerCollection in found)
+
+
+# Collection rules ################################################################################################################
+
+# Decisions are inherited, but nothing is shown under a collection hidden ---------------------------------------------------------
+def test_decideCollections():
+    tree = Collection("Root", ("r1",), [
+        Collection("Hide", ("h1", "shared"), [Collection("ShowUnderHide", ("h2",))]),
+        Collection("Show", ("s1", "shared"), [Collection("HideUnderShow", ("s2",)), Collection("Plain", ("s3",))]),
+        Collection("Other", ("o1",)),
+        Collection("HideAgain", ("excludedToo",), [Collection("Excluded", ("excludedToo",))])])
+    names = ["r1", "h1", "shared", "h2", "s1", "s2", "s3", "o1", "excludedToo"]
+    positions = {name: position for position, name in enumerate(names)}
+    rules = {"Root": False, "Hide": False, "ShowUnderHide": True, "Show": True, "HideUnderShow": False, "HideAgain": False}
+    
+    decisions, verdicts = collectionVisibility.decideCollections([tree], frozenset({"Excluded"}), positions, rules.get)
+    
+    # The root is never decided
+    assert "Root" not in decisions
+    assert decisions == {name: decision for name, decision in rules.items() if name != "Root"}
+    
+    assert dict(zip(names, verdicts)) == {
+        "r1": None,
+        "h1": False,
+        "shared": True,
+        "h2": False,
+        "s1": True,
+        "s2": False,
+        "s3": True,
+        "o1": None,
+        "excludedToo": None}
+
+# Only collections decided are planned when not hiding collections automatically --------------------------------------------------
+def test_planOnlyDecidedCollections():
+    tree = Collection("Root", (), [Collection("LOD1", ("a1",)), Collection("LOD2", ("b1",)), Collection("Other", ("c1",))])
+    positions = {"a1": 0, "b1": 1, "c1": 2}
+    
+    plan = collectionVisibility.planCollections(
+        LayerCollection(tree), positions, [False, True, False], decisions={"LOD1": False, "LOD2": True}, isAutomatic=False)
+    
+    assert namesOf(plan.hidden) == ["LOD1"]
+    assert namesOf(plan.shown) == ["LOD2"]
+    assert plan.covered == {0}
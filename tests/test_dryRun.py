@@ -0,0 +1,149 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This file tests dry runs telling what applying a preset would do.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import csv
+import json
+
+import dryRun
+import ruleEngine
+
+
+# Helpers #########################################################################################################################
+
+# Make a dry run ------------------------------------------------------------------------------------------------------------------
+def makeDryRun(withState: bool = True) -> dryRun.DryRun:
+    """Makes a dry run of a preset showing LOD 1 objects and hiding LOD 2 modifiers.
+    
+    Args:
+        withState (bool, optional): Whether the current visibility of objects and modifiers is known. Defaults to True.
+    
+    Returns:
+        dryRun.DryRun: The dry run.
+    """
+    
+    snapshot = ruleEngine.Snapshot(
+        ["Hull#lod1", "Turret#lod1", "Hull#lod2"],
+        modifierNames=[("Bevel", "Decimate#lod2"), (), ("Bevel",)],
+        hidden=[True, False, False] if withState else None,
+        modifierShown=[(True, True), (), (True,)] if withState else None)
+    preset = ruleEngine.PresetDefinition(False, "LOD 1", oShow="#lod1", mHide="#lod2")
+    
+    return dryRun.DryRun("LOD 1", snapshot, ruleEngine.evaluate(snapshot, preset))
+
+
+# Dry runs ########################################################################################################################
+
+# Records and counts tell what would change ---------------------------------------------------------------------------------------
+def test_recordsAndCounts():
+    results = makeDryRun()
+    
+    assert [(record["object"], record["visible"], record["changes"]) for record in results.objects] == [
+        ("Hull#lod1", True, True), ("Turret#lod1", True, False), ("Hull#lod2", False, True)]
+    assert results.objects[2]["rule"] == ruleEngine.RULE_NOT_SHOWN_BY_NAME
+    
+    # Modifiers of objects which would be hidden are not listed
+    assert [(record["object"], record["modifier"], record["visible"]) for record in results.modifiers] == [
+        ("Hull#lod1", "Bevel", True), ("Hull#lod1", "Decimate#lod2", False)]
+    
+    assert dict(results.counts) == {
+        "objectsVisible": 2,
+        "objectsHidden": 1,
+        "objectsChanging": 2,
+        "modifiersVisible": 1,
+        "modifiersHidden": 1,
+        "modifiersChanging": 1}
+
+# Nothing is told to change without the current state -----------------------------------------------------------------------------
+def test_unknownStateChangesNothing():
+    results = makeDryRun(withState=False)
+    
+    assert all(record["currentlyVisible"] is None and not record["changes"] for record in results.objects + results.modifiers)
+    assert results.counts["objectsChanging"] == 0
+    assert results.counts["modifiersChanging"] == 0
+
+# Results are saved as JSON -------------------------------------------------------------------------------------------------------
+def test_saveJson(tmp_path):
+    results = makeDryRun()
+    path = tmp_path / "dryRun.json"
+    
+    results.saveJson(str(path))
+    
+    with open(path) as jsonFile:
+        saved = json.load(jsonFile)
+    
+    assert saved == results.asDict()
+    assert saved["presetName"] == "LOD 1"
+
+# Results are saved as CSV --------------------------------------------------------------------------------------------------------
+def test_saveCsv(tmp_path):
+    results = makeDryRun()
+    path = tmp_path / "dryRun.csv"
+    
+    results.saveCsv(str(path))
+    
+    with open(path, newline="") as csvFile:
+        rows = list(csv.reader(csvFile))
+    
+    assert rows[0] == ["kind", "object", "modifier", "visible", "rule", "currentlyVisible", "changes"]
+    assert [row[0] for row in rows[1:]] == ["object"] * 3 + ["modifier"] * 2
+    assert rows[4][1:3] == ["Hull#lod1", "Bevel"]
@@ -0,0 +1,168 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This file tests matching patterns in worker processes against matching them serially.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import random
+
+import pytest
+
+import parallelEvaluation
+import ruleEngine
+
+
+# Settings ########################################################################################################################
+
+PROPERTY_NAME = "Hide at Lod Level"
+"""
+The name of the visibility control property used by built-in presets.
+"""
+
+OBJECT_COUNT = 3001
+"""
+The number of objects evaluated, enough to cut them into shards of different sizes for each worker.
+"""
+
+
+# Fixtures ########################################################################################################################
+
+# Objects resembling a model with LOD levels --------------------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def snapshot() -> ruleEngine.Snapshot:
+    """Creates the snapshot of objects with LOD tags, some with names not in ASCII, some carrying the visibility control property,
+    and most with a few modifiers.
+    
+    Returns:
+        ruleEngine.Snapshot: The snapshot.
+    """
+    
+    rng = random.Random(20)
+    names = []
+    propertyValues = []
+    modifierNames = []
+    
+    for ix in range(OBJECT_COUNT):
+        lowest = rng.randrange(6)
+        tag = rng.choice(["", f"#lod{lowest}", f"#lod{lowest}-{rng.randrange(lowest, 6)}", f"#lod{lowest}.001"])
+        
+        names.append(f"{rng.choice(['Hull', 'Turret', 'Kerék', '車輪'])}.{ix}{tag}")
+        propertyValues.append({PROPERTY_NAME: str(rng.randrange(6))} if rng.random() < 0.1 else None)
+        modifierNames.append(tuple(rng.sample(["Bevel", "Weld", "Decimate#lod1", "Decimate#lod3", "Triangulate#lod5"], 2)))
+    
+    return ruleEngine.Snapshot(names, propertyValues, modifierNames)
+
+# Stop worker processes when done -------------------------------------------------------------------------------------------------
+@pytest.fixture(scope="module", autouse=True)
+def pool():
+    """
+    Stops the pool of worker processes after the tests of this module.
+    """
+    
+    yield
+    parallelEvaluation.shutdown()
+
+
+# Serial and parallel agreement ###################################################################################################
+
+# Plans worked out in parallel match plans worked out serially --------------------------------------------------------------------
+@pytest.mark.parametrize("preset", ruleEngine.BUILT_IN_PRESETS[::3], ids=lambda preset: preset.presetName)
+def test_evaluateMatchesSerial(snapshot, preset):
+    plan = ruleEngine.getRulePlan(preset)
+    
+    serial = ruleEngine.evaluate(snapshot, plan)
+    parallel = parallelEvaluation.evaluate(snapshot, plan)
+    
+    assert parallel.objectVisible == serial.objectVisible
+    assert parallel.objectRules == serial.objectRules
+    assert parallel.modifierVisible == serial.modifierVisible
+    assert parallel.modifierRules == serial.modifierRules
+    assert parallel.patternMatches == serial.patternMatches
+
+# Collection verdicts override object rules decided by workers --------------------------------------------------------------------
+def test_evaluateAppliesCollectionVerdicts(snapshot):
+    plan = ruleEngine.getRulePlan(ruleEngine.BUILT_IN_PRESETS[1])
+    verdicts = [(None, True, False)[ix % 3] for ix in range(len(snapshot))]
+    
+    serial = ruleEngine.evaluate(snapshot, plan, collectionVerdicts=verdicts)
+    parallel = parallelEvaluation.evaluate(snapshot, plan, collectionVerdicts=verdicts)
+    
+    assert parallel.objectVisible == serial.objectVisible
+    assert parallel.objectRules == serial.objectRules
+
+# Membership masks computed in parallel match masks computed serially -------------------------------------------------------------
+def test_membershipMasksMatchSerial(snapshot):
+    # More than eight presets, so that masks take more than a byte
+    plans = [ruleEngine.getRulePlan(preset) for preset in ruleEngine.BUILT_IN_PRESETS]
+    propertyValues = [values or {} for values in snapshot.propertyValues]
+    
+    serial = ruleEngine.membershipMasks(snapshot.names, propertyValues, plans)
+    parallel = parallelEvaluation.membershipMasks(snapshot.names, propertyValues, plans)
+    
+    assert parallel == serial
+
+# Shards of nothing are fine ------------------------------------------------------------------------------------------------------
+def test_evaluateEmptySnapshot():
+    plan = ruleEngine.getRulePlan(ruleEngine.BUILT_IN_PRESETS[0])
+    
+    result = parallelEvaluation.evaluate(ruleEngine.Snapshot([]), plan)
+    
+    assert result.objectVisible == []
+    assert result.objectRules == []
@@ -0,0 +1,349 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This file tests the rule engine.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import re
+
+import pytest
+
+import ruleEngine
+
+
+# Settings ########################################################################################################################
+
+LOD_NAMES = [
+    "Hull", "Hull#lod0", "Hull#lod2", "Hull#lod5", "Hull#lod0-3", "Hull#lod1-5", "Hull#lod2-2", "Hull#lod4-1", "Hull#lod12",
+    "Hull#lod1.001", "Hull#lod1#lod2", "#lod3", "Hull#lod3\n", "Hull#LOD1", "Hull#lo", "Hull#lod", "Hull#lod-1"]
+"""
+Names with regular, irregular and no LOD tags.
+"""
+
+LITERAL_NAMES = [
+    "", "Hull", "Hull\n", "Hull_col", "Hull_phys", "Turret", "Hull.Turret", "_col", "a.b", "axb", "$x", "x$", "Tank Hull"]
+"""
+Names to match against plain string patterns.
+"""
+
+LITERAL_PATTERNS = [
+    ("_col", ruleEngine.PATH_LITERAL),
+    ("^Hull", ruleEngine.PATH_LITERAL),
+    ("Hull$", ruleEngine.PATH_LITERAL),
+    ("^Hull$", ruleEngine.PATH_LITERAL),
+    ("a\\.b", ruleEngine.PATH_LITERAL),
+    ("\\$x$", ruleEngine.PATH_LITERAL),
+    ("Tank Hull", ruleEngine.PATH_LITERAL),
+    ("_col|_phys", ruleEngine.PATH_ALTERNATION),
+    ("^Hull|Turret$", ruleEngine.PATH_ALTERNATION),
+    ("^Hull$|^Turret$|_col", ruleEngine.PATH_ALTERNATION),
+    ("a.b", ruleEngine.PATH_REGEX),
+    ("Hull|(Tur)ret", ruleEngine.PATH_REGEX)]
+"""
+Plain string patterns and alternations of plain strings, and a few true regexes, with the path each shall be matched by.
+"""
+
+
+# Fixtures ########################################################################################################################
+
+# Start with an empty plan cache --------------------------------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def emptyPlanCache():
+    """
+    Drops rule plans cached by other tests.
+    """
+    
+    ruleEngine.invalidateRulePlans()
+    yield
+    ruleEngine.invalidateRulePlans()
+
+
+# Object rules ####################################################################################################################
+
+# The last matching object rule wins ----------------------------------------------------------------------------------------------
+def test_lastMatchingObjectRuleWins():
+    plan = ruleEngine.RulePlan(
+        objectsToShowByName="Tank",
+        objectsToHideByName="Turret",
+        propertyName="Hide at Lod Level",
+        propertyValueForShowing="keep",
+        propertyValueForHiding="0")
+    
+    assert plan.decideObjectVisibility("Wheel") == (False, ruleEngine.RULE_NOT_SHOWN_BY_NAME)
+    assert plan.decideObjectVisibility("Tank") == (True, ruleEngine.RULE_SHOW_BY_NAME)
+    assert plan.decideObjectVisibility("Tank.Turret") == (False, ruleEngine.RULE_HIDE_BY_NAME)
+    assert plan.decideObjectVisibility("Tank.Turret", "keep") == (True, ruleEngine.RULE_SHOW_BY_PROPERTY)
+    assert plan.decideObjectVisibility("Tank", "0") == (False, ruleEngine.RULE_HIDE_BY_PROPERTY)
+    assert plan.decideObjectVisibility("Wheel", "keep0") == (False, ruleEngine.RULE_HIDE_BY_PROPERTY)
+    assert plan.decideObjectVisibility("Tank", "other") == (True, ruleEngine.RULE_SHOW_BY_NAME)
+
+# Objects are shown without a showing pattern -------------------------------------------------------------------------------------
+def test_emptyShowingPatternShowsAll():
+    plan = ruleEngine.RulePlan(objectsToHideByName="Turret")
+    
+    assert plan.decideObjectVisibility("Tank") == (True, ruleEngine.RULE_SHOW_ALL)
+    assert plan.decideObjectVisibility("Turret") == (False, ruleEngine.RULE_HIDE_BY_NAME)
+
+# A blank property name means no property rules -----------------------------------------------------------------------------------
+def test_blankPropertyNameIgnoresPropertyRules():
+    plan = ruleEngine.RulePlan(objectsToShowByName="Tank", propertyName="  ", propertyValueForHiding="0")
+    
+    assert not plan.hasPropertyRules
+    assert plan.decideObjectVisibility("Tank", "0") == (True, ruleEngine.RULE_SHOW_BY_NAME)
+
+# Evaluating a snapshot decides as the plan does ----------------------------------------------------------------------------------
+def test_evaluateMatchesPlanDecisions():
+    preset = ruleEngine.PresetDefinition(
+        False, "Test", oShow="Tank", oHide="Turret", pName="Hide at Lod Level", pShow="keep", pHide="0")
+    snapshot = ruleEngine.Snapshot(
+        ["Wheel", "Tank", "Tank.Turret", "Tank.Turret", "Tank"],
+        [None, {}, None, {"Hide at Lod Level": "keep"}, {"Hide at Lod Level": "0", "Other": "keep"}])
+    
+    plan = ruleEngine.getRulePlan(preset)
+    result = ruleEngine.evaluate(snapshot, preset)
+    
+    expected = [
+        plan.decideObjectVisibility(name, (values or {}).get("Hide at Lod Level"))
+        for name, values in zip(snapshot.names, snapshot.propertyValues)]
+    
+    assert list(zip(result.objectVisible, result.objectRules)) == expected
+    assert result.objectVisible == [False, True, False, True, False]
+    assert result.visibleCount() == 2
+
+# Collections decide before object rules ------------------------------------------------------------------------------------------
+def test_collectionVerdictsOverrideObjectRules():
+    snapshot = ruleEngine.Snapshot(["Tank", "Turret", "Wheel"])
+    preset = ruleEngine.PresetDefinition(False, "Test", oShow="Tank")
+    
+    result = ruleEngine.evaluate(snapshot, preset, collectionVerdicts=[False, True, None])
+    
+    assert result.objectVisible == [False, True, False]
+    assert result.objectRules == [
+        ruleEngine.RULE_HIDE_BY_COLLECTION, ruleEngine.RULE_SHOW_BY_COLLECTION, ruleEngine.RULE_NOT_SHOWN_BY_NAME]
+
+
+# Modifier rules ##################################################################################################################
+
+# Hiding modifiers overrides showing them -----------------------------------------------------------------------------------------
+def test_modifierHidingOverridesShowing():
+    plan = ruleEngine.RulePlan(modifiersToShow="Bevel|Weld", modifiersToHide="Weld")
+    
+    assert plan.decideModifierVisibility("Bevel") == (True, ruleEngine.RULE_SHOW_MODIFIER)
+    assert plan.decideModifierVisibility("Weld") == (False, ruleEngine.RULE_HIDE_MODIFIER)
+    assert plan.decideModifierVisibility("Decimate") == (False, ruleEngine.RULE_NOT_SHOWN_MODIFIER)
+
+# Modifiers are shown without a showing pattern -----------------------------------------------------------------------------------
+def test_emptyModifierShowingPatternShowsAll():
+    plan = ruleEngine.RulePlan(modifiersToHide="#lod[12]")
+    
+    assert plan.decideModifierVisibility("Bevel") == (True, ruleEngine.RULE_SHOW_ALL_MODIFIERS)
+    assert plan.decideModifierVisibility("Decimate#lod2") == (False, ruleEngine.RULE_HIDE_MODIFIER)
+
+# Modifiers decided once per name are decided the same for each object ------------------------------------------------------------
+def test_evaluateDecidesModifiersByName():
+    snapshot = ruleEngine.Snapshot(["A", "B", "C"], modifierNames=[("Bevel", "Weld"), (), ("Weld", "Decimate", "Bevel")])
+    preset = ruleEngine.PresetDefinition(False, "Test", mShow="Bevel|Weld", mHide="Weld")
+    
+    result = ruleEngine.evaluate(snapshot, preset)
+    
+    assert result.modifierVisible == [(True, False), (), (False, False, True)]
+    assert result.modifierRules[2] == (
+        ruleEngine.RULE_HIDE_MODIFIER, ruleEngine.RULE_NOT_SHOWN_MODIFIER, ruleEngine.RULE_SHOW_MODIFIER)
+    
+    # Three distinct names, two patterns each
+    assert result.patternMatches == 6
+
+# Evaluating part by part gives the same plan -------------------------------------------------------------------------------------
+def test_evaluateBySlicesMatchesWholeSnapshot():
+    names = [f"Part{ix}#lod{ix % 6}" for ix in range(25)]
+    modifierNames = [("Bevel", f"Decimate#lod{ix % 6}") for ix in range(25)]
+    snapshot = ruleEngine.Snapshot(names, modifierNames=modifierNames)
+    preset = ruleEngine.BUILT_IN_PRESETS[2]
+    
+    whole = ruleEngine.evaluate(snapshot, preset)
+    
+    parts = ruleEngine.VisibilityPlan()
+    modifierDecisions = {}
+    
+    for start in range(0, len(snapshot), 7):
+        parts.extend(ruleEngine.evaluate(snapshot.slice(start, start + 7), preset, modifierDecisions=modifierDecisions))
+    
+    assert parts.objectVisible == whole.objectVisible
+    assert parts.objectRules == whole.objectRules
+    assert parts.modifierVisible == whole.modifierVisible
+    assert parts.patternMatches == whole.patternMatches
+
+
+# Fast paths ######################################################################################################################
+
+# LOD tag lookups match as the regex engine does ----------------------------------------------------------------------------------
+@pytest.mark.parametrize("preset", ruleEngine.BUILT_IN_PRESETS, ids=lambda preset: preset.presetName)
+def test_lodTagPathMatchesRegex(preset):
+    for pattern in (preset.objectsToShowByName, preset.objectsToHideByName, preset.modifiersToHide):
+        if len(pattern) == 0:
+            continue
+        
+        compiled = ruleEngine.NamePattern(pattern)
+        
+        assert compiled.path == ruleEngine.PATH_LOD_TAG
+        
+        # Ask twice, as the second answer comes from the decisions made by LOD range
+        for name in LOD_NAMES + LOD_NAMES:
+            assert compiled.matches(name) == (re.search(pattern, name) is not None), (pattern, name)
+
+# Patterns not only matching at LOD tags are not looked up by tags ----------------------------------------------------------------
+@pytest.mark.parametrize("pattern", ["Hull|#lod1", "(?<=Hull)#lod1", "#lo?d1", "#lod*1", ".*#lod1"])
+def test_patternsNotOnlyMatchingTagsAvoidLodPath(pattern):
+    compiled = ruleEngine.NamePattern(pattern)
+    
+    assert compiled.path != ruleEngine.PATH_LOD_TAG
+    
+    for name in LOD_NAMES:
+        assert compiled.matches(name) == (re.search(pattern, name) is not None), (pattern, name)
+
+# Plain string matches agree with the regex engine --------------------------------------------------------------------------------
+@pytest.mark.parametrize("pattern, path", LITERAL_PATTERNS, ids=[pattern for pattern, _ in LITERAL_PATTERNS])
+def test_literalPathsMatchRegex(pattern, path):
+    for compiled in (ruleEngine.TextPattern(pattern), ruleEngine.NamePattern(pattern)):
+        assert compiled.path == path
+        
+        for name in LITERAL_NAMES:
+            assert compiled.matches(name) == (re.search(pattern, name) is not None), (pattern, name)
+
+# Tags are parsed as documented ---------------------------------------------------------------------------------------------------
+def test_parseLodTag():
+    assert ruleEngine.parseLodTag("Hull") is None
+    assert ruleEngine.parseLodTag("Hull#lod2") == ruleEngine.LodRange(2, 2, False)
+    assert ruleEngine.parseLodTag("Hull#lod0-3") == ruleEngine.LodRange(0, 3, True)
+    assert ruleEngine.parseLodTag("Hull#lod1.001") is ruleEngine.IRREGULAR_LOD_TAG
+    assert ruleEngine.parseLodTag("Hull#lod1#lod2") is ruleEngine.IRREGULAR_LOD_TAG
+    assert ruleEngine.parseLodTag("Hull#lod12") is ruleEngine.IRREGULAR_LOD_TAG
+    assert ruleEngine.parseLodTag("Hull#lod0-3").text() == "#lod0-3"
+
+
+# Rule plan cache #################################################################################################################
+
+# Plans are compiled once for the same patterns -----------------------------------------------------------------------------------
+def test_planCacheReturnsSamePlanForSamePatterns():
+    plan = ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "A", oShow="#lod1"))
+    
+    assert ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "B", oShow="#lod1")) is plan
+    assert ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "A", oShow="#lod2")) is not plan
+
+# The least recently used plan is dropped when the cache is full ------------------------------------------------------------------
+def test_planCacheDropsLeastRecentlyUsed():
+    presets = [ruleEngine.PresetDefinition(False, f"P{ix}", oShow=f"Part{ix}") for ix in range(ruleEngine.PLAN_CACHE_SIZE + 1)]
+    plans = [ruleEngine.getRulePlan(preset) for preset in presets[:-1]]
+    
+    # Use the oldest plan, so that the second oldest is dropped upon adding one more
+    assert ruleEngine.getRulePlan(presets[0]) is plans[0]
+    ruleEngine.getRulePlan(presets[-1])
+    
+    assert len(ruleEngine._planCache) == ruleEngine.PLAN_CACHE_SIZE
+    assert ruleEngine.getRulePlan(presets[0]) is plans[0]
+    assert ruleEngine.getRulePlan(presets[1]) is not plans[1]
+
+# Invalidating the cache compiles plans again -------------------------------------------------------------------------------------
+def test_invalidateRulePlans():
+    preset = ruleEngine.PresetDefinition(False, "A", oShow="#lod1")
+    plan = ruleEngine.getRulePlan(preset)
+    
+    ruleEngine.invalidateRulePlans()
+    
+    assert ruleEngine.getRulePlan(preset) is not plan
+
+# Invalid patterns are reported by `re.error` -------------------------------------------------------------------------------------
+def test_invalidPatternRaises():
+    with pytest.raises(re.error):
+        ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "A", oShow="#lod[1"))
+
+
+# Membership index ################################################################################################################
+
+# Switching presets only checks objects whose visibility differs ------------------------------------------------------------------
+def test_membershipIndexChangedPositions():
+    presets = [ruleEngine.PresetDefinition(False, "A", oShow="#lod0"), ruleEngine.PresetDefinition(False, "B", oShow="#lod[01]")]
+    plans = [ruleEngine.getRulePlan(preset) for preset in presets]
+    index = ruleEngine.MembershipIndex()
+    
+    index.rebuild("signature", ["Hull#lod0", "Hull#lod1", "Hull#lod2"], [{}, {}, {}], plans)
+    index.markApplied(0, "View Layer")
+    
+    assert index.changedPositions(0, 1) == [1]
+    assert index.appliedViewLayer == "View Layer"
+    
+    index.updateObject("Hull#lod2", {}, [ruleEngine.getRulePlan(ruleEngine.PresetDefinition(False, "C", oShow="Hull"))] * 2)
+    
+    assert index.changedPositions(0, 1) == [1, 2]
+
+# The view layer a preset has been applied in is forgotten along with the preset --------------------------------------------------
+def test_membershipIndexForgetsViewLayer():
+    index = ruleEngine.MembershipIndex()
+    index.markApplied(1, "View Layer")
+    
+    index.markApplied(-1, "View Layer")
+    
+    assert index.appliedPreset == -1
+    assert index.appliedViewLayer is None
+    
+    index.markApplied(1, "View Layer")
+    index.invalidate()
+    
+    assert index.appliedViewLayer is None
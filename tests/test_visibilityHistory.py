@@ -0,0 +1,173 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This file tests the visibility history of the add-on.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+import visibilityHistory
+
+
+# Helpers #########################################################################################################################
+
+# Create a step hiding an object --------------------------------------------------------------------------------------------------
+def makeStep(presetName: str) -> visibilityHistory.VisibilityStep:
+    """Creates a step which hid an object named after the preset.
+    
+    Args:
+        presetName (str): The name of the preset.
+    
+    Returns:
+        visibilityHistory.VisibilityStep: The step.
+    """
+    
+    step = visibilityHistory.VisibilityStep(presetName)
+    step.noteObject(f"{presetName}.object", True)
+    
+    return step
+
+
+# History #########################################################################################################################
+
+# The oldest steps are dropped beyond the limit -----------------------------------------------------------------------------------
+def test_historyIsCapped():
+    history = visibilityHistory.VisibilityHistory(limit=3)
+    
+    for ix in range(5):
+        history.push(makeStep(f"P{ix}"))
+    
+    assert [step.presetName for step in history.steps] == ["P2", "P3", "P4"]
+    assert history.position == 3
+    
+    undone = [history.undo().presetName for _ in range(3)]
+    
+    assert undone == ["P4", "P3", "P2"]
+    assert not history.canUndo()
+    assert history.undo() is None
+
+# The default limit applies -------------------------------------------------------------------------------------------------------
+def test_defaultLimit():
+    history = visibilityHistory.VisibilityHistory()
+    
+    for ix in range(visibilityHistory.HISTORY_LIMIT + 10):
+        history.push(makeStep(f"P{ix}"))
+    
+    assert len(history.steps) == visibilityHistory.HISTORY_LIMIT
+    assert history.steps[0].presetName == "P10"
+
+# Empty steps are not recorded ----------------------------------------------------------------------------------------------------
+def test_emptyStepIsNotRecorded():
+    history = visibilityHistory.VisibilityHistory()
+    
+    history.push(visibilityHistory.VisibilityStep("Nothing changed"))
+    
+    assert not history.canUndo()
+    assert len(history.steps) == 0
+
+# Recording a step drops steps undone ---------------------------------------------------------------------------------------------
+def test_pushDropsStepsUndone():
+    history = visibilityHistory.VisibilityHistory()
+    
+    for name in ("A", "B", "C"):
+        history.push(makeStep(name))
+    
+    history.undo()
+    history.undo()
+    
+    assert history.nextRedo().presetName == "B"
+    
+    history.push(makeStep("D"))
+    
+    assert [step.presetName for step in history.steps] == ["A", "D"]
+    assert not history.canRedo()
+    assert history.redo() is None
+
+# Undo and redo walk the same steps -----------------------------------------------------------------------------------------------
+def test_undoRedo():
+    history = visibilityHistory.VisibilityHistory()
+    history.push(makeStep("A"))
+    history.push(makeStep("B"))
+    
+    assert history.undo().presetName == "B"
+    assert history.redo().presetName == "B"
+    assert not history.canRedo()
+    
+    history.clear()
+    
+    assert not history.canUndo()
+    assert not history.canRedo()
+
+
+# Steps ###########################################################################################################################
+
+# States to set are inverted for undoing ------------------------------------------------------------------------------------------
+def test_stepStates():
+    step = visibilityHistory.VisibilityStep("A", hideFlags=("hide_viewport",))
+    step.noteObject("Hull", True)
+    step.noteObject("Turret", False)
+    step.noteCollection("LOD1", True)
+    step.noteModifier("Hull", "Bevel", False)
+    
+    assert list(step.objectStates(undo=False)) == [("Hull", True), ("Turret", False)]
+    assert list(step.objectStates(undo=True)) == [("Hull", False), ("Turret", True)]
+    assert list(step.collectionStates(undo=False)) == [("LOD1", True)]
+    assert list(step.collectionStates(undo=True)) == [("LOD1", False)]
+    assert list(step.modifierStates(undo=False)) == [("Hull", "Bevel", False)]
+    assert list(step.modifierStates(undo=True)) == [("Hull", "Bevel", True)]
+    assert not step.isEmpty()
@@ -0,0 +1,346 @@
+# T1nk-R's Focus Wizard add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module contains the visibility history of applying presets, kept by the add-on instead of Blender's global undo.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to create presets in the form of a set of rules:
+# 
+# * to control the visibility of Blender objects based on object name patterns and custom object property value patterns, 
+#   as well as
+# * to control the visibility of object modifiers based on modifier name patterns.
+# 
+# With this add-on you can set up rules to easily view your model as it looks like at various LOD levels by showing respective 
+# objects and modifier effects and hiding others.
+# 
+# You need Blender 3.6 or newer for this addon to work.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/Focus-Wizard
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to show or hide objects under the collection you specified as the scope of operation.
+#   * This add-on is intended to show or hide modifier effects of objects under the collection you specified 
+#     as the scope of operation.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way. In particular, this add-on 
+#     is not intended to anyhow touch objects out of the scope you selected as the scope of operation.
+#   * You shall be able to simply undo consequences made by this add-on.
+#   * You can use this add-on to save your presets in JSON format to a file on your computer.
+#   * You can use this add-on to load presets from a JSON file on your computer.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/Focus-Wizard
+#
+# *********************************************************************************************************************************
+
+
+# Constants #######################################################################################################################
+
+HISTORY_LIMIT = 50
+"""
+The maximum number of steps kept in the history. When exceeded, the oldest steps are dropped.
+"""
+
+
+# A step of the history ###########################################################################################################
+class VisibilityStep:
+    """
+    The visibility changes made by applying a preset once. Only objects and modifiers actually changed are recorded, by name, as
+    a name can be looked up again even if Blender reallocated the object in the meantime. As only changes are recorded, the state
+    before the step is the opposite of the state after it.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, presetName: str, hideFlags: tuple = ()):
+        """Creates an empty step.
+
+        Args:
+            presetName (str): The name of the preset applied.
+            hideFlags (tuple, optional): Names of object flags set to hide objects, such as `hide_viewport`. Empty if objects 
+            are hidden in the view layer. Defaults to ().
+        """
+        
+        self.presetName = presetName
+        """
+        The name of the preset applied.
+        """
+        
+        self.hideFlags = hideFlags
+        """
+        Names of object flags set to hide objects, or empty if objects are hidden in the view layer.
+        """
+        
+        self.objectNames = []
+        """
+        Names of objects whose visibility changed.
+        """
+        
+        self.objectHidden = bytearray()
+        """
+        Tells if objects got hidden, aligned with `objectNames`.
+        """
+        
+        self.collectionNames = []
+        """
+        Names of collections hidden or shown as a whole.
+        """
+        
+        self.collectionHidden = bytearray()
+        """
+        Tells if collections got hidden, aligned with `collectionNames`.
+        """
+        
+        self.modifierKeys = []
+        """
+        (object name, modifier name) tuples of modifiers whose viewport visibility changed.
+        """
+        
+        self.modifierShown = bytearray()
+        """
+        Tells if modifiers got shown, aligned with `modifierKeys`.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Record changes --------------------------------------------------------------------------------------------------------------
+    def noteObject(self, objectName: str, hidden: bool):
+        """Records that the visibility of an object changed.
+
+        Args:
+            objectName (str): The name of the object.
+            hidden (bool): True if the object got hidden.
+        """
+        
+        self.objectNames.append(objectName)
+        self.objectHidden.append(hidden)
+    
+    def noteCollection(self, collectionName: str, hidden: bool):
+        """Records that a collection got hidden or shown as a whole.
+
+        Args:
+            collectionName (str): The name of the collection.
+            hidden (bool): True if the collection got hidden.
+        """
+        
+        self.collectionNames.append(collectionName)
+        self.collectionHidden.append(hidden)
+    
+    def noteModifier(self, objectName: str, modifierName: str, shown: bool):
+        """Records that the viewport visibility of a modifier changed.
+
+        Args:
+            objectName (str): The name of the object the modifier belongs to.
+            modifierName (str): The name of the modifier.
+            shown (bool): True if the modifier got shown.
+        """
+        
+        self.modifierKeys.append((objectName, modifierName))
+        self.modifierShown.append(shown)
+    
+    # Tell if anything changed ----------------------------------------------------------------------------------------------------
+    def isEmpty(self) -> bool:
+        """Tells if nothing has been recorded.
+
+        Returns:
+            bool: True if no visibility changed.
+        """
+        
+        return len(self.objectNames) == 0 and len(self.collectionNames) == 0 and len(self.modifierKeys) == 0
+    
+    # Get states ------------------------------------------------------------------------------------------------------------------
+    def objectStates(self, undo: bool):
+        """Returns the states to set for objects to undo or redo the step.
+
+        Args:
+            undo (bool): True to get the states before the step, False to get the states after it.
+
+        Returns:
+            Iterator of (object name, hidden) tuples.
+        """
+        
+        return ((name, bool(hidden) != undo) for name, hidden in zip(self.objectNames, self.objectHidden))
+    
+    def collectionStates(self, undo: bool):
+        """Returns the states to set for collections to undo or redo the step.
+
+        Args:
+            undo (bool): True to get the states before the step, False to get the states after it.
+
+        Returns:
+            Iterator of (collection name, hidden) tuples.
+        """
+        
+        return ((name, bool(hidden) != undo) for name, hidden in zip(self.collectionNames, self.collectionHidden))
+    
+    def modifierStates(self, undo: bool):
+        """Returns the states to set for modifiers to undo or redo the step.
+
+        Args:
+            undo (bool): True to get the states before the step, False to get the states after it.
+
+        Returns:
+            Iterator of (object name, modifier name, shown) tuples.
+        """
+        
+        return ((objectName, modifierName, bool(shown) != undo) 
+                for (objectName, modifierName), shown in zip(self.modifierKeys, self.modifierShown))
+
+
+# The history #####################################################################################################################
+class VisibilityHistory:
+    """
+    A stack of visibility steps with a position, so that steps can be undone and redone. Recording a step drops steps undone 
+    before, as undo stacks do.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    def __init__(self, limit: int = HISTORY_LIMIT):
+        """Creates an empty history.
+
+        Args:
+            limit (int, optional): The maximum number of steps to keep. Defaults to HISTORY_LIMIT.
+        """
+        
+        self.limit = limit
+        """
+        The maximum number of steps to keep.
+        """
+        
+        self.steps = []
+        """
+        The steps recorded, the oldest first.
+        """
+        
+        self.position = 0
+        """
+        The number of steps in effect. Steps from this position on have been undone and can be redone.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Record a step ---------------------------------------------------------------------------------------------------------------
+    def push(self, step: VisibilityStep):
+        """Records a step, dropping steps undone before. Empty steps are not recorded.
+
+        Args:
+            step (VisibilityStep): The step.
+        """
+        
+        if step.isEmpty():
+            return
+        
+        del self.steps[self.position:]
+        self.steps.append(step)
+        
+        if len(self.steps) > self.limit:
+            del self.steps[0]
+        
+        self.position = len(self.steps)
+    
+    # Undo and redo ---------------------------------------------------------------------------------------------------------------
+    def canUndo(self) -> bool:
+        """Tells if there's a step to undo.
+
+        Returns:
+            bool: True if there's a step to undo.
+        """
+        
+        return self.position > 0
+    
+    def canRedo(self) -> bool:
+        """Tells if there's a step to redo.
+
+        Returns:
+            bool: True if there's a step to redo.
+        """
+        
+        return self.position < len(self.steps)
+    
+    def nextUndo(self) -> VisibilityStep:
+        """Returns the step `undo` would undo.
+
+        Returns:
+            VisibilityStep: The step, or `None` if there's nothing to undo.
+        """
+        
+        return self.steps[self.position - 1] if self.canUndo() else None
+    
+    def nextRedo(self) -> VisibilityStep:
+        """Returns the step `redo` would redo.
+
+        Returns:
+            VisibilityStep: The step, or `None` if there's nothing to redo.
+        """
+        
+        return self.steps[self.position] if self.canRedo() else None
+    
+    def undo(self) -> VisibilityStep:
+        """Steps back in the history. The caller shall set the states returned by the step for `undo=True`.
+
+        Returns:
+            VisibilityStep: The step to undo, or `None` if there's nothing to undo.
+        """
+        
+        step = self.nextUndo()
+        
+        if step is not None:
+            self.position -= 1
+            
+        return step
+    
+    def redo(self) -> VisibilityStep:
+        """Steps forward in the history. The caller shall set the states returned by the step for `undo=False`.
+
+        Returns:
+            VisibilityStep: The step to redo, or `None` if there's nothing to redo.
+        """
+        
+        step = self.nextRedo()
+        
+        if step is not None:
+            self.position += 1
+            
+        return step
+    
+    # Forget everything -----------------------------------------------------------------------------------------------------------
+    def clear(self):
+        """
+        Forgets all steps.
+        """
+        
+        self.steps.clear()
+        self.position = 0
+
+
+history = VisibilityHistory()
+"""
+The visibility history of the session.
+"""